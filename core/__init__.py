@@ -0,0 +1,38 @@
+"""Núcleo do listenANDwrite2memorize: palavras, progresso, dicas e TTS, sem dependência do Qt.
+
+Usado tanto pela GUI (main.py) quanto pelo modo texto (main-text.py). Os nomes abaixo são
+importados sob demanda, para que `import core` não carregue módulos que o chamador não usa
+(ex: asyncio para quem só precisa do WordManager).
+"""
+import importlib
+
+_EXPORTS = {
+    "WordManager": "words",
+    "MASTERY_THRESHOLD_DEFAULT": "words",
+    "SELECTION_MODE_UNIFORM": "words",
+    "SELECTION_MODE_WEIGHTED": "words",
+    "SELECTION_MODE_SPACED": "words",
+    "WordStore": "store",
+    "WordListSession": "session",
+    "get_hint": "hints",
+    "MAX_HINT_LEVEL": "hints",
+    "progress_file_path": "progress",
+    "load_progress": "progress",
+    "save_progress": "progress",
+    "ProgressJournal": "progress",
+    "SQLiteProgressStore": "progress_db",
+    "cross_list_stats": "progress_db",
+    "TTSService": "tts",
+    "SpeechRequest": "tts",
+    "VoiceRegistry": "voices",
+    "prepare_gif_assets": "assets",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{module_name}", __name__), name)
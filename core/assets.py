@@ -0,0 +1,162 @@
+"""Preparação offline dos GIFs: cópias no tamanho de exibição, com manifesto por hash da origem.
+
+Uso (a partir da raiz do projeto):
+    python -m core.assets                 # prepara img/ e img/errors/
+    python -m core.assets --max-size 300 img/
+
+O popup de GIF (main.py) carrega essas cópias no lugar dos originais quando o manifesto
+indica que a cópia corresponde ao arquivo atual; caso contrário usa o original.
+O Pillow só é necessário para preparar as cópias, não para usá-las.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+GIF_SOURCE_DIRS_DEFAULT = ["img/", "img/errors/"]
+GIF_CACHE_DIR_DEFAULT = "img/.cache"
+GIF_MAX_DISPLAY_SIZE = 450 # Mesmo limite do popup de GIF
+MANIFEST_FILE_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def load_manifest(cache_dir=GIF_CACHE_DIR_DEFAULT):
+    """Lê o manifesto; devolve um manifesto vazio se ele não existir ou for de outra versão."""
+    try:
+        with open(os.path.join(cache_dir, MANIFEST_FILE_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        manifest = {"version": MANIFEST_VERSION, "assets": {}, "sources": {}}
+    return manifest
+
+
+def save_manifest(manifest, cache_dir=GIF_CACHE_DIR_DEFAULT):
+    path = os.path.join(cache_dir, MANIFEST_FILE_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=4)
+    os.replace(tmp_path, path)
+
+
+def resolve_display_asset(source_path, manifest, cache_dir=GIF_CACHE_DIR_DEFAULT):
+    """Caminho da cópia preparada de source_path, ou o próprio source_path se não houver cópia válida.
+
+    Usa só stat() (mtime e tamanho registrados no manifesto), sem recalcular o hash.
+    """
+    source = manifest["sources"].get(os.path.normpath(source_path))
+    if not source:
+        return source_path
+    try:
+        st = os.stat(source_path)
+    except OSError:
+        return source_path
+    if st.st_mtime_ns != source["mtime_ns"] or st.st_size != source["size"]:
+        return source_path # Original alterado depois da preparação
+    asset = manifest["assets"].get(source["sha1"])
+    if not asset:
+        return source_path
+    output_path = os.path.join(cache_dir, asset["output"])
+    return output_path if os.path.exists(output_path) else source_path
+
+
+def file_sha1(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def transcode_gif(source_path, output_path, max_size=GIF_MAX_DISPLAY_SIZE):
+    """Reduz o GIF para caber em max_size x max_size (nunca amplia) e salva com paleta otimizada.
+
+    Retorna (largura, altura) da cópia.
+    """
+    from PIL import Image, ImageSequence # Dependência opcional, só para preparar os assets
+
+    with Image.open(source_path) as image:
+        width, height = image.size
+        scale = min(1.0, max_size / width, max_size / height)
+        new_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        frames, durations = [], []
+        for frame in ImageSequence.Iterator(image):
+            durations.append(frame.info.get("duration", 100))
+            frames.append(frame.convert("RGBA").resize(new_size, Image.Resampling.LANCZOS))
+        loop = image.info.get("loop", 0)
+
+    tmp_path = output_path + ".tmp"
+    frames[0].save(tmp_path, format="GIF", save_all=True, append_images=frames[1:],
+                   duration=durations, loop=loop, disposal=2, optimize=True)
+    os.replace(tmp_path, output_path)
+    return new_size
+
+
+def prepare_gif_assets(source_dirs=GIF_SOURCE_DIRS_DEFAULT, cache_dir=GIF_CACHE_DIR_DEFAULT,
+                       max_size=GIF_MAX_DISPLAY_SIZE):
+    """Gera as cópias que faltam e atualiza o manifesto. Retorna (preparados, reaproveitados)."""
+    os.makedirs(cache_dir, exist_ok=True)
+    manifest = load_manifest(cache_dir)
+    prepared = reused = 0
+    for directory in source_dirs:
+        if not os.path.isdir(directory):
+            print(f"Warning: '{directory}' not found. Skipping.")
+            continue
+        for name in sorted(os.listdir(directory)):
+            if not name.lower().endswith(".gif"):
+                continue
+            source_path = os.path.normpath(os.path.join(directory, name))
+            sha1 = file_sha1(source_path)
+            st = os.stat(source_path)
+            output_name = f"{sha1[:16]}-{max_size}.gif"
+            asset = manifest["assets"].get(sha1)
+            if asset and asset["output"] == output_name and os.path.exists(os.path.join(cache_dir, output_name)):
+                reused += 1
+            else:
+                try:
+                    width, height = transcode_gif(source_path, os.path.join(cache_dir, output_name), max_size)
+                except Exception as e:
+                    print(f"Error preparing '{source_path}': {e}")
+                    continue
+                manifest["assets"][sha1] = {"output": output_name, "width": width, "height": height}
+                prepared += 1
+                print(f"Prepared {source_path} -> {output_name} ({width}x{height})")
+            manifest["sources"][source_path] = {"sha1": sha1, "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+    # Esquece originais removidos e apaga as cópias que nenhum original usa mais
+    for source_path in list(manifest["sources"]):
+        if not os.path.exists(source_path):
+            del manifest["sources"][source_path]
+    used = {source["sha1"] for source in manifest["sources"].values()}
+    for sha1 in list(manifest["assets"]):
+        if sha1 not in used:
+            try:
+                os.remove(os.path.join(cache_dir, manifest["assets"][sha1]["output"]))
+            except OSError:
+                pass
+            del manifest["assets"][sha1]
+    save_manifest(manifest, cache_dir)
+    return prepared, reused
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prepare display-sized copies of the reward/error GIFs.")
+    parser.add_argument("source_dirs", nargs="*", default=GIF_SOURCE_DIRS_DEFAULT,
+                        help="Directories with .gif files (default: img/ img/errors/).")
+    parser.add_argument("--cache-dir", default=GIF_CACHE_DIR_DEFAULT, help="Output directory for the copies and manifest.")
+    parser.add_argument("--max-size", type=int, default=GIF_MAX_DISPLAY_SIZE, help="Maximum width/height in pixels.")
+    args = parser.parse_args(argv)
+    try:
+        import PIL # noqa: F401
+    except ImportError:
+        print("Error: Pillow is required to prepare the GIFs (pip install Pillow).")
+        return 1
+    prepared, reused = prepare_gif_assets(args.source_dirs, args.cache_dir, args.max_size)
+    print(f"{prepared} GIF(s) prepared, {reused} already up to date. Manifest: {os.path.join(args.cache_dir, MANIFEST_FILE_NAME)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""Travas de arquivo consultivas (advisory) entre processos: fcntl.flock, ou msvcrt no Windows.
+
+Só protegem contra outros processos que também pedem a trava (ver core.progress). No Windows
+não há trava compartilhada (shared=True trava de forma exclusiva) e a trava é de um byte
+muito além do fim do arquivo, para não impedir que outros processos o leiam.
+"""
+import contextlib
+import os
+import time
+
+try:
+    import fcntl
+except ImportError: # Windows
+    fcntl = None
+    import msvcrt
+
+_MSVCRT_LOCK_OFFSET = 1 << 62 # Byte travado no Windows (travas de intervalo impedem leituras do intervalo)
+
+
+def lock(f, shared=False, blocking=True):
+    """Trava o arquivo aberto f; com blocking=False, retorna False (em vez de esperar) se outro processo o travou."""
+    if fcntl:
+        flags = (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | (0 if blocking else fcntl.LOCK_NB)
+        try:
+            fcntl.flock(f.fileno(), flags)
+        except BlockingIOError:
+            return False
+        return True
+    os.lseek(f.fileno(), _MSVCRT_LOCK_OFFSET, os.SEEK_SET)
+    while True: # msvcrt.LK_LOCK desiste depois de 10 tentativas; aqui a espera é sem limite, como no flock
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            if not blocking:
+                return False
+            time.sleep(0.05)
+
+
+def unlock(f):
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        os.lseek(f.fileno(), _MSVCRT_LOCK_OFFSET, os.SEEK_SET)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextlib.contextmanager
+def locked(path, shared=False):
+    """Trava path (criado se preciso) enquanto durar o bloco with."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, 'a+b') as f:
+        lock(f, shared)
+        try:
+            yield
+        finally:
+            unlock(f)
@@ -0,0 +1,54 @@
+"""Dicas progressivas para as palavras (compartilhadas pela GUI e pelo modo texto)."""
+import random
+
+MAX_HINT_LEVEL = 3
+
+
+def get_hint(word, hint_level):
+    """Dica para word no nível hint_level (1: underscores, 2: primeira e última letra, 3: ~60% da palavra)."""
+    n = len(word)
+    if n == 0: return ""
+    if n == 1 and hint_level >= 1 : return word # For single letter words, hint reveals it
+
+    if hint_level == 1: # Only underscores
+        return " ".join(["_"] * n)
+    
+    elif hint_level == 2: # First and last
+        if n <= 2: # For words like "at", hint 2 becomes "a _"
+            return " ".join(list(word[0] + "_" * (n-1))) if n > 0 else ""
+        components = [word[0]]
+        components.extend(["_"] * (n - 2))
+        components.append(word[-1])
+        return " ".join(components)
+
+    elif hint_level == 3: # Approx 60% reveal
+        if n <= 2: # For short words, reveal all
+            return " ".join(list(word))
+
+        num_to_reveal = int(n * 0.6)
+        if num_to_reveal == 0 and n > 0: num_to_reveal = 1
+        # Ensure at least first and last are shown if possible, and count them
+        # towards num_to_reveal if they are part of the 60% target.
+        
+        revealed_indices = set()
+        # Always try to reveal first and last
+        if n > 0: revealed_indices.add(0)
+        if n > 1: revealed_indices.add(n - 1)
+
+        # Get other indices to reveal, avoiding first and last if already added
+        other_indices = [i for i in range(n) if i not in revealed_indices]
+        random.shuffle(other_indices)
+
+        # Add more indices until num_to_reveal is met or no more indices
+        while len(revealed_indices) < num_to_reveal and other_indices:
+            revealed_indices.add(other_indices.pop())
+        
+        hint_list = []
+        for i, char in enumerate(word):
+            if i in revealed_indices:
+                hint_list.append(char)
+            else:
+                hint_list.append("_")
+        return " ".join(hint_list)
+    
+    return " ".join(["_"] * n) # Default or unknown level
@@ -0,0 +1,473 @@
+"""Leitura e gravação do progresso de uma lista de palavras (snapshot + diários).
+
+O progresso fica no snapshot binário (.progress.bin, ver core/snapshot.py), reescrito só na
+compactação (depois de uma pausa nas respostas), e em diários onde cada resposta é
+acrescentada como uma linha JSON com número de sequência. Cada instância do programa
+(ProgressJournal) escreve no seu próprio diário (.progress.json.journal.<instância>), e cada
+registro é uma resposta: carregar = ler o snapshot e somar a ele as respostas dos diários que
+ainda não estão nele (o snapshot guarda até que sequência incluiu cada diário). Assim, vários
+processos podem praticar a mesma lista ao mesmo tempo sem perder respostas.
+
+Snapshots JSON (.progress.json) e o diário único (.progress.json.journal, com o estado da
+palavra em vez de somas) de versões anteriores continuam sendo lidos: formato 2 ("version":
+2, só as palavras com algum progresso mais a impressão digital da lista) e formato 1 (sem
+"version", todas as palavras). O JSON continua disponível para exportação (save_progress).
+"""
+import hashlib
+import json
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+
+from .filelock import lock, locked
+from .snapshot import read_snapshot, write_snapshot
+from .store import WordStore
+from .wordfile import WordTexts
+
+WORDLISTS_DIR_NAME = "wordlists" # Nome do diretório para listas de palavras e progresso
+PROGRESS_FORMAT_VERSION = 2 # Formato do JSON gravado por save_progress
+SNAPSHOT_SUFFIX = ".bin"
+JOURNAL_SUFFIX = ".journal"
+LOCK_SUFFIX = ".lock"
+JOURNAL_FSYNC_BATCH = 32 # Máximo de registros entre dois fsync do diário
+JOURNAL_COMPACT_IDLE_SECONDS = 2.0 # Pausa sem respostas que dispara a compactação em segundo plano
+JOURNAL_COMPACT_EVERY = 500 # Registros no diário que forçam a compactação mesmo sem pausa
+_INSTANCE_RE = re.compile(r"[0-9a-f]{32}") # Identificação de uma instância (uuid4().hex)
+
+
+def progress_file_path(word_file_path, wordlists_dir=WORDLISTS_DIR_NAME):
+    """Caminho do arquivo de progresso (oculto) de uma lista, dentro de wordlists_dir."""
+    if not word_file_path:
+        return None
+    base_filename = os.path.basename(word_file_path)
+    return os.path.join(wordlists_dir, f".{base_filename}.progress.json")
+
+
+def word_list_fingerprint(texts):
+    """Impressão digital (SHA-1) das palavras da lista, na ordem do arquivo."""
+    if isinstance(texts, WordTexts):
+        return hashlib.sha1(texts.data.encode('utf-8')).hexdigest() # data já é cada palavra seguida de "\n"
+    joined = "\n".join(texts)
+    if texts:
+        joined += "\n" # Cada palavra seguida de "\n"
+    return hashlib.sha1(joined.encode('utf-8')).hexdigest()
+
+
+def is_untouched(word_record):
+    """True se o registro não tem progresso nenhum (não é gravado no formato 2)."""
+    return not (word_record.get("correct") or word_record.get("incorrect") or word_record.get("mastered")
+                or word_record.get("presented") or "due" in word_record)
+
+
+def journal_file_path(progress_file, instance=None):
+    """Diário da instância instance; sem instance, o diário único de versões anteriores."""
+    path = progress_file + JOURNAL_SUFFIX
+    return f"{path}.{instance}" if instance else path
+
+
+def lock_file_path(progress_file):
+    """Arquivo travado durante leituras (compartilhada) e compactações (exclusiva) de progress_file."""
+    return progress_file + LOCK_SUFFIX
+
+
+def snapshot_file_path(progress_file):
+    """Caminho do snapshot binário (.progress.bin) que acompanha progress_file (.progress.json)."""
+    return os.path.splitext(progress_file)[0] + SNAPSHOT_SUFFIX
+
+
+def instance_journals(progress_file):
+    """{instância: caminho} dos diários por instância de progress_file."""
+    directory = os.path.dirname(progress_file) or "."
+    prefix = os.path.basename(journal_file_path(progress_file)) + "."
+    if not os.path.isdir(directory):
+        return {}
+    return {entry.name[len(prefix):]: entry.path for entry in os.scandir(directory)
+            if entry.name.startswith(prefix) and _INSTANCE_RE.fullmatch(entry.name[len(prefix):])}
+
+
+def progress_exists(progress_file):
+    """True se há snapshot (binário ou JSON) ou diário para progress_file."""
+    return any(os.path.exists(path) for path in _progress_paths(progress_file)) or bool(instance_journals(progress_file))
+
+
+def remove_progress(progress_file):
+    """Apaga os snapshots e os diários de progress_file (os que existirem)."""
+    for path in (*_progress_paths(progress_file), *instance_journals(progress_file).values()):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _progress_paths(progress_file):
+    return snapshot_file_path(progress_file), progress_file, journal_file_path(progress_file)
+
+
+def _word_index(texts, text, hint, positions):
+    """Posição de text em texts: hint se ele apontar para a palavra certa; senão busca em positions (preenchido sob demanda)."""
+    if hint is not None and 0 <= hint < len(texts) and texts[hint] == text:
+        return hint
+    if not positions:
+        positions.update((word, i) for i, word in enumerate(texts))
+    return positions.get(text)
+
+
+def _read_journal(journal_file):
+    """Registros do diário, até a primeira linha incompleta."""
+    if not os.path.exists(journal_file):
+        return
+    with open(journal_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                print(f"Warning: Truncated record in '{journal_file}'. Ignoring the rest of the journal.")
+                return # Última linha incompleta (queda durante a gravação)
+
+
+def _merge_attempt(saved, record):
+    """saved (registro do arquivo de progresso, ou None) com a resposta de record (registro de um diário por instância) somada.
+
+    Acertos e erros são somados; mastered e presented ficam ligados se estiverem em qualquer um;
+    a agenda de revisão é a da resposta (os registros são aplicados na ordem em que foram dados).
+    """
+    word = record["word"]
+    merged = dict(saved) if saved else {"text": word["text"], "correct": 0, "incorrect": 0, "mastered": False, "presented": False}
+    counter = "correct" if record["correct"] else "incorrect"
+    merged[counter] = merged.get(counter, 0) + 1
+    merged["mastered"] = bool(merged.get("mastered") or word.get("mastered"))
+    merged["presented"] = bool(merged.get("presented") or word.get("presented"))
+    if "due" in word:
+        merged["box"] = word.get("box", 0)
+        merged["due"] = word["due"]
+    return merged
+
+
+def load_progress(progress_file, word_texts=None, fingerprint=None):
+    """Lê o snapshot e soma os diários; exceções de leitura/parse do snapshot são repassadas a quem chamou.
+
+    Retorna {"words_data": [...], "word_store": WordStore ou None, "consecutive_correct_answers": n,
+    "journal_seq": última sequência aplicada do diário único de versões anteriores,
+    "journals": {instância: última sequência aplicada do diário dela},
+    "word_list_fingerprint": impressão digital gravada ou None}.
+
+    Se o snapshot binário foi gravado para a lista word_texts (mesma impressão digital),
+    "word_store" traz o progresso já em colunas, na ordem de word_texts, e "words_data" só o
+    das palavras que não estão em word_texts (as que saíram da lista, ver write_snapshot).
+    Nos demais casos todo o progresso vem em "words_data" (lista de dicts).
+
+    Outros processos podem estar escrevendo nos diários: quem chama deve segurar a trava de
+    lock_file_path(progress_file) (ver ProgressJournal.load).
+    """
+    state = {"words_data": [], "word_store": None, "consecutive_correct_answers": 0,
+             "journal_seq": 0, "journals": {}, "word_list_fingerprint": None}
+    included = {} # Instância -> última sequência do diário dela já incluída no snapshot
+    snapshot_file = snapshot_file_path(progress_file)
+    if os.path.exists(snapshot_file):
+        snapshot = read_snapshot(snapshot_file)
+        state["consecutive_correct_answers"] = snapshot.consecutive_correct_answers
+        state["journal_seq"] = snapshot.journal_seq
+        state["word_list_fingerprint"] = snapshot.fingerprint
+        included = snapshot.journals
+        if word_texts is not None and snapshot.fingerprint and snapshot.count >= len(word_texts) and \
+                snapshot.fingerprint == (fingerprint or word_list_fingerprint(word_texts)):
+            state["word_store"] = snapshot.to_store(word_texts)
+            if snapshot.count > len(word_texts):
+                state["words_data"] = snapshot.tail_store(len(word_texts)).to_progress_data()
+        else:
+            state["words_data"] = snapshot.to_store().to_progress_data()
+    elif os.path.exists(progress_file):
+        with open(progress_file, 'r', encoding='utf-8') as f:
+            state.update(json.load(f))
+    last_seq = state["journal_seq"]
+
+    store = state["word_store"]
+    words_data = state["words_data"]
+    positions = {} # Texto -> índice em store (preenchido sob demanda)
+    data_positions = {} # Texto -> posição em words_data (idem)
+
+    def apply(record, merge):
+        word = record["word"]
+        if store is not None:
+            index = _word_index(store.texts, word["text"], record.get("index"), positions)
+            if index is not None:
+                store.update(index, _merge_attempt(store.to_dict(index), record) if merge else word)
+                return
+        # Palavra fora de store (saiu da lista): fica em words_data, para não perder o progresso dela
+        if not data_positions:
+            data_positions.update((item["text"], i) for i, item in enumerate(words_data))
+        position = data_positions.get(word["text"])
+        if position is None:
+            data_positions[word["text"]] = len(words_data)
+            words_data.append(_merge_attempt(None, record) if merge else word)
+        else:
+            words_data[position] = _merge_attempt(words_data[position], record) if merge else word
+
+    for record in _read_journal(journal_file_path(progress_file)): # Diário único: o registro traz o estado da palavra
+        if record["seq"] <= last_seq:
+            continue # Já incluído no snapshot
+        last_seq = record["seq"]
+        if "word" in record:
+            apply(record, merge=False)
+        if "streak" in record:
+            state["consecutive_correct_answers"] = record["streak"]
+    state["journal_seq"] = last_seq
+
+    attempts = [] # Registros ainda fora do snapshot, de todos os diários por instância
+    for instance, path in instance_journals(progress_file).items():
+        instance_seq = included.get(instance, 0)
+        for record in _read_journal(path):
+            if record["seq"] > instance_seq:
+                attempts.append(record)
+                instance_seq = record["seq"]
+        state["journals"][instance] = instance_seq
+    attempts.sort(key=lambda record: record["time"]) # Na ordem em que as respostas foram dadas
+    for record in attempts:
+        if "word" in record:
+            apply(record, merge=True)
+        if "streak" in record:
+            state["consecutive_correct_answers"] = record["streak"]
+    return state
+
+
+def save_progress(progress_file, words_data, consecutive_correct_answers, journal_seq=0, fingerprint=None):
+    """Grava o progresso em JSON no formato 2 (só palavras com progresso) de forma atômica (arquivo temporário + rename).
+
+    Usado para exportar; os snapshots do diário são binários (ver core/snapshot.py).
+    """
+    # Garante que o diretório wordlists existe antes de salvar
+    os.makedirs(os.path.dirname(progress_file) or ".", exist_ok=True)
+    data_to_save = {
+        "version": PROGRESS_FORMAT_VERSION,
+        "word_list_fingerprint": fingerprint,
+        "words_data": [word for word in words_data if not is_untouched(word)],
+        "consecutive_correct_answers": consecutive_correct_answers,
+        "journal_seq": journal_seq, # Registros do diário até aqui já estão neste snapshot
+        # "current_student_level_name": ... # O nível é derivado
+    }
+    tmp_file = progress_file + ".tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(data_to_save, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, progress_file)
+
+
+class ProgressJournal:
+    """Progresso de uma lista em snapshot binário + um diário desta instância, gravados por um thread próprio.
+
+    append_word/append_streak só numeram o registro e o colocam numa fila (custo de
+    microssegundos para quem chama). O thread grava as linhas no diário desta instância e faz
+    fsync em lotes de até fsync_batch registros (ou quando a fila esvazia). Enquanto a
+    instância existe, o diário dela fica travado; é assim que as outras sabem que ele ainda
+    está em uso.
+
+    Depois de idle_seconds sem respostas novas, o thread compacta: com a trava exclusiva de
+    lock_file_path(progress_file), lê o progresso salvo com todos os diários (inclusive os de
+    outros processos abertos na mesma lista), grava um snapshot novo (arquivo temporário +
+    rename), esvazia o seu diário e apaga os de instâncias já encerradas. Uma sessão sem
+    pausas compacta a cada compact_every registros. A trava é só dessas leituras e
+    compactações, nunca durante a prática, e nada disso passa pelo thread da interface.
+
+    word_texts são as palavras da lista aberta; a impressão digital delas vai nos snapshots e
+    load avisa se o progresso salvo for de outra versão da lista.
+
+    Mesma interface do SQLiteProgressStore (core/progress_db.py): exists, load, append_word,
+    append_streak, reset, saved_location e close.
+    """
+    def __init__(self, progress_file, word_texts=(), idle_seconds=JOURNAL_COMPACT_IDLE_SECONDS,
+                 fsync_batch=JOURNAL_FSYNC_BATCH, compact_every=JOURNAL_COMPACT_EVERY):
+        self.progress_file = progress_file
+        self.instance = uuid.uuid4().hex
+        self.journal_file = journal_file_path(progress_file, self.instance)
+        self.snapshot_file = snapshot_file_path(progress_file)
+        self.lock_file = lock_file_path(progress_file)
+        self.location = self.snapshot_file # Para mensagens ao usuário
+        self.word_texts = word_texts # Compartilhada com o WordStore da lista (nunca é alterada)
+        self.fingerprint = word_list_fingerprint(self.word_texts)
+        self.idle_seconds = idle_seconds
+        self.fsync_batch = fsync_batch
+        self.compact_every = compact_every
+        self._seq = 0 # Sequência do diário desta instância (começa vazio)
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="progress-journal", daemon=True)
+        self._thread.start()
+
+    def exists(self):
+        return progress_exists(self.progress_file)
+
+    def load(self):
+        """Estado salvo (ver load_progress), com as respostas de todas as instâncias até agora."""
+        with locked(self.lock_file, shared=True): # Sem compactação de outra instância no meio da leitura
+            state = load_progress(self.progress_file, self.word_texts, self.fingerprint)
+        saved_fingerprint = state["word_list_fingerprint"]
+        if saved_fingerprint and saved_fingerprint != self.fingerprint:
+            print(f"Warning: '{self.progress_file}' was saved for a different version of the word list. "
+                  "Progress is matched by word.")
+        return state
+
+    def append_word(self, word_record, correct_attempt, word_index=None):
+        """word_index (posição da palavra na lista) evita procurar o texto ao reaplicar o registro."""
+        self._append({"word": word_record, "index": word_index, "correct": correct_attempt})
+
+    def append_streak(self, consecutive_correct_answers):
+        self._append({"streak": consecutive_correct_answers})
+
+    def _append(self, record):
+        self._seq += 1
+        record["seq"] = self._seq
+        record["time"] = time.time() # Ordena as respostas de diários diferentes (ver load_progress)
+        self._queue.put(("record", record))
+
+    def saved_location(self):
+        """Onde as respostas gravadas até aqui estão (para mensagens ao usuário).
+
+        O snapshot só é reescrito na compactação: enquanto o diário desta instância tiver
+        respostas, são elas que ainda não estão no snapshot (que pode nem existir).
+        """
+        if os.path.exists(self.journal_file) and os.path.getsize(self.journal_file):
+            return f"{self.journal_file} (compacted into {self.snapshot_file} later)"
+        return self.snapshot_file
+
+    def compact(self):
+        """Pede um snapshot com tudo o que já foi registrado, sem esperar a pausa."""
+        self._queue.put(("compact", None))
+
+    def reset(self):
+        """Apaga o progresso salvo desta lista; os registros seguintes começam do zero."""
+        self._queue.put(("reset", None))
+
+    def close(self, timeout=5):
+        """Grava e sincroniza o que estiver na fila e encerra o thread (sem compactar)."""
+        if self._thread.is_alive():
+            self._queue.put(("close", None))
+            self._thread.join(timeout)
+
+    def _blank_store(self):
+        store = WordStore()
+        store.texts = self.word_texts
+        store.reset_stats()
+        return store
+
+    def _run(self):
+        journal = None # Aberto no primeiro registro, para não criar um diário vazio
+        pending = 0 # Registros gravados ainda sem fsync
+        since_compaction = 0 # Registros no diário desde o último snapshot
+        last_record = 0.0 # Quando chegou o último registro (time.monotonic)
+        while True:
+            timeout = None
+            if since_compaction:
+                timeout = max(0.0, last_record + self.idle_seconds - time.monotonic())
+            try:
+                kind, payload = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                kind, payload = "compact", None # Pausa depois de respostas: hora de compactar
+            try:
+                if kind == "record":
+                    if journal is None:
+                        journal = self._open_journal()
+                    journal.write(json.dumps(payload, separators=(',', ':')) + "\n")
+                    pending += 1
+                    since_compaction += 1
+                    last_record = time.monotonic()
+                    if since_compaction >= self.compact_every:
+                        kind = "compact"
+                    elif pending < self.fsync_batch and not self._queue.empty():
+                        continue # Agrupa com os próximos registros já na fila
+                if pending:
+                    journal.flush()
+                    os.fsync(journal.fileno())
+                    pending = 0
+                if kind == "compact" and since_compaction:
+                    self._compact(journal)
+                    since_compaction = 0
+                elif kind == "reset":
+                    self._reset(journal)
+                    since_compaction = 0
+            except Exception as e:
+                print(f"Error writing progress journal '{self.journal_file}': {e}")
+                since_compaction = 0 # Tenta de novo só depois de novos registros
+            if kind == "close":
+                break
+        if journal:
+            empty = os.fstat(journal.fileno()).st_size == 0 # Tudo já está no snapshot
+            journal.close() # Solta a trava: a instância acabou
+            if empty:
+                os.remove(self.journal_file)
+
+    def _open_journal(self):
+        os.makedirs(os.path.dirname(self.journal_file) or ".", exist_ok=True)
+        # Criado e travado sem compactação no meio: senão ela poderia tomar o diário novo por abandonado
+        with locked(self.lock_file, shared=True):
+            journal = open(self.journal_file, 'a', encoding='utf-8')
+            lock(journal)
+        return journal
+
+    def _other_journals(self):
+        """({instância: caminho} dos diários de instâncias já encerradas, {instância: caminho} dos que ainda estão em uso).
+
+        Chamado com a trava exclusiva: nenhum diário novo aparece no meio. Um diário sem trava
+        é de uma instância que acabou e não volta (cada instância tem a sua identificação),
+        então o conteúdo dele não muda mais: pode ser lido e depois apagado. Um diário em uso
+        pode crescer (ou ser encerrado) a qualquer momento e nunca é apagado aqui.
+        """
+        abandoned, running = {}, {}
+        for instance, path in instance_journals(self.progress_file).items():
+            if instance == self.instance:
+                continue
+            try:
+                f = open(path, 'rb')
+            except FileNotFoundError: # Vazio, apagado pela própria instância ao encerrar
+                continue
+            with f:
+                (abandoned if lock(f, blocking=False) else running)[instance] = path
+        return abandoned, running
+
+    def _truncate_journal(self, journal):
+        if journal:
+            journal.truncate(0)
+            os.fsync(journal.fileno())
+
+    def _compact(self, journal):
+        with locked(self.lock_file): # Exclusiva: leituras e outras compactações esperam
+            # Antes de ler: um diário que estava em uso durante a leitura pode ter recebido respostas depois dela
+            abandoned, _ = self._other_journals()
+            state = load_progress(self.progress_file, self.word_texts, self.fingerprint)
+            store = state["word_store"]
+            outside = state["words_data"] # Com store: só as palavras fora da lista aberta
+            if store is None: # Progresso lido de JSON ou de outra versão da lista
+                store = self._blank_store()
+                positions = {}
+                outside = []
+                for word in state["words_data"]:
+                    index = _word_index(store.texts, word["text"], None, positions)
+                    if index is None:
+                        outside.append(word)
+                    else:
+                        store.update(index, word)
+            # Palavras que saíram da lista (ex: arquivo relido sem elas) continuam no snapshot, depois das da lista
+            retired = WordStore([word["text"] for word in outside])
+            for index, word in enumerate(outside):
+                retired.update(index, word)
+            write_snapshot(self.snapshot_file, store, state["consecutive_correct_answers"], state["journal_seq"],
+                           self.fingerprint, state["journals"], retired)
+            # Tudo o que foi lido está no snapshot: o diário desta instância pode recomeçar vazio, e os abandonados e
+            # os arquivos de versões anteriores podem sair
+            self._truncate_journal(journal)
+            for path in (self.progress_file, journal_file_path(self.progress_file), *abandoned.values()):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _reset(self, journal):
+        with locked(self.lock_file):
+            abandoned, running = self._other_journals()
+            # Respostas que outras instâncias abertas já gravaram ficam de fora; as próximas delas contam
+            skipped = {instance: max((record["seq"] for record in _read_journal(path)), default=0)
+                       for instance, path in running.items()}
+            self._truncate_journal(journal)
+            for path in (*_progress_paths(self.progress_file), *abandoned.values()):
+                if os.path.exists(path):
+                    os.remove(path)
+            if skipped:
+                write_snapshot(self.snapshot_file, self._blank_store(), 0, 0, self.fingerprint, skipped)
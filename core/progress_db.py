@@ -0,0 +1,260 @@
+"""Progresso em SQLite (opcional): várias listas e vários alunos (perfis) num único banco.
+
+Alternativa ao snapshot + diários de core/progress.py, com a mesma interface
+(exists, load, append_word, append_streak, reset, saved_location, close). O banco usa WAL; as gravações
+vão para um thread próprio e são confirmadas em transações agrupadas. Cada resposta soma aos
+contadores da palavra no banco (em vez de sobrescrevê-los), então vários processos podem
+praticar a mesma lista ao mesmo tempo sem perder respostas.
+"""
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+PROGRESS_DB_FILE_DEFAULT = os.path.join("wordlists", "progress.sqlite3")
+PROFILE_NAME_DEFAULT = "default"
+DB_COMMIT_BATCH = 64 # Máximo de operações por transação
+DB_BUSY_TIMEOUT_SECONDS = 30.0 # Espera pela trava de escrita de outro processo antes de desistir do comando
+DB_WRITE_ATTEMPTS = 3 # Tentativas de gravar um lote antes de deixá-lo para o próximo
+DB_RETRY_DELAY_SECONDS = 1.0 # Pausa entre duas tentativas
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS word_lists (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS words (
+    id INTEGER PRIMARY KEY,
+    list_id INTEGER NOT NULL REFERENCES word_lists(id),
+    text TEXT NOT NULL,
+    UNIQUE (list_id, text)
+);
+CREATE TABLE IF NOT EXISTS progress (
+    profile_id INTEGER NOT NULL REFERENCES profiles(id),
+    word_id INTEGER NOT NULL REFERENCES words(id),
+    correct INTEGER NOT NULL DEFAULT 0,
+    incorrect INTEGER NOT NULL DEFAULT 0,
+    mastered INTEGER NOT NULL DEFAULT 0,
+    presented INTEGER NOT NULL DEFAULT 0,
+    box INTEGER,
+    due REAL,
+    PRIMARY KEY (profile_id, word_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    profile_id INTEGER NOT NULL REFERENCES profiles(id),
+    word_id INTEGER NOT NULL REFERENCES words(id),
+    correct INTEGER NOT NULL,
+    answered_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attempts_by_word ON attempts (profile_id, word_id);
+CREATE TABLE IF NOT EXISTS list_state (
+    profile_id INTEGER NOT NULL REFERENCES profiles(id),
+    list_id INTEGER NOT NULL REFERENCES word_lists(id),
+    consecutive_correct_answers INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (profile_id, list_id)
+) WITHOUT ROWID;
+"""
+
+
+def connect(db_file):
+    os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+    connection = sqlite3.connect(db_file, timeout=DB_BUSY_TIMEOUT_SECONDS) # busy_timeout: espera a trava em vez de falhar
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL") # Com WAL, seguro contra corrupção; só o último lote pode se perder numa queda de energia
+    connection.execute("PRAGMA foreign_keys=ON")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def _get_or_create(connection, table, name):
+    connection.execute(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)", (name,))
+    return connection.execute(f"SELECT id FROM {table} WHERE name = ?", (name,)).fetchone()[0]
+
+
+def cross_list_stats(db_file=PROGRESS_DB_FILE_DEFAULT, profile=PROFILE_NAME_DEFAULT):
+    """Totais por lista do perfil, numa única consulta.
+
+    Retorna [(lista, palavras estudadas, masterizadas, acertos, erros), ...] em ordem de nome.
+    """
+    connection = connect(db_file)
+    try:
+        return connection.execute("""
+            SELECT l.name, SUM(p.presented), SUM(p.mastered), SUM(p.correct), SUM(p.incorrect)
+            FROM progress p
+            JOIN profiles pr ON pr.id = p.profile_id
+            JOIN words w ON w.id = p.word_id
+            JOIN word_lists l ON l.id = w.list_id
+            WHERE pr.name = ?
+            GROUP BY l.id
+            ORDER BY l.name
+        """, (profile,)).fetchall()
+    finally:
+        connection.close()
+
+
+class SQLiteProgressStore:
+    """Progresso de uma lista (list_name) de um perfil, guardado no banco db_file.
+
+    Leituras (exists, load) usam uma conexão no thread de quem chama e trazem só as linhas
+    da lista aberta. Gravações entram numa fila e o thread do banco as confirma em
+    transações de até commit_batch operações (ou quando a fila esvazia). Um lote que falha
+    (ex: outro processo segurou a trava de escrita por mais de DB_BUSY_TIMEOUT_SECONDS) é
+    desfeito e gravado de novo; se ainda assim não der, as operações dele continuam
+    guardadas e vão junto com o lote seguinte, em vez de serem descartadas.
+    """
+    def __init__(self, db_file, list_name, profile=PROFILE_NAME_DEFAULT, commit_batch=DB_COMMIT_BATCH):
+        self.db_file = db_file
+        self.list_name = list_name
+        self.profile = profile
+        self.location = f"{db_file} ({profile}: {list_name})" # Para mensagens ao usuário
+        self.commit_batch = commit_batch
+        connection = connect(db_file)
+        try:
+            with connection:
+                self._profile_id = _get_or_create(connection, "profiles", profile)
+                self._list_id = _get_or_create(connection, "word_lists", list_name)
+        finally:
+            connection.close()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="progress-db", daemon=True)
+        self._thread.start()
+
+    def exists(self):
+        self.flush()
+        connection = connect(self.db_file)
+        try:
+            row = connection.execute("""
+                SELECT 1 FROM progress p JOIN words w ON w.id = p.word_id
+                WHERE w.list_id = ? AND p.profile_id = ? LIMIT 1
+            """, (self._list_id, self._profile_id)).fetchone()
+            return row is not None
+        finally:
+            connection.close()
+
+    def load(self):
+        """Estado salvo desta lista, no mesmo formato de core.progress.load_progress."""
+        self.flush()
+        connection = connect(self.db_file)
+        try:
+            words_data = []
+            for text, correct, incorrect, mastered, presented, box, due in connection.execute("""
+                    SELECT w.text, p.correct, p.incorrect, p.mastered, p.presented, p.box, p.due
+                    FROM words w JOIN progress p ON p.word_id = w.id
+                    WHERE w.list_id = ? AND p.profile_id = ?
+                    """, (self._list_id, self._profile_id)):
+                record = {"text": text, "correct": correct, "incorrect": incorrect,
+                          "mastered": bool(mastered), "presented": bool(presented)}
+                if due is not None:
+                    record["box"] = box
+                    record["due"] = due
+                words_data.append(record)
+            row = connection.execute("SELECT consecutive_correct_answers FROM list_state WHERE profile_id = ? AND list_id = ?",
+                                     (self._profile_id, self._list_id)).fetchone()
+            return {"words_data": words_data, "consecutive_correct_answers": row[0] if row else 0}
+        finally:
+            connection.close()
+
+    def append_word(self, word_record, correct_attempt, word_index=None):
+        self._queue.put(("word", (word_record, correct_attempt, time.time())))
+
+    def append_streak(self, consecutive_correct_answers):
+        self._queue.put(("streak", consecutive_correct_answers))
+
+    def reset(self):
+        """Apaga progresso, tentativas e sequência de acertos desta lista para o perfil."""
+        self._queue.put(("reset", None))
+
+    def flush(self):
+        """Espera o thread do banco processar tudo o que já está na fila (um lote que falhou fica para o próximo)."""
+        self._queue.join()
+
+    def saved_location(self):
+        """Onde as respostas gravadas até aqui estão (para mensagens ao usuário)."""
+        return self.location
+
+    def close(self, timeout=5):
+        if self._thread.is_alive():
+            self._queue.put(("close", None))
+            self._thread.join(timeout)
+
+    def _run(self):
+        connection = connect(self.db_file)
+        word_ids = {} # texto -> id em words (desta lista)
+        batch = [] # Operações ainda não confirmadas no banco
+        while True:
+            kind, payload = self._queue.get()
+            try:
+                if kind != "close":
+                    batch.append((kind, payload))
+                if batch and (len(batch) >= self.commit_batch or self._queue.empty() or kind == "close"):
+                    batch = self._commit(connection, word_ids, batch)
+            finally:
+                self._queue.task_done()
+            if kind == "close":
+                break
+        if batch:
+            print(f"Error: {len(batch)} progress update(s) could not be saved to '{self.db_file}'.")
+        connection.close()
+
+    def _commit(self, connection, word_ids, batch):
+        """Grava batch numa única transação; retorna as operações que não puderam ser gravadas (vazio se deu certo)."""
+        for attempt in range(1, DB_WRITE_ATTEMPTS + 1):
+            try:
+                with connection: # Confirma no fim, ou desfaz tudo se algum comando falhar
+                    for kind, payload in batch:
+                        self._apply(connection, word_ids, kind, payload)
+                return []
+            except Exception as e:
+                word_ids.clear() # Palavras inseridas na transação desfeita não existem mais
+                print(f"Error writing progress database '{self.db_file}' (attempt {attempt} of {DB_WRITE_ATTEMPTS}): {e}")
+                if attempt < DB_WRITE_ATTEMPTS:
+                    time.sleep(DB_RETRY_DELAY_SECONDS)
+        return batch
+
+    def _apply(self, connection, word_ids, kind, payload):
+        if kind == "word":
+            self._write_word(connection, word_ids, *payload)
+        elif kind == "streak":
+            connection.execute("""
+                INSERT INTO list_state (profile_id, list_id, consecutive_correct_answers) VALUES (?, ?, ?)
+                ON CONFLICT (profile_id, list_id) DO UPDATE SET consecutive_correct_answers = excluded.consecutive_correct_answers
+            """, (self._profile_id, self._list_id, payload))
+        elif kind == "reset":
+            self._delete_list_progress(connection)
+
+    def _word_id(self, connection, word_ids, text):
+        word_id = word_ids.get(text)
+        if word_id is None:
+            connection.execute("INSERT OR IGNORE INTO words (list_id, text) VALUES (?, ?)", (self._list_id, text))
+            word_id = connection.execute("SELECT id FROM words WHERE list_id = ? AND text = ?", (self._list_id, text)).fetchone()[0]
+            word_ids[text] = word_id
+        return word_id
+
+    def _write_word(self, connection, word_ids, word_record, correct_attempt, answered_at):
+        word_id = self._word_id(connection, word_ids, word_record["text"])
+        # Palavra nova no banco: o estado de word_record; senão soma esta resposta ao que já está lá
+        # (outro processo pode ter gravado respostas para a mesma palavra desde que esta lista foi carregada)
+        connection.execute("""
+            INSERT INTO progress (profile_id, word_id, correct, incorrect, mastered, presented, box, due)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (profile_id, word_id) DO UPDATE SET
+                correct = progress.correct + ?, incorrect = progress.incorrect + ?,
+                mastered = max(progress.mastered, excluded.mastered), presented = max(progress.presented, excluded.presented),
+                box = excluded.box, due = excluded.due
+        """, (self._profile_id, word_id, word_record["correct"], word_record["incorrect"], word_record["mastered"],
+              word_record["presented"], word_record.get("box"), word_record.get("due"),
+              int(bool(correct_attempt)), int(not correct_attempt)))
+        connection.execute("INSERT INTO attempts (profile_id, word_id, correct, answered_at) VALUES (?, ?, ?, ?)",
+                           (self._profile_id, word_id, correct_attempt, answered_at))
+
+    def _delete_list_progress(self, connection):
+        list_words = "SELECT id FROM words WHERE list_id = ?"
+        connection.execute(f"DELETE FROM progress WHERE profile_id = ? AND word_id IN ({list_words})", (self._profile_id, self._list_id))
+        connection.execute(f"DELETE FROM attempts WHERE profile_id = ? AND word_id IN ({list_words})", (self._profile_id, self._list_id))
+        connection.execute("DELETE FROM list_state WHERE profile_id = ? AND list_id = ?", (self._profile_id, self._list_id))
@@ -0,0 +1,136 @@
+"""Sessões com várias listas de palavras abertas juntas, sobre um índice único de palavras.
+
+Cada palavra entra uma única vez no índice da sessão (WordListSession.texts), mesmo que
+esteja em várias listas (sem diferenciar maiúsculas de minúsculas, como em core.wordfile);
+progresso e áudio são os mesmos em todas elas. As palavras de cada lista ficam marcadas
+num bitset (bytes, 1 bit por palavra do índice), e escolher um subconjunto das listas é
+um OU desses bitsets, sem reler nenhum arquivo.
+"""
+from itertools import chain, compress
+
+from .wordfile import WordTexts
+
+_BYTE_BITS = [tuple(bool(byte >> bit & 1) for bit in range(8)) for byte in range(256)]
+
+
+def bitset_from_indexes(indexes, size):
+    bits = bytearray((size + 7) // 8)
+    for index in indexes:
+        bits[index >> 3] |= 1 << (index & 7)
+    return bytes(bits)
+
+
+def bitset_union(bitsets, size):
+    """OU dos bitsets (os mais curtos valem como completados com zeros), com espaço para size palavras."""
+    value = 0
+    for bits in bitsets:
+        value |= int.from_bytes(bits, 'little')
+    return value.to_bytes((size + 7) // 8, 'little')
+
+
+def bitset_contains(bits, index):
+    byte = index >> 3
+    return byte < len(bits) and bool(bits[byte] >> (index & 7) & 1)
+
+
+def bitset_count(bits):
+    return int.from_bytes(bits, 'little').bit_count()
+
+
+def bitset_flags(bits, size):
+    """Lista com um bool por índice em [0, size)."""
+    flags = list(chain.from_iterable(map(_BYTE_BITS.__getitem__, bits[:(size + 7) // 8])))
+    del flags[size:]
+    flags.extend([False] * (size - len(flags)))
+    return flags
+
+
+def bitset_indexes(bits, size):
+    """Índices (em ordem) dos bits ligados em [0, size)."""
+    return list(compress(range(size), bitset_flags(bits, size)))
+
+
+class WordListSession:
+    """Listas abertas (na ordem em que foram abertas) e o índice de palavras que elas compartilham.
+
+    Imutável: with_list devolve uma sessão nova, que pode ser montada em outro thread. Palavras
+    já no índice nunca mudam de posição; as novas vão para o fim. A primeira lista ocupa as
+    primeiras posições, na ordem do arquivo, e por isso seus índices são os da sessão.
+    """
+    def __init__(self):
+        self.names = [] # Identificação de cada lista (o caminho do arquivo, na GUI)
+        self.list_texts = {} # nome -> WordTexts da lista
+        self.members = {} # nome -> bitset das palavras da lista
+        self.texts = WordTexts()
+        self._renamed = {} # nome -> {índice: texto na lista}, quando ele difere do índice só em maiúsculas/minúsculas
+
+    def __len__(self):
+        return len(self.names)
+
+    def with_list(self, name, texts):
+        """Nova sessão com a lista texts (WordTexts) acrescentada; levanta ValueError se name já estiver aberta."""
+        if name in self.members:
+            raise ValueError(f"'{name}' is already open in this session.")
+        if not self.names:
+            session = self._copy([name])
+            session.texts = texts
+            session.list_texts[name] = texts
+            session.members[name] = bitset_from_indexes(range(len(texts)), len(texts))
+            session._renamed[name] = {}
+            return session
+        return self._copy(self.names + [name])._join(name, texts)
+
+    def with_reloaded_list(self, name, texts):
+        """Nova sessão com texts como o conteúdo novo da lista name, e os índices que entraram ou saíram dela.
+
+        Palavras novas vão para o fim do índice; as que saíram da lista continuam nele (com o
+        progresso), só deixam de pertencer a ela.
+        """
+        session = self._copy(self.names)._join(name, texts)
+        old_bits, new_bits = self.members[name], session.members[name]
+        flipped = int.from_bytes(old_bits, 'little') ^ int.from_bytes(new_bits, 'little')
+        return session, bitset_indexes(flipped.to_bytes(len(new_bits), 'little'), len(session.texts))
+
+    def _copy(self, names):
+        session = WordListSession()
+        session.names = names
+        session.list_texts = dict(self.list_texts)
+        session.members = dict(self.members)
+        session._renamed = dict(self._renamed)
+        session.texts = self.texts
+        return session
+
+    def _join(self, name, texts):
+        """Põe a lista name = texts no índice (acrescentando as palavras que faltam) e retorna self."""
+        words, keys = list(self.texts), list(self.texts.iter_keys())
+        known = len(words)
+        positions = {key: index for index, key in enumerate(keys)} # Só durante a junção
+        indexes, renamed = [], {}
+        for word, key in zip(texts, texts.iter_keys()):
+            index = positions.get(key)
+            if index is None:
+                index = positions[key] = len(words)
+                words.append(word)
+                keys.append(key)
+            elif words[index] != word:
+                renamed[index] = word
+            indexes.append(index)
+        if len(words) > known: # Sem palavras novas, o índice continua o mesmo objeto
+            self.texts = WordTexts.from_words(words, keys, self.texts.duplicates)
+        self.list_texts[name] = texts
+        self.members[name] = bitset_from_indexes(indexes, len(words))
+        self._renamed[name] = renamed
+        return self
+
+    def contains(self, name, index):
+        return bitset_contains(self.members[name], index)
+
+    def text_in(self, name, index):
+        """Texto da palavra index como está escrito na lista name."""
+        return self._renamed[name].get(index) or self.texts[index]
+
+    def subset(self, names):
+        """Bitset das palavras das listas names; None se forem todas as palavras do índice."""
+        size = len(self.texts)
+        bits = bitset_union((self.members[name] for name in names), size)
+        return None if bitset_count(bits) == size else bits
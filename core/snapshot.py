@@ -0,0 +1,180 @@
+"""Snapshot binário do progresso (.progress.bin), para retomar listas grandes sem parse de JSON.
+
+Layout (little-endian), depois do cabeçalho HEADER:
+    tamanhos dos textos    array('I') com n itens (bytes UTF-8 de cada palavra)
+    textos                 UTF-8 concatenados, completados com zeros até múltiplo de 8
+    correct, incorrect     array('I') com n itens cada
+    flags, box             array('B') com n itens cada, completados até múltiplo de 8
+    due                    array('d') com n itens (NaN = revisão não agendada)
+    diários incluídos      JOURNALS_HEADER (quantidade) + JOURNAL_ENTRY por diário (versão 2)
+
+Os diários incluídos são os diários por instância (ver core.progress) cujos registros já estão
+no snapshot: identificação da instância e último número de sequência aplicado.
+
+As palavras da lista vêm primeiro, e a impressão digital é só delas. Depois podem vir
+palavras que saíram da lista mas ainda têm progresso (quando a lista é relida sem elas),
+para que ele não se perca se elas voltarem.
+
+O checksum (CRC-32) cobre tudo depois do cabeçalho. As colunas estão na ordem da lista e
+são copiadas direto do arquivo mapeado em memória para um WordStore; os textos só são
+decodificados quando a impressão digital não bate com a lista aberta.
+"""
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+from .store import COLUMNS, WordStore
+
+SNAPSHOT_MAGIC = b"LWPS"
+SNAPSHOT_VERSION = 2
+SNAPSHOT_READABLE_VERSIONS = (1, 2) # A versão 1 não tem a tabela de diários incluídos
+# magic, versão, reservado, nº de palavras, acertos seguidos, journal_seq, impressão digital (SHA-1), CRC-32 do corpo
+HEADER = struct.Struct("<4sHHIIQ20sI")
+JOURNALS_HEADER = struct.Struct("<I4x") # Quantidade de diários incluídos
+JOURNAL_ENTRY = struct.Struct("<16sQ") # Instância (UUID), último número de sequência aplicado
+
+
+class SnapshotError(ValueError):
+    """Arquivo que não é um snapshot válido (magic, versão, tamanho ou checksum)."""
+
+
+def _padding(size):
+    return -size % 8
+
+
+class Snapshot:
+    """Conteúdo de um snapshot lido por read_snapshot."""
+    def __init__(self, count, consecutive_correct_answers, journal_seq, fingerprint, columns, text_lengths, text_blob, journals=None):
+        self.count = count
+        self.consecutive_correct_answers = consecutive_correct_answers
+        self.journal_seq = journal_seq
+        self.fingerprint = fingerprint
+        self.journals = journals or {} # Instância (hex) -> último número de sequência do diário dela já incluído
+        self.columns = columns # (correct, incorrect, flags, box, due)
+        self._text_lengths = text_lengths
+        self._text_blob = text_blob
+
+    def texts(self, start=0):
+        """Palavras gravadas no snapshot a partir da posição start (decodificadas sob demanda)."""
+        texts, offset = [], sum(self._text_lengths[:start])
+        blob = self._text_blob
+        for length in self._text_lengths[start:]:
+            texts.append(blob[offset:offset + length].decode('utf-8'))
+            offset += length
+        return texts
+
+    def to_store(self, texts=None):
+        """WordStore com as colunas do snapshot; texts (da lista aberta) evita decodificar os textos.
+
+        Com texts, só as primeiras len(texts) palavras (as da lista) entram; ver tail_store.
+        """
+        store = WordStore()
+        store.texts = texts if texts is not None else self.texts()
+        columns = self.columns
+        if len(store.texts) < self.count:
+            columns = [column[:len(store.texts)] for column in columns]
+        store.correct, store.incorrect, store.flags, store.box, store.due = columns
+        return store
+
+    def tail_store(self, start):
+        """WordStore das palavras a partir da posição start (as que saíram da lista, depois das dela)."""
+        store = WordStore()
+        store.texts = self.texts(start)
+        store.correct, store.incorrect, store.flags, store.box, store.due = [column[start:] for column in self.columns]
+        return store
+
+
+def write_snapshot(path, store, consecutive_correct_answers, journal_seq=0, fingerprint=None, journals=None, retired=None):
+    """Grava store de forma atômica (arquivo temporário + fsync + rename).
+
+    journals: {instância (hex): último número de sequência incluído} dos diários por instância.
+    retired: WordStore com as palavras que saíram da lista (gravadas depois das de store);
+    fingerprint continua sendo só o das palavras de store.
+    """
+    encoded = [text.encode('utf-8') for text in store.texts]
+    columns = [store.correct, store.incorrect, store.flags, store.box, store.due]
+    count = len(store)
+    if retired:
+        encoded.extend(text.encode('utf-8') for text in retired.texts)
+        columns = [column + getattr(retired, name) for column, name in zip(columns, COLUMNS)]
+        count += len(retired)
+    lengths = array('I', map(len, encoded))
+    blob = b"".join(encoded)
+    if sys.byteorder != "little":
+        lengths.byteswap()
+        columns = [array(column.typecode, column) for column in columns]
+        for column in columns:
+            column.byteswap()
+    correct, incorrect, flags, box, due = columns
+    parts = [lengths.tobytes(), blob, bytes(_padding(len(blob))),
+             correct.tobytes(), incorrect.tobytes(),
+             flags.tobytes(), box.tobytes(), bytes(_padding(2 * len(flags))),
+             due.tobytes(), JOURNALS_HEADER.pack(len(journals or {}))]
+    parts.extend(JOURNAL_ENTRY.pack(bytes.fromhex(instance), seq) for instance, seq in (journals or {}).items())
+    checksum = 0
+    for part in parts:
+        checksum = zlib.crc32(part, checksum)
+    header = HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, count, consecutive_correct_answers, journal_seq,
+                         bytes.fromhex(fingerprint) if fingerprint else bytes(20), checksum)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        for part in parts:
+            f.write(part)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path):
+    """Lê e valida o snapshot de path; levanta SnapshotError se ele estiver corrompido."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < HEADER.size: # Inclui o arquivo vazio, que mmap não aceita
+            raise SnapshotError(f"'{path}' is too short to be a progress snapshot.")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    with mapped:
+        magic, version, _, count, streak, journal_seq, fingerprint, checksum = HEADER.unpack_from(mapped)
+        if magic != SNAPSHOT_MAGIC or version not in SNAPSHOT_READABLE_VERSIONS:
+            raise SnapshotError(f"'{path}' is not a version {SNAPSHOT_VERSION} progress snapshot.")
+        with memoryview(mapped) as view, view[HEADER.size:] as body:
+            if zlib.crc32(body) != checksum:
+                raise SnapshotError(f"'{path}' is corrupted (checksum mismatch).")
+            offset = 0
+
+            def take(typecode, items):
+                nonlocal offset
+                column = array(typecode)
+                size = items * column.itemsize
+                if offset + size > len(body):
+                    raise SnapshotError(f"'{path}' is truncated.")
+                column.frombytes(body[offset:offset + size])
+                offset += size
+                if sys.byteorder != "little":
+                    column.byteswap()
+                return column
+
+            text_lengths = take('I', count)
+            blob_size = sum(text_lengths)
+            text_blob = bytes(body[offset:offset + blob_size])
+            offset += blob_size + _padding(blob_size)
+            correct, incorrect = take('I', count), take('I', count)
+            flags, box = take('B', count), take('B', count)
+            offset += _padding(2 * count)
+            due = take('d', count)
+            journals = {}
+            if version >= 2:
+                if offset + JOURNALS_HEADER.size > len(body):
+                    raise SnapshotError(f"'{path}' is truncated.")
+                (journal_count,) = JOURNALS_HEADER.unpack_from(body, offset)
+                offset += JOURNALS_HEADER.size
+                if offset + journal_count * JOURNAL_ENTRY.size > len(body):
+                    raise SnapshotError(f"'{path}' is truncated.")
+                for instance, seq in JOURNAL_ENTRY.iter_unpack(body[offset:offset + journal_count * JOURNAL_ENTRY.size]):
+                    journals[instance.hex()] = seq
+    return Snapshot(count, streak, journal_seq, fingerprint.hex() if any(fingerprint) else None,
+                    (correct, incorrect, flags, box, due), text_lengths, text_blob, journals)
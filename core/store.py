@@ -0,0 +1,171 @@
+"""Armazenamento compacto das palavras: tabela de textos + colunas em arrays tipados.
+
+Substitui a lista de dicionários (um dict de cinco chaves por palavra) usada antes por
+WordManager.words_data. Cada palavra é só uma posição nas colunas; WordRecord é uma
+visão leve dessa posição com a mesma interface de leitura do dict antigo
+(word["text"], word["mastered"], "due" in word, ...).
+"""
+import math
+import sys
+from array import array
+
+from .wordfile import WordTexts
+
+FLAG_MASTERED = 1
+FLAG_PRESENTED = 2
+_FLAG_KEYS = {"mastered": FLAG_MASTERED, "presented": FLAG_PRESENTED}
+_UNSCHEDULED = math.nan # Valor de due para palavras sem revisão agendada
+COLUMNS = ("correct", "incorrect", "flags", "box", "due") # Colunas de progresso de WordStore
+
+
+class WordStore:
+    """Palavras e progresso em colunas paralelas, indexadas pela posição da palavra na lista."""
+    def __init__(self, texts=()):
+        # Tabela de textos: a WordTexts de core.wordfile, ou uma lista de strings internadas
+        self.texts = texts if isinstance(texts, WordTexts) else [sys.intern(text) for text in texts]
+        size = len(self.texts)
+        self.correct = array('I', [0]) * size
+        self.incorrect = array('I', [0]) * size
+        self.flags = array('B', [0]) * size # FLAG_MASTERED | FLAG_PRESENTED
+        self.box = array('B', [0]) * size # Caixa de Leitner (modo espaçado)
+        self.due = array('d', [_UNSCHEDULED]) * size # Próxima revisão (epoch em segundos); NaN = não agendada
+
+    def __len__(self):
+        return len(self.texts)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.texts)
+        if not 0 <= index < len(self.texts):
+            raise IndexError("word index out of range")
+        return WordRecord(self, index)
+
+    def __iter__(self):
+        return (WordRecord(self, index) for index in range(len(self.texts)))
+
+    def key(self, index):
+        """Forma de comparação (casefold) da palavra index."""
+        texts = self.texts
+        return texts.key(index) if isinstance(texts, WordTexts) else texts[index].casefold()
+
+    def iter_keys(self):
+        """Formas de comparação de todas as palavras, na ordem da lista."""
+        texts = self.texts
+        return texts.iter_keys() if isinstance(texts, WordTexts) else (text.casefold() for text in texts)
+
+    def is_mastered(self, index):
+        return bool(self.flags[index] & FLAG_MASTERED)
+
+    def is_presented(self, index):
+        return bool(self.flags[index] & FLAG_PRESENTED)
+
+    def is_scheduled(self, index):
+        return not math.isnan(self.due[index])
+
+    def is_touched(self, index):
+        """True se a palavra tem algum progresso (acertos, erros, flags ou revisão agendada)."""
+        return bool(self.correct[index] or self.incorrect[index] or self.flags[index]) or self.is_scheduled(index)
+
+    def set_flag(self, index, flag, value):
+        if value:
+            self.flags[index] |= flag
+        else:
+            self.flags[index] &= ~flag
+
+    def unschedule(self, index):
+        self.box[index] = 0
+        self.due[index] = _UNSCHEDULED
+
+    def to_dict(self, index):
+        """Registro da palavra no formato do arquivo de progresso."""
+        record = {
+            "text": self.texts[index], "correct": self.correct[index], "incorrect": self.incorrect[index],
+            "mastered": self.is_mastered(index), "presented": self.is_presented(index)
+        }
+        if self.is_scheduled(index):
+            record["box"] = self.box[index]
+            record["due"] = self.due[index]
+        return record
+
+    def to_progress_data(self):
+        """Palavras com progresso, no formato do arquivo de progresso (lista de dicts)."""
+        return [self.to_dict(index) for index in range(len(self.texts)) if self.is_touched(index)]
+
+    def extend(self, texts):
+        """Passa a usar texts, que começa pelas palavras atuais (ver core.session); as novas entram sem progresso."""
+        added = len(texts) - len(self.texts)
+        self.texts = texts
+        self.correct.extend(array('I', [0]) * added)
+        self.incorrect.extend(array('I', [0]) * added)
+        self.flags.extend(array('B', [0]) * added)
+        self.box.extend(array('B', [0]) * added)
+        self.due.extend(array('d', [_UNSCHEDULED]) * added)
+
+    def copy(self):
+        """Cópia independente (as colunas são copiadas; os textos são imutáveis e compartilhados)."""
+        clone = WordStore()
+        clone.texts = self.texts
+        clone.correct, clone.incorrect, clone.flags = array('I', self.correct), array('I', self.incorrect), array('B', self.flags)
+        clone.box, clone.due = array('B', self.box), array('d', self.due)
+        return clone
+
+    def update(self, index, record):
+        """Aplica um registro do arquivo de progresso (chaves ausentes ficam como estão)."""
+        if "correct" in record:
+            self.correct[index] = record["correct"]
+        if "incorrect" in record:
+            self.incorrect[index] = record["incorrect"]
+        for key, flag in _FLAG_KEYS.items():
+            if key in record:
+                self.set_flag(index, flag, record[key])
+        if "due" in record:
+            self.box[index] = record.get("box", 0)
+            self.due[index] = record["due"]
+
+    def reset_stats(self):
+        size = len(self.texts)
+        self.correct = array('I', [0]) * size
+        self.incorrect = array('I', [0]) * size
+        self.flags = array('B', [0]) * size
+        self.box = array('B', [0]) * size
+        self.due = array('d', [_UNSCHEDULED]) * size
+
+
+class WordRecord:
+    """Visão somente leitura de uma palavra do WordStore, com a interface de leitura de um dict."""
+    __slots__ = ("store", "index")
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    def __getitem__(self, key):
+        store, index = self.store, self.index
+        if key == "text":
+            return store.texts[index]
+        if key == "key":
+            return store.key(index)
+        if key == "correct":
+            return store.correct[index]
+        if key == "incorrect":
+            return store.incorrect[index]
+        if key in _FLAG_KEYS:
+            return bool(store.flags[index] & _FLAG_KEYS[key])
+        if key in ("box", "due") and store.is_scheduled(index):
+            return store.box[index] if key == "box" else store.due[index]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def to_dict(self):
+        return self.store.to_dict(self.index)
+
+    def __repr__(self):
+        return f"WordRecord({self.to_dict()!r})"
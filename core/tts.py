@@ -0,0 +1,293 @@
+"""Serviço de TTS (Piper) baseado em asyncio, compartilhado pela GUI (main.py) e pelo modo texto (main-text.py).
+
+A fala passa por dois estágios ligados por uma fila limitada: a síntese (Piper) e a
+reprodução (aplay/paplay). Assim o clipe N+1 é sintetizado enquanto o clipe N toca.
+Os clipes sintetizados ficam em um cache LRU em memória, então frases repetidas
+(feedback, palavras já ouvidas) e clipes pedidos com prefetch() tocam sem esperar o Piper.
+"""
+import asyncio
+import collections
+import itertools
+import os
+import tempfile
+import time
+
+CAMINHO_EXECUTAVEL_PIPER_DEFAULT = "./piper/piper"
+CLIP_QUEUE_MAX_SIZE = 2 # Clipes prontos aguardando reprodução (limita o quanto a síntese se adianta)
+CLIP_CACHE_MAX_ITEMS = 64 # Clipes .wav mantidos em memória
+PLAYER_STOP_TIMEOUT_SECONDS = 2.0 # Espera pelo fim do player interrompido por close() antes de matá-lo
+
+# Players tentados em ordem; o .wav é enviado pelo stdin
+PLAYERS = [
+    {"name": "aplay", "path": "/usr/bin/aplay", "args": ["-q"]},
+    {"name": "paplay", "path": "/usr/bin/paplay", "args": []},
+]
+
+
+class SpeechRequest:
+    """Handle de um pedido de fala.
+
+    Guarda os instantes (time.monotonic) de entrada na fila, início da síntese e fim da
+    reprodução, e o resultado. Os callbacks registrados são chamados no thread do loop
+    asyncio quando o pedido termina; quem está no loop pode simplesmente usar `await request.wait()`.
+    """
+    _next_id = itertools.count(1)
+
+    def __init__(self, text, length_scale=1.0, model_path=None, on_finished=None):
+        self.id = next(SpeechRequest._next_id)
+        self.text = text
+        self.length_scale = length_scale
+        self.model_path = model_path
+        self.queued_at = time.monotonic()
+        self.started_at = None
+        self.finished_at = None
+        self.success = None
+        self.message = ""
+        self.cancelled = False
+        self._callbacks = [on_finished] if on_finished else []
+        self._future = None # Criado pelo TTSService.enqueue, no loop
+
+    def cancel(self):
+        """Marca o pedido como cancelado; os estágios o descartam se ainda não o tocaram.
+
+        Para interromper uma reprodução em andamento, use TTSService.cancel().
+        """
+        self.cancelled = True
+
+    def done(self):
+        return self.finished_at is not None
+
+    def add_done_callback(self, callback):
+        if self.done():
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+
+    async def wait(self):
+        await self._future
+        return self
+
+    def queue_latency(self):
+        """Tempo (s) entre o pedido e o início da síntese, ou None se ainda não começou."""
+        return None if self.started_at is None else self.started_at - self.queued_at
+
+    def total_latency(self):
+        """Tempo (s) entre o pedido e o fim da reprodução, ou None se ainda não terminou."""
+        return None if self.finished_at is None else self.finished_at - self.queued_at
+
+    def _finish(self, success, message=""):
+        if self.done():
+            return
+        self.success = success
+        self.message = message
+        self.finished_at = time.monotonic()
+        if self._future is not None and not self._future.done():
+            self._future.set_result(self)
+        for callback in self._callbacks:
+            callback(self)
+
+    def __repr__(self):
+        return f"SpeechRequest(id={self.id}, text={self.text!r}, success={self.success})"
+
+
+class TTSService:
+    """Pipeline de fala assíncrono: speak(), prefetch() e cancel().
+
+    Todos os métodos devem ser chamados no thread do loop asyncio. A GUI roda o loop em
+    um thread próprio (ver PiperTTSWorker em main.py); o modo texto usa asyncio.run().
+    """
+
+    def __init__(self, piper_exe=CAMINHO_EXECUTAVEL_PIPER_DEFAULT,
+                 clip_queue_size=CLIP_QUEUE_MAX_SIZE, cache_max_items=CLIP_CACHE_MAX_ITEMS):
+        self.piper_exe = piper_exe
+        self.clip_queue_size = clip_queue_size
+        self.cache_max_items = cache_max_items
+        self._cache = collections.OrderedDict() # (modelo, escala, texto) -> bytes do .wav
+        self._inflight = {} # (modelo, escala, texto) -> Task da síntese em andamento
+        self._requests = None
+        self._clips = None
+        self._tasks = []
+        self._current_request = None
+        self._current_player = None
+        self._synthesizing = None # Pedido que o estágio de síntese tirou da fila e ainda não passou adiante
+        self._playing = None # Pedido que o estágio de reprodução tirou da fila e ainda não terminou
+
+    def _ensure_queues(self):
+        if self._requests is None:
+            self._requests = asyncio.Queue()
+            self._clips = asyncio.Queue(maxsize=self.clip_queue_size)
+
+    async def start(self):
+        """Cria as filas e os estágios no loop atual (idempotente)."""
+        if self._tasks:
+            return
+        self._ensure_queues()
+        self._tasks = [
+            asyncio.create_task(self._synthesis_stage()),
+            asyncio.create_task(self._playback_stage()),
+        ]
+
+    async def close(self):
+        """Para os estágios e o player; pedidos pendentes ou em andamento terminam como cancelados."""
+        player = self._current_player
+        if player is not None and player.returncode is None:
+            player.terminate()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if player is not None:
+            try:
+                await asyncio.wait_for(player.wait(), PLAYER_STOP_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                player.kill()
+        in_progress = [request for request in (self._synthesizing, self._playing) if request is not None]
+        self._synthesizing = self._playing = None
+        for request in in_progress:
+            request._finish(False, "Cancelled.")
+        for pending in (self._requests, self._clips):
+            while pending is not None and not pending.empty():
+                item = pending.get_nowait()
+                request = item if isinstance(item, SpeechRequest) else item[0]
+                request._finish(False, "Cancelled.")
+
+    def enqueue(self, request):
+        """Coloca no pipeline um pedido já criado (ex: pela ponte da GUI)."""
+        self._ensure_queues() # Pode chegar antes de start() rodar no loop
+        request._future = asyncio.get_running_loop().create_future()
+        self._requests.put_nowait(request)
+        return request
+
+    def submit(self, text, length_scale=1.0, model_path=None, on_finished=None):
+        """Enfileira uma fala sem esperar o fim; devolve o SpeechRequest."""
+        return self.enqueue(SpeechRequest(text, length_scale, model_path, on_finished))
+
+    async def speak(self, text, length_scale=1.0, model_path=None):
+        """Fala text e espera o fim da reprodução; devolve o SpeechRequest concluído."""
+        await self.start()
+        return await self.submit(text, length_scale, model_path).wait()
+
+    async def prefetch(self, text, length_scale=1.0, model_path=None):
+        """Sintetiza text para o cache sem tocar. Retorna True se o clipe ficou disponível."""
+        wav, error = await self._get_clip(text, length_scale, model_path)
+        return error is None
+
+    async def cancel(self, request):
+        """Cancela um pedido, interrompendo o player se ele já estiver tocando."""
+        request.cancel()
+        player = self._current_player
+        if self._current_request is request and player is not None and player.returncode is None:
+            player.terminate()
+
+    # --- Estágios do pipeline ---
+    async def _synthesis_stage(self):
+        while True:
+            request = self._synthesizing = await self._requests.get()
+            if request.cancelled:
+                wav, error = None, "Cancelled."
+            else:
+                request.started_at = time.monotonic()
+                wav, error = await self._get_clip(request.text, request.length_scale, request.model_path)
+            # Bloqueia (sem bloquear o loop) se a fila de reprodução estiver cheia
+            await self._clips.put((request, wav, error))
+            self._synthesizing = None
+
+    async def _playback_stage(self):
+        while True:
+            request, wav, error = await self._clips.get()
+            self._playing = request
+            if error: # Erro da síntese, reportado na ordem da fila
+                success, message = False, error
+            elif request.cancelled:
+                success, message = False, "Cancelled."
+            else:
+                try:
+                    success, message = await self._play(wav, request)
+                except Exception as e:
+                    success, message = False, f"Unexpected error while playing: {e}"
+            request._finish(success, message)
+            self._playing = None
+
+    # --- Síntese e reprodução ---
+    async def _get_clip(self, text, length_scale, model_path):
+        """Retorna (wav_bytes, None) do cache ou do Piper, ou (None, mensagem_erro)."""
+        key = (model_path, float(length_scale), text)
+        wav = self._cache.get(key)
+        if wav is not None:
+            self._cache.move_to_end(key)
+            return wav, None
+
+        # Pedidos iguais (ex: prefetch seguido de speak) compartilham uma única execução do Piper
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._synthesize(text, length_scale, model_path))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        wav, error = await asyncio.shield(task)
+        if wav is not None:
+            self._cache[key] = wav
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_max_items:
+                self._cache.popitem(last=False)
+        return wav, error
+
+    async def _synthesize(self, text, length_scale, model_path):
+        if not model_path:
+            return None, "No voice model specified to speak."
+        if not os.path.exists(self.piper_exe):
+            return None, f"Piper executable not found at '{self.piper_exe}'."
+        if not os.path.exists(model_path):
+            return None, f"ONNX voice model not found at '{model_path}'."
+
+        fd, wav_file = tempfile.mkstemp(prefix="lw2m_", suffix=".wav")
+        os.close(fd)
+        comando_piper = [
+            self.piper_exe,
+            "--model", model_path,
+            "--output_file", wav_file,
+            "--length_scale", str(length_scale)
+        ]
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *comando_piper, stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+            stdout, stderr = await process.communicate(input=text.encode('utf-8'))
+            if process.returncode != 0:
+                return None, f"Piper Error: {stderr.decode('utf-8', errors='replace')}"
+            with open(wav_file, 'rb') as f:
+                wav = f.read()
+            if not wav:
+                return None, "Error: Piper did not generate the audio file."
+            return wav, None
+        except FileNotFoundError:
+            return None, f"Piper executable not found at '{self.piper_exe}'."
+        except Exception as e:
+            return None, f"Unexpected error while speaking: {e}"
+        finally:
+            try:
+                os.remove(wav_file)
+            except OSError:
+                pass # Ignore error when removing temporary file
+
+    async def _play(self, wav, request):
+        ultimo_erro_player = "No audio player found/worked."
+        for player_info in PLAYERS:
+            if not os.path.exists(player_info["path"]):
+                continue
+            process = await asyncio.create_subprocess_exec(
+                player_info["path"], *player_info["args"], stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+            self._current_request, self._current_player = request, process
+            try:
+                stdout, stderr = await process.communicate(input=wav)
+            except (BrokenPipeError, ConnectionResetError):
+                stdout, stderr = b"", b"" # Player interrompido por cancel()
+            finally:
+                self._current_request, self._current_player = None, None
+            if request.cancelled:
+                return False, "Cancelled."
+            if process.returncode == 0:
+                return True, ""
+            saida = (stderr or stdout).decode('utf-8', errors='replace').strip()
+            ultimo_erro_player = f"Error with {player_info['name']}: {saida}"
+        return False, ultimo_erro_player
@@ -0,0 +1,125 @@
+"""Registro das vozes do Piper instaladas (piper_voices/)."""
+import json
+import os
+
+DIRETORIO_VOZES_PIPER_DEFAULT = "./piper_voices"
+
+
+class VoiceRegistry:
+    """Descobre as vozes do Piper instaladas em um diretório (ex: piper_voices/).
+
+    A varredura só acontece no primeiro acesso. Os metadados de cada .onnx.json
+    ficam em um índice (.voices.index.json) chaveado por mtime e tamanho do arquivo,
+    então nas próximas inicializações basta listar o diretório, sem parsear os JSONs.
+    """
+    INDEX_FILE_NAME = ".voices.index.json"
+    INDEX_VERSION = 1
+
+    def __init__(self, voices_dir=DIRETORIO_VOZES_PIPER_DEFAULT):
+        self.voices_dir = voices_dir
+        self.index_path = os.path.join(voices_dir, self.INDEX_FILE_NAME)
+        self._voices = None # nome de exibição -> metadados (carregado sob demanda)
+
+    def voices(self):
+        """Retorna {nome de exibição: metadados} das vozes válidas (com .onnx e .onnx.json)."""
+        if self._voices is None:
+            self._voices = self._scan()
+        return self._voices
+
+    def refresh(self):
+        """Força uma nova varredura do diretório (ex: após instalar uma voz)."""
+        self._voices = None
+        return self.voices()
+
+    def get(self, name):
+        return self.voices().get(name)
+
+    def find_by_model_path(self, model_path):
+        """Retorna o nome de exibição da voz cujo modelo é model_path, ou None."""
+        wanted = os.path.normpath(model_path)
+        for name, info in self.voices().items():
+            if os.path.normpath(info["model_path"]) == wanted:
+                return name
+        return None
+
+    def _scan(self):
+        if not os.path.isdir(self.voices_dir):
+            print(f"Warning: Voice directory '{self.voices_dir}' not found.")
+            return {}
+
+        # Uma única listagem do diretório; scandir já traz o stat das entradas
+        configs = {}
+        models = set()
+        with os.scandir(self.voices_dir) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                if entry.name.endswith(".onnx.json"):
+                    st = entry.stat()
+                    configs[entry.name] = (st.st_mtime_ns, st.st_size)
+                elif entry.name.endswith(".onnx"):
+                    models.add(entry.name)
+
+        cached = self._load_index()
+        new_index = {}
+        voices = {}
+        for config_name in sorted(configs):
+            model_name = config_name[:-len(".json")]
+            if model_name not in models:
+                print(f"Warning: Voice config '{config_name}' has no matching '{model_name}'. Skipping.")
+                continue
+
+            mtime_ns, size = configs[config_name]
+            entry = cached.get(config_name)
+            if not entry or entry.get("mtime_ns") != mtime_ns or entry.get("size") != size:
+                metadata = self._read_metadata(os.path.join(self.voices_dir, config_name))
+                if metadata is None:
+                    continue
+                entry = {"mtime_ns": mtime_ns, "size": size, "metadata": metadata}
+            new_index[config_name] = entry
+
+            metadata = dict(entry["metadata"])
+            metadata["model_path"] = os.path.join(self.voices_dir, model_name)
+            display_name = f"{metadata['dataset']} ({metadata['language']})"
+            if display_name in voices: # Mesma voz em qualidades diferentes
+                display_name = f"{metadata['dataset']} ({metadata['language']}, {metadata['quality']})"
+            voices[display_name] = metadata
+
+        if new_index != cached:
+            self._save_index(new_index)
+        return voices
+
+    def _read_metadata(self, config_path):
+        try:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read voice config '{config_path}': {e}")
+            return None
+        audio = config.get("audio", {})
+        language = config.get("language", {})
+        stem = os.path.basename(config_path)[:-len(".onnx.json")]
+        return {
+            "dataset": config.get("dataset") or stem,
+            "language": language.get("code") or config.get("espeak", {}).get("voice", "unknown"),
+            "sample_rate": audio.get("sample_rate"),
+            "quality": audio.get("quality", "unknown"),
+            "num_speakers": config.get("num_speakers", 1),
+        }
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if index.get("version") != self.INDEX_VERSION:
+            return {}
+        return index.get("voices", {})
+
+    def _save_index(self, voices_index):
+        try:
+            with open(self.index_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": self.INDEX_VERSION, "voices": voices_index}, f, indent=4)
+        except OSError as e:
+            print(f"Warning: Could not write voice index '{self.index_path}': {e}") # Diretório somente leitura, etc.
@@ -0,0 +1,216 @@
+"""Leitura de arquivos de palavras grandes: o arquivo mapeado em memória é lido em blocos.
+
+read_word_file percorre o arquivo em blocos de WORD_FILE_CHUNK_SIZE bytes (cortados em
+quebras de linha), descarta linhas vazias e repetidas (sem diferenciar maiúsculas de
+minúsculas; vale a primeira ocorrência) e devolve um WordTexts: todos os textos numa única
+string mais os offsets de cada palavra. A string de cada palavra só é criada quando ela é
+acessada.
+
+load_word_list faz o mesmo, mas guarda o resultado compilado (textos e chaves de comparação
+já normalizados) em WORD_LIST_CACHE_DIR_DEFAULT, com o SHA-1 do conteúdo do arquivo como
+nome; abrir de novo uma lista que não mudou só lê esse arquivo, sem processar as linhas.
+"""
+import hashlib
+import itertools
+import mmap
+import os
+import struct
+import zlib
+from array import array
+
+WORD_FILE_CHUNK_SIZE = 1 << 20 # Bytes por bloco; progress_callback é chamado a cada bloco
+WORD_LIST_CACHE_DIR_DEFAULT = os.path.join("wordlists", ".cache")
+WORD_LIST_CACHE_MAX_FILES = 16 # Listas compiladas mantidas no cache (as usadas há mais tempo saem primeiro)
+COMPILED_SUFFIX = ".wordlist"
+COMPILED_MAGIC = b"LWWL"
+COMPILED_VERSION = 1
+COMPILED_SHARED_KEYS = 1 # Flag: as chaves são os próprios textos (nada a gravar para elas)
+# magic, versão, flags, linhas repetidas, nº de palavras, bytes dos textos, bytes das chaves, CRC-32 do corpo
+COMPILED_HEADER = struct.Struct("<4sHHQQQQI")
+
+
+class WordTexts:
+    """Sequência somente leitura das palavras de uma lista, extraídas sob demanda de uma única string.
+
+    data guarda cada palavra seguida de "\n"; offsets[i] é onde a palavra i começa. keys e
+    key_offsets são o mesmo para as chaves de comparação (casefold) e, quando elas são
+    iguais aos textos, são os próprios data e offsets.
+    """
+    __slots__ = ("data", "offsets", "keys", "key_offsets", "duplicates")
+
+    def __init__(self, data="", offsets=None, duplicates=0, keys=None, key_offsets=None):
+        self.data = data
+        self.offsets = offsets if offsets is not None else array('Q', [0]) # len(offsets) == palavras + 1
+        self.keys = keys if keys is not None else self.data
+        self.key_offsets = key_offsets if key_offsets is not None else self.offsets
+        self.duplicates = duplicates # Linhas ignoradas por repetirem uma palavra anterior
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("word index out of range")
+        return self.data[self.offsets[index]:self.offsets[index + 1] - 1]
+
+    def __iter__(self):
+        return iter(self.data.split("\n")[:-1])
+
+    def key(self, index):
+        """Chave de comparação (casefold) da palavra index."""
+        return self.keys[self.key_offsets[index]:self.key_offsets[index + 1] - 1]
+
+    def iter_keys(self):
+        return iter(self.keys.split("\n")[:-1])
+
+    @classmethod
+    def from_words(cls, words, keys, duplicates=0):
+        """WordTexts com as listas paralelas words e keys (chaves iguais às palavras não são duplicadas)."""
+        data, offsets = _join_words(words)
+        if keys == words: # Lista já em minúsculas: as chaves são os próprios textos
+            return cls(data, offsets, duplicates)
+        return cls(data, offsets, duplicates, *_join_words(keys))
+
+
+def read_word_file(path, progress_callback=None, chunk_size=WORD_FILE_CHUNK_SIZE):
+    """Palavras de path (uma por linha, UTF-8), como WordTexts.
+
+    progress_callback(bytes_lidos, total_de_bytes), se dado, é chamado a cada bloco e ao
+    final. Levanta OSError/UnicodeDecodeError como open().
+    """
+    with open(path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return _scan_words(b"", progress_callback, chunk_size)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return _scan_words(mapped, progress_callback, chunk_size)
+
+
+def load_word_list(path, progress_callback=None, cache_dir=WORD_LIST_CACHE_DIR_DEFAULT, chunk_size=WORD_FILE_CHUNK_SIZE):
+    """Como read_word_file, mas usa (e mantém) a versão compilada da lista em cache_dir.
+
+    Falhas ao ler ou gravar o cache só geram um aviso; a lista é então lida do arquivo.
+    """
+    with open(path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return _scan_words(b"", progress_callback, chunk_size)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            compiled_file = os.path.join(cache_dir, hashlib.sha1(mapped).hexdigest() + COMPILED_SUFFIX)
+            if os.path.exists(compiled_file):
+                try:
+                    texts = read_compiled_word_list(compiled_file)
+                    os.utime(compiled_file) # Usada agora: fica por último na fila de remoção
+                    if progress_callback:
+                        progress_callback(len(mapped), len(mapped))
+                    return texts
+                except (OSError, ValueError) as e:
+                    print(f"Warning: Ignoring compiled word list '{compiled_file}': {e}")
+            texts = _scan_words(mapped, progress_callback, chunk_size)
+    try:
+        write_compiled_word_list(compiled_file, texts)
+        _trim_cache(cache_dir)
+    except OSError as e:
+        print(f"Warning: Could not cache compiled word list '{compiled_file}': {e}")
+    return texts
+
+
+def _scan_words(buffer, progress_callback, chunk_size):
+    words = []
+    keys = []
+    seen = set() # Chaves (casefold) já incluídas
+    duplicates = 0
+    size = len(buffer)
+    start = 3 if buffer[:3] == b"\xef\xbb\xbf" else 0 # BOM do UTF-8
+    while start < size:
+        end = min(start + chunk_size, size)
+        if end < size:
+            newline = buffer.rfind(b"\n", start, end)
+            end = newline + 1 if newline >= 0 else (buffer.find(b"\n", end) + 1 or size)
+        for line in buffer[start:end].decode('utf-8').split("\n"):
+            word = line.strip()
+            if not word:
+                continue
+            key = word.casefold()
+            if key in seen:
+                duplicates += 1
+            else:
+                seen.add(key)
+                words.append(word)
+                keys.append(key)
+        start = end
+        if progress_callback:
+            progress_callback(start, size)
+    if progress_callback:
+        progress_callback(size, size)
+    return WordTexts.from_words(words, keys, duplicates)
+
+
+def _join_words(words):
+    offsets = array('Q', itertools.accumulate((len(word) + 1 for word in words), initial=0))
+    return "".join(word + "\n" for word in words), offsets
+
+
+def write_compiled_word_list(path, texts):
+    """Grava texts (WordTexts) de forma atômica (arquivo temporário + fsync + rename): cabeçalho, textos e chaves em UTF-8, offsets e CRC-32."""
+    shared_keys = texts.keys is texts.data
+    parts = [texts.data.encode('utf-8')]
+    if not shared_keys:
+        parts.append(texts.keys.encode('utf-8'))
+    parts.append(texts.offsets.tobytes())
+    if not shared_keys:
+        parts.append(texts.key_offsets.tobytes())
+    checksum = 0
+    for part in parts:
+        checksum = zlib.crc32(part, checksum)
+    header = COMPILED_HEADER.pack(COMPILED_MAGIC, COMPILED_VERSION, COMPILED_SHARED_KEYS if shared_keys else 0,
+                                  texts.duplicates, len(texts), len(parts[0]), 0 if shared_keys else len(parts[1]), checksum)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        for part in parts:
+            f.write(part)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_compiled_word_list(path):
+    """Lê uma lista gravada por write_compiled_word_list; levanta ValueError se ela estiver corrompida."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if len(raw) < COMPILED_HEADER.size:
+        raise ValueError("file too short")
+    magic, version, flags, duplicates, count, data_size, keys_size, checksum = COMPILED_HEADER.unpack_from(raw)
+    if magic != COMPILED_MAGIC or version != COMPILED_VERSION:
+        raise ValueError(f"not a version {COMPILED_VERSION} compiled word list")
+    body = memoryview(raw)[COMPILED_HEADER.size:]
+    offsets_size = (count + 1) * array('Q').itemsize
+    shared_keys = bool(flags & COMPILED_SHARED_KEYS)
+    if len(body) != data_size + keys_size + offsets_size * (1 if shared_keys else 2) or zlib.crc32(body) != checksum:
+        raise ValueError("checksum mismatch")
+    position = 0
+
+    def take(size):
+        nonlocal position
+        chunk = body[position:position + size]
+        position += size
+        return chunk
+
+    data = str(take(data_size), 'utf-8')
+    keys = None if shared_keys else str(take(keys_size), 'utf-8')
+    offsets = array('Q')
+    offsets.frombytes(take(offsets_size))
+    key_offsets = None
+    if not shared_keys:
+        key_offsets = array('Q')
+        key_offsets.frombytes(take(offsets_size))
+    return WordTexts(data, offsets, duplicates, keys, key_offsets)
+
+
+def _trim_cache(cache_dir, max_files=WORD_LIST_CACHE_MAX_FILES):
+    compiled = [entry for entry in os.scandir(cache_dir) if entry.name.endswith(COMPILED_SUFFIX)]
+    compiled.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in compiled[max_files:]:
+        os.remove(entry.path)
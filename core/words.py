@@ -0,0 +1,465 @@
+"""Gerenciamento da lista de palavras e do progresso de cada palavra."""
+import heapq
+import random
+import time
+from array import array
+
+from .session import bitset_contains, bitset_indexes
+from .store import COLUMNS, WordStore, FLAG_MASTERED, FLAG_PRESENTED
+from .wordfile import load_word_list
+
+MASTERY_THRESHOLD_DEFAULT = 2 # Número de acertos para considerar uma palavra masterizada
+SELECTION_MODE_UNIFORM = "uniform" # Todas as palavras ativas com a mesma chance
+SELECTION_MODE_WEIGHTED = "weighted" # Palavras mais erradas voltam com mais frequência
+SELECTION_MODE_SPACED = "spaced" # Repetição espaçada (caixas de Leitner): a palavra mais atrasada primeiro
+SELECTION_MODES = (SELECTION_MODE_UNIFORM, SELECTION_MODE_WEIGHTED, SELECTION_MODE_SPACED)
+# Intervalo até a próxima revisão (segundos) para cada caixa de Leitner; errar volta para a caixa 0
+LEITNER_INTERVALS_SECONDS = [60, 10 * 60, 60 * 60, 24 * 3600, 3 * 24 * 3600, 7 * 24 * 3600, 30 * 24 * 3600]
+WEIGHT_PER_MISS = 2 # Peso extra por erro (dividido por 1 + acertos)
+WEIGHT_MAX = 20 # Limite do peso de uma palavra, para uma palavra muito errada não monopolizar o sorteio
+
+
+def word_weight(correct, incorrect, mastered):
+    """Peso de sorteio de uma palavra no modo ponderado (0 se já masterizada)."""
+    if mastered:
+        return 0
+    return min(WEIGHT_MAX, 1 + WEIGHT_PER_MISS * incorrect // (1 + correct))
+
+
+class IndexSet:
+    """Conjunto de índices inteiros em [0, size) com add, discard e sorteio em O(1).
+
+    Vetor denso dos membros + posição de cada índice nele (-1 = fora); remover move o
+    último membro para o lugar do removido. Os dois vetores são arrays tipados, sem um
+    objeto int por palavra.
+    """
+    def __init__(self, size, members=()):
+        self._members = array('l', members)
+        self._pos = array('l', [-1]) * size
+        for pos, index in enumerate(self._members):
+            self._pos[index] = pos
+
+    def __len__(self):
+        return len(self._members)
+
+    def grow(self, size):
+        """Passa a aceitar índices até size - 1 (os novos ficam fora do conjunto)."""
+        self._pos.extend(array('l', [-1]) * (size - len(self._pos)))
+
+    def __contains__(self, index):
+        return self._pos[index] >= 0
+
+    def add(self, index):
+        if self._pos[index] < 0:
+            self._pos[index] = len(self._members)
+            self._members.append(index)
+
+    def discard(self, index):
+        pos = self._pos[index]
+        if pos < 0:
+            return
+        last_index = self._members.pop()
+        if last_index != index:
+            self._members[pos] = last_index
+            self._pos[last_index] = pos
+        self._pos[index] = -1
+
+    def choice(self):
+        return random.choice(self._members)
+
+
+class FenwickTree:
+    """Árvore de Fenwick (binary indexed tree) de pesos inteiros.
+
+    add e find_prefix são O(log n); serve para sortear um índice com probabilidade
+    proporcional ao seu peso.
+    """
+    def __init__(self, weights):
+        self._size = len(weights)
+        self._tree = array('q', [0]) # 1-based
+        self._tree.extend(iter(weights)) # iter(): aceita também arrays de outro tipo
+        for i in range(1, self._size + 1): # Construção em O(n)
+            parent = i + (i & -i)
+            if parent <= self._size:
+                self._tree[parent] += self._tree[i]
+        self.total = sum(weights)
+
+    def extend(self, count):
+        """Acrescenta count índices de peso 0 no fim, em O(count log n)."""
+        old_size = self._size
+        for i in range(old_size + 1, old_size + count + 1):
+            low = i - (i & -i) # O nó i soma os pesos de (low, i]; os de old_size em diante são 0
+            self._tree.append(self.total - self._prefix_sum(low) if low < old_size else 0)
+        self._size += count
+
+    def _prefix_sum(self, count):
+        """Soma dos pesos dos count primeiros índices."""
+        total = 0
+        while count:
+            total += self._tree[count]
+            count -= count & -count
+        return total
+
+    def add(self, index, delta):
+        self.total += delta
+        i = index + 1
+        while i <= self._size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def find_prefix(self, target):
+        """Menor índice cuja soma acumulada (inclusive) é maior que target (0 <= target < total)."""
+        pos = 0
+        step = 1 << self._size.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= self._size and self._tree[nxt] <= target:
+                pos = nxt
+                target -= self._tree[nxt]
+            step >>= 1
+        return pos # Índice 0-based = posição 1-based do próximo elemento - 1
+
+
+class WordManager:
+    """Lista de palavras (words_data) e o progresso de cada uma.
+
+    Os totais usados pelas estatísticas, o conjunto de palavras ativas (não masterizadas),
+    os pesos do modo ponderado e a fila de revisões do modo espaçado são mantidos
+    incrementalmente por get_next_word e record_attempt, e recalculados numa única passada
+    quando words_data é (re)carregado ou zerado. Assim, sortear a próxima palavra, saber se
+    ainda há palavras ativas e montar as estatísticas não percorrem a lista.
+
+    No modo espaçado cada palavra já respondida guarda "box" (caixa de Leitner) e "due"
+    (próxima revisão, epoch em segundos), que vão para o arquivo de progresso junto com o resto.
+
+    words_data é um WordStore (core/store.py): colunas em arrays tipados em vez de um dict por
+    palavra. Iterar ou indexar devolve WordRecord, que se lê como o dict antigo.
+
+    subset (bitset de core.session, ou None = todas) restringe o sorteio a parte das palavras,
+    ex: às listas escolhidas numa sessão com várias listas; as estatísticas continuam valendo
+    para todas.
+    """
+    def __init__(self):
+        self.words_data = WordStore()
+        self.current_word_obj = None
+        self.current_word_index = None # Posição de current_word_obj em words_data
+        self.mastery_threshold = MASTERY_THRESHOLD_DEFAULT
+        self.selection_mode = SELECTION_MODE_UNIFORM
+        self.on_attempt_recorded = None # Callback opcional (índice da palavra, acertou), chamado ao fim de record_attempt
+        self.subset = None
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self):
+        self._set_indexes(self._build_indexes(self.words_data, self.subset))
+
+    @staticmethod
+    def _build_indexes(store, subset=None):
+        """Índices de store, como {nome do atributo: valor}; não toca no WordManager (ver prepare_words)."""
+        size = len(store)
+        flags, due = store.flags, store.due
+        # Só as palavras de subset entram no sorteio (índices, pesos e fila de revisões)
+        selected = range(size) if subset is None else bitset_indexes(subset, size)
+        # Modo espaçado: palavras nunca respondidas ficam em _unscheduled; as demais, num heap (due, índice).
+        # Entradas velhas do heap (due diferente do atual da palavra) são descartadas ao chegar no topo.
+        review_heap = [(due[i], i) for i in selected if due[i] == due[i]]
+        heapq.heapify(review_heap)
+        # Pesos do modo ponderado (ver word_weight), mantidos mesmo no modo uniforme para permitir a troca a qualquer momento
+        # (sem erros e não masterizada = peso 1, o caso comum, sem chamar word_weight)
+        weights = array('B', (word_weight(c, inc, f & FLAG_MASTERED) if inc or f & FLAG_MASTERED else 1
+                              for c, inc, f in zip(store.correct, store.incorrect, flags)))
+        if subset is not None:
+            selected_weights = array('B', [0]) * size
+            for i in selected:
+                selected_weights[i] = weights[i]
+            weights = selected_weights # Peso 0 fora de subset
+        return {
+            "_active": IndexSet(size, (i for i in selected if not flags[i] & FLAG_MASTERED)),
+            "_unscheduled": IndexSet(size, (i for i in selected if due[i] != due[i])), # NaN = não agendada
+            "_review_heap": review_heap,
+            "_selected_count": len(selected),
+            "_weights": weights,
+            "_weight_tree": FenwickTree(weights),
+            "_presented_count": sum(1 for f in store.flags if f & FLAG_PRESENTED),
+            "_total_correct_attempts": sum(store.correct),
+            "_total_incorrect_attempts": sum(store.incorrect),
+            "_mastered_words": [i for i, f in enumerate(store.flags) if f & FLAG_MASTERED], # Na ordem em que foram masterizadas
+        }
+
+    def _set_indexes(self, indexes):
+        for name, value in indexes.items():
+            setattr(self, name, value)
+
+    def _rebuild_review_heap(self):
+        subset = self.subset
+        self._review_heap = [(due, i) for i, due in enumerate(self.words_data.due)
+                             if due == due and (subset is None or bitset_contains(subset, i))]
+        heapq.heapify(self._review_heap)
+
+    def _is_selected(self, index):
+        return self.subset is None or bitset_contains(self.subset, index)
+
+    def set_subset(self, subset):
+        """Passa a sortear só as palavras do bitset subset (None = todas); o progresso não muda."""
+        self.subset = subset
+        self._rebuild_indexes()
+
+    def update_words(self, texts, subset, changed_indexes):
+        """Passa a usar texts (as palavras atuais seguidas das novas, ver core.session) e subset.
+
+        Só as palavras de changed_indexes (as que entraram ou saíram do sorteio, incluindo as
+        novas) são atualizadas nos índices; o progresso das demais não muda.
+        """
+        store = self.words_data
+        old_size, old_subset = len(store), self.subset
+        added = len(texts) - old_size
+        store.extend(texts)
+        if added:
+            self._active.grow(len(texts))
+            self._unscheduled.grow(len(texts))
+            self._weights.extend(array('B', [0]) * added)
+            self._weight_tree.extend(added)
+        self.subset = subset
+        for index in changed_indexes:
+            was_selected = index < old_size and (old_subset is None or bitset_contains(old_subset, index))
+            selected = self._is_selected(index)
+            if selected == was_selected:
+                continue
+            if selected:
+                self._selected_count += 1
+                if not store.is_mastered(index):
+                    self._active.add(index)
+                if store.is_scheduled(index):
+                    heapq.heappush(self._review_heap, (store.due[index], index))
+                else:
+                    self._unscheduled.add(index)
+            else: # Entradas dela no heap são descartadas por _peek_review
+                self._selected_count -= 1
+                self._active.discard(index)
+                self._unscheduled.discard(index)
+            self._update_weight(index)
+
+    def load_words_from_file(self, filepath, progress_callback=None):
+        """Carrega a lista de filepath (ver core.wordfile.load_word_list); progresso zerado."""
+        try:
+            texts = load_word_list(filepath, progress_callback)
+        except FileNotFoundError:
+            self.set_words(())
+            return False, "File not found."
+        except Exception as e:
+            self.set_words(())
+            return False, f"Error loading words: {e}"
+        return True, self.set_words(texts)
+
+    def set_words(self, texts):
+        """Troca a lista de palavras (progresso zerado) e retorna a mensagem de resumo."""
+        return self.use_prepared_words(self.prepare_words(texts))
+
+    @classmethod
+    def prepare_words(cls, texts):
+        """WordStore e índices de uma lista nova, montados sem tocar em nenhum WordManager.
+
+        Pode rodar em outro thread; o resultado é entregue a use_prepared_words, que só troca referências.
+        """
+        store = WordStore(texts)
+        return store, cls._build_indexes(store), getattr(texts, "duplicates", 0)
+
+    @classmethod
+    def prepare_extended_words(cls, store, texts):
+        """Como prepare_words, para uma lista texts que começa pelas palavras de store (ver core.session).
+
+        store (uma cópia, ver WordStore.copy) dá o progresso dessas primeiras palavras; o resultado
+        vai para use_extended_words.
+        """
+        extended = WordStore(texts)
+        size = len(store)
+        for column in COLUMNS:
+            getattr(extended, column)[:size] = getattr(store, column)
+        return extended, cls._build_indexes(extended), 0
+
+    def use_prepared_words(self, prepared):
+        """Passa a usar uma lista montada por prepare_words e retorna a mensagem de resumo."""
+        store, indexes, duplicates = prepared
+        self.words_data = store
+        self.subset = None
+        self._set_indexes(indexes)
+        message = f"{len(store)} words loaded."
+        if duplicates:
+            message += f" {duplicates} duplicate(s) skipped."
+        return message
+
+    def load_progress_data(self, progress_data_list):
+        """Carrega o progresso (acertos, erros, etc.) para as palavras existentes."""
+        if not self.words_data:
+            return False, "No base words loaded to apply progress to."
+        
+        progress_map = {item['text']: item for item in progress_data_list}
+        for index, text in enumerate(self.words_data.texts):
+            progress_item = progress_map.get(text)
+            if progress_item:
+                self.words_data.update(index, progress_item) # Atualiza com os dados do progresso
+        self._rebuild_indexes()
+        return True, "Progress loaded."
+
+    def use_extended_words(self, prepared):
+        """Passa a usar uma lista montada por prepare_extended_words (todas as palavras selecionadas).
+
+        Respostas registradas enquanto ela era montada são copiadas para ela; só nesse caso os
+        índices são recalculados aqui.
+        """
+        store = prepared[0]
+        words_data = self.words_data
+        size = len(words_data)
+        # tobytes: compara NaN (revisão não agendada) como igual
+        if any(getattr(store, column)[:size].tobytes() != getattr(words_data, column).tobytes() for column in COLUMNS):
+            for column in COLUMNS:
+                getattr(store, column)[:size] = getattr(words_data, column)
+            self.words_data = store
+            self.subset = None
+            self._rebuild_indexes()
+            return
+        self.use_prepared_words(prepared)
+
+    def merge_progress_data(self, progress_data_list):
+        """Aplica o progresso de outra lista às palavras com a mesma forma de comparação (casefold).
+
+        Para uma palavra que já tem progresso, vale o registro com mais tentativas.
+        """
+        progress_map = {item["text"].casefold(): item for item in progress_data_list}
+        store = self.words_data
+        for index, key in enumerate(store.iter_keys()):
+            item = progress_map.get(key)
+            if item and item.get("correct", 0) + item.get("incorrect", 0) >= store.correct[index] + store.incorrect[index]:
+                store.update(index, item)
+        self._rebuild_indexes()
+        return True, "Progress merged."
+
+    def load_progress_store(self, store):
+        """Adota as colunas de progresso de um WordStore com as mesmas palavras, na mesma ordem (ver core.snapshot)."""
+        if len(store) != len(self.words_data):
+            return False, "Saved progress does not match the loaded word list."
+        words_data = self.words_data
+        words_data.correct, words_data.incorrect, words_data.flags = store.correct, store.incorrect, store.flags
+        words_data.box, words_data.due = store.box, store.due
+        self._rebuild_indexes()
+        return True, "Progress loaded."
+
+    def get_progress_data_to_save(self):
+        """Retorna as palavras com progresso formatadas para salvar (lista de dicts, como no arquivo)."""
+        return self.words_data.to_progress_data()
+
+    def reset_all_word_stats(self):
+        """Resets the statistics for all loaded words."""
+        self.words_data.reset_stats()
+        self._rebuild_indexes()
+        print("All word statistics have been reset.")
+
+    def _schedule(self, index, correct_attempt):
+        """Avança (acerto) ou volta para a caixa 0 (erro) e agenda a próxima revisão."""
+        store = self.words_data
+        box = min(store.box[index] + 1, len(LEITNER_INTERVALS_SECONDS) - 1) if correct_attempt else 0 # Sem agenda, box é 0
+        store.box[index] = box
+        store.due[index] = time.time() + LEITNER_INTERVALS_SECONDS[box]
+        self._unscheduled.discard(index)
+        if self._is_selected(index): # A palavra atual pode ter saído da seleção (ver set_subset)
+            heapq.heappush(self._review_heap, (store.due[index], index))
+        scheduled_count = self._selected_count - len(self._unscheduled)
+        if len(self._review_heap) > 2 * scheduled_count + 64: # Muitas entradas velhas: reconstrói (custo amortizado O(1))
+            self._rebuild_review_heap()
+
+    def _peek_review(self):
+        """(due, índice) da revisão mais atrasada, descartando entradas velhas; None se não houver."""
+        heap = self._review_heap
+        due = self.words_data.due
+        while heap and (heap[0][0] != due[heap[0][1]] or not self._is_selected(heap[0][1])):
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def _next_spaced_index(self):
+        review = self._peek_review()
+        if review and review[0] <= time.time():
+            return review[1] # Revisão vencida tem prioridade
+        if self._unscheduled:
+            return self._unscheduled.choice() # Senão, uma palavra nova
+        return review[1] if review else None # Senão, a próxima revisão, mesmo que ainda não vencida
+
+    def _update_weight(self, index):
+        store = self.words_data
+        new_weight = word_weight(store.correct[index], store.incorrect[index], store.is_mastered(index)) if self._is_selected(index) else 0
+        delta = new_weight - self._weights[index]
+        if delta:
+            self._weights[index] = new_weight
+            self._weight_tree.add(index, delta)
+
+    def set_selection_mode(self, mode):
+        if mode not in SELECTION_MODES:
+            raise ValueError(f"Unknown selection mode: {mode}")
+        self.selection_mode = mode
+
+    def has_active_words(self):
+        """True se get_next_word tem palavra para devolver (no modo espaçado, masterizadas também voltam)."""
+        if self.selection_mode == SELECTION_MODE_SPACED:
+            return bool(self._selected_count)
+        return bool(self._active)
+
+    def get_next_word(self):
+        if self.selection_mode == SELECTION_MODE_SPACED:
+            self.current_word_index = self._next_spaced_index()
+        elif not self._active:
+            self.current_word_index = None
+        elif self.selection_mode == SELECTION_MODE_WEIGHTED:
+            self.current_word_index = self._weight_tree.find_prefix(random.randrange(self._weight_tree.total))
+        else:
+            self.current_word_index = self._active.choice()
+        if self.current_word_index is None:
+            self.current_word_obj = None
+            return None
+        self.current_word_obj = self.words_data[self.current_word_index]
+        if not self.words_data.is_presented(self.current_word_index):
+            self.words_data.set_flag(self.current_word_index, FLAG_PRESENTED, True)
+            self._presented_count += 1
+        return self.current_word_obj
+
+    def record_attempt(self, correct_attempt):
+        """Registra a resposta para a palavra atual; retorna True se ela acabou de ser masterizada."""
+        if not self.current_word_obj:
+            return False
+        store, index = self.words_data, self.current_word_index
+        newly_mastered = False
+        if correct_attempt:
+            store.correct[index] += 1
+            self._total_correct_attempts += 1
+            if store.correct[index] >= self.mastery_threshold and not store.is_mastered(index):
+                store.set_flag(index, FLAG_MASTERED, True)
+                self._mastered_words.append(index)
+                newly_mastered = True
+                self._active.discard(index)
+        else:
+            store.incorrect[index] += 1
+            self._total_incorrect_attempts += 1
+        self._update_weight(index)
+        self._schedule(index, correct_attempt)
+        if self.on_attempt_recorded:
+            self.on_attempt_recorded(index, correct_attempt)
+        return newly_mastered
+
+    def get_stats_summary(self):
+        if not self.words_data: return "No words loaded."
+        return (f"Words: {len(self.words_data)} | Presented: {self._presented_count} | Mastered: {len(self._mastered_words)}\n"
+                f"Correct (attempts): {self._total_correct_attempts} | Incorrect (words missed after hints): {self._total_incorrect_attempts}")
+
+    def get_full_stats(self):
+        stats_lines = []
+        for p_info in self.words_data:
+            status = ""
+            if p_info["mastered"]:
+                status = f"Mastered (Correct: {p_info['correct']}, Incorrect: {p_info['incorrect']})"
+            elif p_info["presented"]:
+                status = f"Attempted (Correct: {p_info['correct']}, Incorrect: {p_info['incorrect']})"
+            else:
+                status = "Not studied"
+            stats_lines.append(f"- {p_info['text']}: {status}")
+        return "\n".join(stats_lines) if stats_lines else "No statistics available."
+
+    def get_mastered_words_texts(self):
+        texts = self.words_data.texts
+        return [texts[index] for index in self._mastered_words]
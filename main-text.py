@@ -1,8 +1,14 @@
 import os
-import subprocess
-import random # Para aleatoriedade
+import asyncio
+import threading
 
 import sys # Para acessar argumentos da linha de comando
+
+# Palavras, dicas e TTS vêm do pacote core (sem Qt), o mesmo usado pela GUI
+from core.words import WordManager
+from core.hints import get_hint
+from core.tts import TTSService
+
 # --- Configurações do Piper ---
 # Ajuste estes caminhos conforme a sua instalação
 CAMINHO_EXECUTAVEL_PIPER = "./piper/piper"  # Ex: /home/seu_usuario/piper/piper ou ./piper/piper se estiver na mesma pasta
@@ -24,113 +30,67 @@ def verificar_piper():
         return False
     return True
 
-def falar_palavra_piper(palavra, length_scale=1.0):
+# Serviço de TTS compartilhado com a GUI (síntese e reprodução em pipeline, cache de clipes)
+servico_tts = TTSService(CAMINHO_EXECUTAVEL_PIPER)
+_tarefas_prefetch = set() # Mantém referência às tarefas de prefetch em andamento
+
+async def falar_palavra_piper(palavra, length_scale=1.0):
     """Usa o Piper para falar a palavra em inglês."""
     if not verificar_piper():
         return False
 
-    # O Piper gera um arquivo .wav. Vamos chamá-lo de 'output.wav' e depois tocá-lo.
-    arquivo_saida_wav = "output.wav"
+    pedido = await servico_tts.speak(palavra, length_scale, CAMINHO_MODELO_VOZ_ONNX)
+    if pedido.success:
+        return True
 
-    comando_piper = [
-        CAMINHO_EXECUTAVEL_PIPER,
-        "--model", CAMINHO_MODELO_VOZ_ONNX,
-        "--output_file", arquivo_saida_wav,
-        "--length_scale", str(length_scale) # Adiciona o argumento de velocidade
-    ]
-    # Piper lê o texto da entrada padrão (stdin)
-
-    try:
-        # Usamos Popen para poder enviar o texto para stdin
-        process = subprocess.Popen(comando_piper, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        # Codifica a palavra para bytes e envia para o stdin do Piper
-        stdout, stderr = process.communicate(input=palavra.encode('utf-8'))
-
-        if process.returncode != 0:
-            print(f"Erro ao executar o Piper: {stderr.decode('utf-8', errors='replace')}")
-            return False
-
-        # Verificar se o arquivo WAV foi realmente criado pelo Piper
-        if not os.path.exists(arquivo_saida_wav):
-            print(f"Erro: Piper indicou sucesso, mas o arquivo de áudio '{arquivo_saida_wav}' não foi encontrado.")
-            if stdout:
-                print(f"Saída padrão do Piper: {stdout.decode('utf-8', errors='replace')}")
-            if stderr: # Mesmo que returncode seja 0, pode haver algo em stderr
-                print(f"Saída de erro do Piper: {stderr.decode('utf-8', errors='replace')}")
-            return False
-
-        # Tocar o arquivo WAV gerado
-        players = [
-            {"name": "aplay", "path": "/usr/bin/aplay", "args": ["-q", arquivo_saida_wav]},
-            {"name": "paplay", "path": "/usr/bin/paplay", "args": [arquivo_saida_wav]},
-            # Você pode adicionar outros players aqui se desejar, ex: afplay para macOS
-            # {"name": "afplay", "path": "/usr/bin/afplay", "args": [arquivo_saida_wav]},
-        ]
-
-        player_funcionou = False
-        ultimo_erro_player = ""
-
-        for player_info in players:
-            player_executavel = player_info["path"]
-            if os.path.exists(player_executavel):
-                comando_player = [player_executavel] + player_info["args"]
-                try:
-                    # print(f"Tentando tocar com {player_info['name']}...") # Descomente para depuração
-                    # Usamos capture_output=True para obter stdout/stderr do player
-                    # Usamos check=False para não levantar exceção automaticamente em caso de erro
-                    resultado_player = subprocess.run(comando_player, capture_output=True, text=True, encoding='utf-8', errors='replace', check=False)
-
-                    if resultado_player.returncode == 0:
-                        player_funcionou = True
-                        break
-                    else:
-                        # Não imprimir o erro imediatamente, apenas armazenar para o caso de todos falharem.
-                        # print(f"Falha ao usar {player_info['name']}. Código de saída: {resultado_player.returncode}") # Comentado
-                        if resultado_player.stderr:
-                            ultimo_erro_player = f"Erro do {player_info['name']} (código {resultado_player.returncode}): {resultado_player.stderr.strip()}"
-                            # print(f"Erro do {player_info['name']}: {resultado_player.stderr.strip()}") # Comentado
-                        elif resultado_player.stdout: # Alguns players podem enviar erros para stdout
-                            ultimo_erro_player = f"Saída (possível erro) do {player_info['name']} (código {resultado_player.returncode}): {resultado_player.stdout.strip()}"
-                            # print(f"Saída (possível erro) do {player_info['name']}: {resultado_player.stdout.strip()}") # Comentado
-                        else:
-                            ultimo_erro_player = f"Falha ao usar {player_info['name']} (código {resultado_player.returncode}) sem saída de erro detalhada."
-                except FileNotFoundError: # Improvável se os.path.exists passou, mas por segurança
-                    print(f"Erro: Executável do player {player_info['name']} não encontrado em '{player_executavel}'.")
-                    ultimo_erro_player = f"Executável {player_info['name']} não encontrado."
-                except Exception as e:
-                    print(f"Erro inesperado ao tentar usar {player_info['name']}: {e}")
-                    ultimo_erro_player = str(e)
-        
-        if not player_funcionou:
-            print("\nErro: Nenhum player de áudio (aplay, paplay) conseguiu tocar o som.")
-            if ultimo_erro_player:
-                print(f"Detalhes da última tentativa de reprodução: {ultimo_erro_player}")
-            
-            print("\nSugestões para solução de problemas de áudio no Linux:")
-            print("  1. Verifique se você tem 'alsa-utils' (para aplay) ou 'pulseaudio-utils' (para paplay) instalados.")
-            print("     Ex: sudo apt install alsa-utils pulseaudio-utils")
-            if "ALSA" in ultimo_erro_player or "unable to open slave" in ultimo_erro_player:
-                print("  2. O erro parece relacionado ao ALSA. Certifique-se de que seu usuário pertence ao grupo 'audio'.")
-                print("     Execute: sudo usermod -aG audio $USER")
-                print("     Depois, saia da sessão e entre novamente, ou reinicie o computador.")
-                print("  3. Verifique se nenhum outro aplicativo está usando o dispositivo de áudio exclusivamente.")
-                print("  4. Se estiver usando PulseAudio ou PipeWire, garanta que estão funcionando corretamente.")
-            return False
-
-    except FileNotFoundError:
-        print(f"Erro: O executável do Piper ('{CAMINHO_EXECUTAVEL_PIPER}') não foi encontrado.")
+    ultimo_erro_player = pedido.message
+    if not ultimo_erro_player.startswith(("No audio player", "Error with")): # Erro na síntese, não na reprodução
+        print(f"Erro ao executar o Piper: {ultimo_erro_player}")
         return False
-    finally:
-        # Opcional: remover o arquivo .wav após tocar
-        if os.path.exists(arquivo_saida_wav):
-            try:
-                os.remove(arquivo_saida_wav)
-            except OSError as e:
-                print(f"Aviso: Não foi possível remover o arquivo {arquivo_saida_wav}: {e}")
-    return True
+
+    print("\nErro: Nenhum player de áudio (aplay, paplay) conseguiu tocar o som.")
+    if ultimo_erro_player:
+        print(f"Detalhes da última tentativa de reprodução: {ultimo_erro_player}")
+
+    print("\nSugestões para solução de problemas de áudio no Linux:")
+    print("  1. Verifique se você tem 'alsa-utils' (para aplay) ou 'pulseaudio-utils' (para paplay) instalados.")
+    print("     Ex: sudo apt install alsa-utils pulseaudio-utils")
+    if "ALSA" in ultimo_erro_player or "unable to open slave" in ultimo_erro_player:
+        print("  2. O erro parece relacionado ao ALSA. Certifique-se de que seu usuário pertence ao grupo 'audio'.")
+        print("     Execute: sudo usermod -aG audio $USER")
+        print("     Depois, saia da sessão e entre novamente, ou reinicie o computador.")
+        print("  3. Verifique se nenhum outro aplicativo está usando o dispositivo de áudio exclusivamente.")
+        print("  4. Se estiver usando PulseAudio ou PipeWire, garanta que estão funcionando corretamente.")
+    return False
+
+def pre_carregar_fala(frase, length_scale=1.0):
+    """Sintetiza a frase em segundo plano (enquanto o usuário digita), sem tocar."""
+    tarefa = asyncio.ensure_future(servico_tts.prefetch(frase, length_scale, CAMINHO_MODELO_VOZ_ONNX))
+    _tarefas_prefetch.add(tarefa)
+    tarefa.add_done_callback(_tarefas_prefetch.discard)
+
+async def ler_entrada(prompt=""):
+    """input() em um thread à parte, para o loop asyncio continuar (ex: prefetch) enquanto o usuário digita."""
+    loop = asyncio.get_running_loop()
+    futuro = loop.create_future()
+
+    def entregar(metodo, valor):
+        if not futuro.done():
+            metodo(valor)
+
+    def ler():
+        try:
+            valor = input(prompt)
+        except BaseException as e: # EOFError, etc.
+            loop.call_soon_threadsafe(entregar, futuro.set_exception, e)
+        else:
+            loop.call_soon_threadsafe(entregar, futuro.set_result, valor)
+
+    threading.Thread(target=ler, daemon=True).start() # daemon: não segura a saída do programa
+    return await futuro
 
 
-def selecionar_velocidade(opcoes_velocidade, escala_atual_valor):
+async def selecionar_velocidade(opcoes_velocidade, escala_atual_valor):
     """Permite ao usuário selecionar uma velocidade de fala."""
     print("\nEscolha a velocidade da fala:")
     for key, info in opcoes_velocidade.items():
@@ -144,7 +104,7 @@ def selecionar_velocidade(opcoes_velocidade, escala_atual_valor):
         else:
             prompt_msg += ": "
         
-        escolha = input(prompt_msg).strip()
+        escolha = (await ler_entrada(prompt_msg)).strip()
         if not escolha and escala_atual_valor is not None: # Usuário pressionou Enter e não é a seleção inicial
              print(f"Velocidade mantida: {next(v['nome'] for k, v in opcoes_velocidade.items() if v['scale'] == escala_atual_valor)}.")
              return escala_atual_valor
@@ -156,31 +116,14 @@ def selecionar_velocidade(opcoes_velocidade, escala_atual_valor):
 
 def gerar_dica(palavra_correta):
     """
-    Gera uma dica para a palavra.
-    Para palavras com mais de 2 caracteres, mostra a primeira e a última letra,
-    com underscores no meio.
-    Para palavras com 1 ou 2 caracteres, a dica é mais simples.
+    Gera uma dica para a palavra: a primeira e a última letra, com underscores no meio
+    (nível 2 das dicas da GUI).
+    Palavras de 2 letras aparecem inteiras ("at" -> "a t"), como sempre foi no modo texto;
+    na GUI o nível 2 esconde a última letra.
     """
-    n = len(palavra_correta)
-    if n == 0:
-        return ""
-    
-    if n == 1: # Ex: "a" -> "a"
-        return palavra_correta
-    
-    componentes_dica = []
-    # Primeira letra
-    componentes_dica.append(palavra_correta[0])
-    
-    # Underscores para as letras do meio (se houver)
-    for _ in range(n - 2):
-        componentes_dica.append("_")
-    
-    # Última letra (se a palavra tiver mais de uma letra)
-    if n > 1: # Garante que não tentamos adicionar a última letra duas vezes para n=1
-        componentes_dica.append(palavra_correta[-1])
-        
-    return " ".join(componentes_dica)
+    if len(palavra_correta) == 2:
+        return " ".join(palavra_correta)
+    return get_hint(palavra_correta, 2)
 
 def exibir_trofeu():
     """Exibe uma arte ASCII de um troféu."""
@@ -199,9 +142,9 @@ def exibir_trofeu():
     for linha in trofeu:
         print(linha)
 
-def falar_frase_feedback(frase, velocidade_scale):
+async def falar_frase_feedback(frase, velocidade_scale):
     """Usa o Piper para falar uma frase de feedback."""
-    falar_palavra_piper(frase, velocidade_scale) # Reutiliza a função principal de fala
+    await falar_palavra_piper(frase, velocidade_scale) # Reutiliza a função principal de fala
 
 def exibir_estatisticas(palavras_estudo_final):
     """Exibe as estatísticas da sessão de estudo."""
@@ -212,17 +155,17 @@ def exibir_estatisticas(palavras_estudo_final):
 
     for p_info in palavras_estudo_final:
         status = ""
-        if p_info["masterizada"]:
-            status = f"Masterizada (Acertos: {p_info['corretas']}, Erros: {p_info['incorretas']})"
-        elif p_info["apresentada"]:
-            status = f"Tentada (Acertos: {p_info['corretas']}, Erros: {p_info['incorretas']})"
+        if p_info["mastered"]:
+            status = f"Masterizada (Acertos: {p_info['correct']}, Erros: {p_info['incorrect']})"
+        elif p_info["presented"]:
+            status = f"Tentada (Acertos: {p_info['correct']}, Erros: {p_info['incorrect']})"
         else:
             status = "Não estudada"
-        print(f"- {p_info['texto']}: {status}")
+        print(f"- {p_info['text']}: {status}")
     print("----------------------------")
 
 
-def main():
+async def main():
     # --- Configuração de Argumentos da Linha de Comando ---
     import argparse
     parser = argparse.ArgumentParser(description="Programa de prática de digitação e audição em inglês com Piper TTS.")
@@ -234,27 +177,17 @@ def main():
     # --- Fim da Configuração de Argumentos ---
 
     # --- Carregar Palavras do Arquivo ---
-    try:
-        with open(args.arquivo_palavras, 'r', encoding='utf-8') as f:
-            palavras_raw = [line.strip() for line in f if line.strip()]
-    except FileNotFoundError:
-        print(f"Erro: Arquivo de palavras não encontrado em '{args.arquivo_palavras}'")
+    gerenciador = WordManager()
+    gerenciador.mastery_threshold = MASTERY_THRESHOLD
+    sucesso, mensagem = gerenciador.load_words_from_file(args.arquivo_palavras)
+    if not sucesso:
+        print(f"Erro ao carregar as palavras de '{args.arquivo_palavras}': {mensagem}")
         sys.exit(1) # Sai do programa com código de erro
     
-    if not palavras_raw:
+    if not gerenciador.words_data:
         print("O arquivo de palavras está vazio. Nada para estudar.")
         sys.exit(0)
-
-    # Inicializar estrutura de dados para cada palavra
-    palavras_estudo = []
-    for p_texto in palavras_raw:
-        palavras_estudo.append({
-            "texto": p_texto,
-            "corretas": 0,
-            "incorretas": 0,
-            "masterizada": False,
-            "apresentada": False
-        })
+    palavras_estudo = gerenciador.words_data
 
     if not verificar_piper():
         print("Por favor, configure o Piper corretamente antes de executar o programa.")
@@ -272,7 +205,7 @@ def main():
     default_scale = velocidades_opcoes["3"]["scale"] # "Normal"
 
     print("\nPrimeiro, defina a velocidade da fala:")
-    velocidade_selecionada_scale = selecionar_velocidade(velocidades_opcoes, default_scale)
+    velocidade_selecionada_scale = await selecionar_velocidade(velocidades_opcoes, default_scale)
     # --- Fim da Configuração de Velocidade ---
 
     print("-" * 20) # Separador visual
@@ -280,21 +213,21 @@ def main():
     # Loop principal de estudo
     try:
         while True:
-            palavras_ativas = [p for p in palavras_estudo if not p["masterizada"]]
-            if not palavras_ativas:
+            palavra_atual_obj = gerenciador.get_next_word() # Já marca a palavra como apresentada
+            if not palavra_atual_obj:
                 print("\nParabéns! Todas as palavras foram masterizadas!")
                 break # Sai do loop principal de estudo
-
-            palavra_atual_obj = random.choice(palavras_ativas)
-            palavra_correta = palavra_atual_obj["texto"]
-            palavra_atual_obj["apresentada"] = True
+            palavra_correta = palavra_atual_obj["text"]
+            chave_correta = palavra_atual_obj["key"] # Forma de comparação (casefold), pronta na lista compilada
 
             print(f"\n--- Próxima Palavra ---")
             print("Ouça com atenção...")
-            if not falar_palavra_piper(palavra_correta, velocidade_selecionada_scale):
+            if not await falar_palavra_piper(palavra_correta, velocidade_selecionada_scale):
                 print(f"Não foi possível falar a palavra '{palavra_correta}'. Pulando esta palavra por agora.")
-                palavra_atual_obj["incorretas"] += 1 # Considera um erro se não puder ser falada
+                gerenciador.record_attempt(False) # Considera um erro se não puder ser falada
                 continue
+            # Deixa a frase de acerto pronta enquanto o usuário digita
+            pre_carregar_fala("Congratulations! You got the word right!", velocidade_selecionada_scale)
 
             tentativas = 0
             max_tentativas = 3
@@ -305,32 +238,32 @@ def main():
                 print("  0 - Sair do programa")
                 print("  1 - Alterar velocidade")
                 print("  2 - Repetir a palavra")
-                entrada_usuario = input(f"Digite a palavra que você ouviu (ou o número de uma opção): ").strip()
+                entrada_usuario = (await ler_entrada(f"Digite a palavra que você ouviu (ou o número de uma opção): ")).strip()
 
                 if entrada_usuario == "0":
                     print("\nSaindo do programa...")
                     exibir_estatisticas(palavras_estudo)
                     return # Sai da função main
                 elif entrada_usuario == "1":
-                    nova_escala = selecionar_velocidade(velocidades_opcoes, velocidade_selecionada_scale)
+                    nova_escala = await selecionar_velocidade(velocidades_opcoes, velocidade_selecionada_scale)
                     if nova_escala is not None:
                         velocidade_selecionada_scale = nova_escala
                     print("\nOuça novamente com a nova velocidade...")
-                    if not falar_palavra_piper(palavra_correta, velocidade_selecionada_scale):
+                    if not await falar_palavra_piper(palavra_correta, velocidade_selecionada_scale):
                         print("Erro ao tentar falar a palavra com a nova velocidade.")
                     continue # Volta para o prompt de opções/palavra
                 elif entrada_usuario == "2":
                     print("\nRepetindo a palavra...")
-                    if not falar_palavra_piper(palavra_correta, velocidade_selecionada_scale):
+                    if not await falar_palavra_piper(palavra_correta, velocidade_selecionada_scale):
                         print("Erro ao tentar repetir a palavra.")
                     continue # Volta para o prompt de opções/palavra
                 else: # Usuário digitou uma palavra
-                    palavra_digitada = entrada_usuario.lower()
-                    if palavra_digitada == palavra_correta.lower():
+                    palavra_digitada = entrada_usuario.casefold()
+                    if palavra_digitada == chave_correta:
                         print("Correto! 😄")
                         # print("Correto! !!!") # Alternativa para 🎉
                         exibir_trofeu()
-                        falar_frase_feedback("Congratulations! You got the word right!", velocidade_selecionada_scale)
+                        await falar_frase_feedback("Congratulations! You got the word right!", velocidade_selecionada_scale)
                         palavra_adivinhada_nesta_rodada = True
                         break # Sai do loop de tentativas (while), vai para a próxima palavra
                     else:
@@ -338,18 +271,18 @@ def main():
                         print(f"Incorreto. 😟 Tente novamente. ({max_tentativas - tentativas} tentativas restantes)")
                         if tentativas < max_tentativas:
                             print("\nRepetindo a palavra...") # Emoji 😟 removido
-                            if not falar_palavra_piper(palavra_correta, velocidade_selecionada_scale):
+                            if not await falar_palavra_piper(palavra_correta, velocidade_selecionada_scale):
                                 print("Erro ao tentar repetir a palavra. Pulando para a próxima tentativa se houver.")
                         else:
                             print(f"Incorreto.") # Emoji 😟 removido
             
             # Após o loop de tentativas regulares
             if palavra_adivinhada_nesta_rodada:
-                palavra_atual_obj["corretas"] += 1
+                gerenciador.record_attempt(True) # Marca como masterizada ao atingir MASTERY_THRESHOLD
             else:
                 # Se não adivinhou nas tentativas regulares, oferece a dica
                 print(f"\nVocê usou todas as {max_tentativas} tentativas regulares.")
-                falar_frase_feedback("You used all your regular attempts. Here is a hint.", velocidade_selecionada_scale)
+                await falar_frase_feedback("You used all your regular attempts. Here is a hint.", velocidade_selecionada_scale)
                 print("Vamos tentar com uma dica!")
                 dica = gerar_dica(palavra_correta)
                 
@@ -362,15 +295,15 @@ def main():
                     print(f"Tentativa com dica {tentativas_com_dica + 1} de {max_tentativas_com_dica}.")
                     
                     print("Ouça novamente...")
-                    if not falar_palavra_piper(palavra_correta, velocidade_selecionada_scale):
+                    if not await falar_palavra_piper(palavra_correta, velocidade_selecionada_scale):
                         print("Erro ao tentar repetir a palavra. Tente digitar mesmo assim.")
                     
-                    palavra_digitada_com_dica = input("Digite a palavra com a ajuda da dica: ").strip().lower()
+                    palavra_digitada_com_dica = (await ler_entrada("Digite a palavra com a ajuda da dica: ")).strip().casefold()
 
-                    if palavra_digitada_com_dica == palavra_correta.lower():
+                    if palavra_digitada_com_dica == chave_correta:
                         print("Correto com a dica! !!!") # 🎉 substituído por !!!
                         exibir_trofeu()
-                        falar_frase_feedback("Congratulations! You got the word right with the hint!", velocidade_selecionada_scale)
+                        await falar_frase_feedback("Congratulations! You got the word right with the hint!", velocidade_selecionada_scale)
                         acertou_com_dica = True
                         break
                     else:
@@ -378,26 +311,29 @@ def main():
                         print("Incorreto. Tente novamente com a dica.") # Emoji 😟 removido
                 
                 if acertou_com_dica:
-                    palavra_atual_obj["corretas"] += 1
+                    gerenciador.record_attempt(True)
                 else:
                     print(f"\nVocê usou todas as tentativas com dica. A palavra correta era: '{palavra_correta}'")
-                    palavra_atual_obj["incorretas"] += 1 # Emoji 😟 não estava aqui
-                    falar_frase_feedback("You used all your hint attempts. Don't give up! Keep practicing!", velocidade_selecionada_scale)
+                    gerenciador.record_attempt(False) # Emoji 😟 não estava aqui
+                    await falar_frase_feedback("You used all your hint attempts. Don't give up! Keep practicing!", velocidade_selecionada_scale)
 
             # Verificar e atualizar status de masterização
-            if palavra_atual_obj["corretas"] >= MASTERY_THRESHOLD and not palavra_atual_obj["masterizada"]:
-                palavra_atual_obj["masterizada"] = True
+            if palavra_atual_obj["mastered"]:
                 print("\n****************************************") # ✨ já substituído por *
                 print(f"Parabéns! Você masterizou a palavra '{palavra_correta}'! Ela não será mais apresentada.")
                 exibir_trofeu()
                 print("****************************************") # ✨ já substituído por *
-                falar_frase_feedback(f"Congratulations! You have mastered the word {palavra_correta}!", velocidade_selecionada_scale)
+                await falar_frase_feedback(f"Congratulations! You have mastered the word {palavra_correta}!", velocidade_selecionada_scale)
 
         # Fim do loop while True (estudo)
         print("\nPrática concluída! 😄") # Emoji 😄 removido
 
     finally: # Garante que as estatísticas sejam exibidas mesmo em caso de erro inesperado ou Ctrl+C
         exibir_estatisticas(palavras_estudo)
+        await servico_tts.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass # As estatísticas já foram exibidas pelo finally de main()
\ No newline at end of file
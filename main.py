@@ -1,300 +1,380 @@
 import sys
 import os
-import subprocess
 import random
-import json # Para salvar e carregar o progresso
+import collections
+import asyncio
+import threading
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QLineEdit, QFileDialog, QMessageBox, QComboBox,
-    QTextEdit, QSizePolicy
+    QTextEdit, QSizePolicy, QProgressDialog
 )
-from PyQt6.QtGui import QAction, QFont, QIcon, QMovie, QPixmap # QIcon para o futuro
+from PyQt6.QtGui import QAction, QFont, QIcon, QImageReader, QPixmap # QIcon para o futuro
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QObject, QTimer, QSize, pyqtSlot
 
+# Lógica sem Qt (palavras, progresso, dicas, TTS, vozes) fica no pacote core
+from core.words import WordManager, SELECTION_MODE_UNIFORM, SELECTION_MODE_WEIGHTED, SELECTION_MODE_SPACED
+from core.hints import get_hint, MAX_HINT_LEVEL
+from core.wordfile import load_word_list
+from core.progress import WORDLISTS_DIR_NAME, progress_file_path, save_progress, word_list_fingerprint, ProgressJournal
+from core.progress_db import PROGRESS_DB_FILE_DEFAULT, PROFILE_NAME_DEFAULT, SQLiteProgressStore, cross_list_stats
+from core.session import WordListSession
+from core.tts import TTSService, SpeechRequest
+from core.voices import VoiceRegistry
+from core.assets import GIF_CACHE_DIR_DEFAULT, load_manifest, resolve_display_asset
+
 # --- Configurações (podem vir de um arquivo de config ou settings dialog no futuro) ---
 CAMINHO_EXECUTAVEL_PIPER_DEFAULT = "./piper/piper"
 CAMINHO_MODELO_VOZ_ONNX_DEFAULT = "./piper_voices/en_US-hfc_female-medium.onnx"
-MASTERY_THRESHOLD_DEFAULT = 2
-
-# --- Lógica do Piper (Adaptada do seu script original) ---
-# Idealmente, operações demoradas como esta rodariam em um QThread para não bloquear a GUI.
-# Por simplicidade inicial, manteremos síncrono, mas com um aviso.
+DIRETORIO_VOZES_PIPER_DEFAULT = "./piper_voices"
+PROGRESS_BACKEND_DEFAULT = "json" # "json": arquivos ocultos em wordlists/; "sqlite": banco PROGRESS_DB_FILE_DEFAULT (várias listas/perfis)
+WORD_FILE_POLL_INTERVAL_MS_DEFAULT = 2000 # Intervalo entre as verificações (mtime/tamanho) das listas abertas
+GIF_DIR_SUCCESS = "img/" # GIFs de comemoração (acerto)
+GIF_DIR_ERRORS = "img/errors/" # GIFs de erro (tentativas esgotadas)
+GIF_MAX_DISPLAY_SIZE = 450 # Lado máximo (px) do popup de GIF
+GIF_CACHE_BYTE_BUDGET_DEFAULT = 96 * 1024 * 1024 # Memória máxima para quadros decodificados
+GIF_DEFAULT_FRAME_DELAY_MS = 100 # Usado quando o GIF não informa a duração do quadro
+
+# --- Lógica do Piper ---
+# A síntese e a reprodução ficam no TTSService (core/tts.py), compartilhado com o modo
+# texto. Aqui só existe a ponte entre o Qt e o loop asyncio, que roda em um thread próprio.
 
 class PiperTTSWorker(QObject): # QObject para usar sinais
-    finished_speaking = pyqtSignal(bool, str) # sucesso, mensagem_erro
-    # Adicionar um sinal para iniciar a fala, que será conectado ao slot speak
-    
+    """Ponte Qt/asyncio para o TTSService; vive no thread da GUI.
+
+    Cada submit() devolve um SpeechRequest; o resultado vai só para o callback daquele
+    pedido, chamado no thread da GUI.
+    """
+    _request_finished = pyqtSignal(object) # Emitido no thread do loop, entregue no da GUI
+
     def __init__(self, piper_exe): # model_onnx não é mais passado no init
         super().__init__()
-        self.piper_exe = piper_exe
-        # self.model_onnx = model_onnx
-        self.temp_wav_file = "output_gui.wav" # Nome de arquivo temporário diferente
-
-    @pyqtSlot(str, float, str) # Adicionado model_path_to_use
-    def speak(self, text, length_scale=1.0, model_path_to_use=None):
-        if not model_path_to_use:
-            self.finished_speaking.emit(False, "No voice model specified to speak.")
-            return
-        if not self._verificar_piper(model_path_to_use): # Passa o modelo específico para verificação
-            self.finished_speaking.emit(False, f"Invalid Piper configuration for model: {os.path.basename(model_path_to_use)}")
+        self.service = TTSService(piper_exe)
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._run_loop, name="tts-asyncio", daemon=True)
+        self._gui_callbacks = {} # id do pedido -> callback de quem pediu
+        self._request_finished.connect(self._on_request_finished)
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def start(self):
+        self._loop_thread.start()
+        asyncio.run_coroutine_threadsafe(self.service.start(), self._loop)
+
+    def submit(self, text, length_scale=1.0, model_path=None, on_finished=None):
+        """Enfileira uma fala e devolve o SpeechRequest correspondente."""
+        request = SpeechRequest(text, length_scale, model_path, on_finished=self._request_finished.emit)
+        if on_finished:
+            self._gui_callbacks[request.id] = on_finished
+        self._loop.call_soon_threadsafe(self.service.enqueue, request)
+        return request
+
+    def cancel(self, request):
+        """Descarta o pedido se ainda estiver na fila, ou interrompe o player se já estiver tocando."""
+        asyncio.run_coroutine_threadsafe(self.service.cancel(request), self._loop)
+
+    @pyqtSlot(object)
+    def _on_request_finished(self, request):
+        callback = self._gui_callbacks.pop(request.id, None)
+        if callback:
+            callback(request)
+
+    def shutdown(self, timeout_ms=5000):
+        """Para o pipeline e o thread do loop asyncio."""
+        if not self._loop_thread.is_alive():
             return
-
-        comando_piper = [
-            self.piper_exe,
-            "--model", model_path_to_use,
-            "--output_file", self.temp_wav_file,
-            "--length_scale", str(length_scale)
-        ]
         try:
-            process = subprocess.Popen(comando_piper, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            stdout, stderr = process.communicate(input=text.encode('utf-8'))
-
-            if process.returncode != 0:
-                self.finished_speaking.emit(False, f"Piper Error: {stderr.decode('utf-8', errors='replace')}")
-                return
-
-            if not os.path.exists(self.temp_wav_file):
-                self.finished_speaking.emit(False, "Error: Piper did not generate the audio file.")
-                return
+            asyncio.run_coroutine_threadsafe(self.service.close(), self._loop).result(timeout_ms / 1000)
+        except Exception as e:
+            print(f"Warning: TTS service did not stop cleanly: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join(timeout_ms / 1000)
 
-            # Tocar o áudio
-            players = [
-                {"name": "aplay", "path": "/usr/bin/aplay", "args": ["-q", self.temp_wav_file]},
-                {"name": "paplay", "path": "/usr/bin/paplay", "args": [self.temp_wav_file]},
-            ]
-            player_funcionou = False
-            ultimo_erro_player = "No audio player found/worked."
-
-            for player_info in players:
-                if os.path.exists(player_info["path"]):
-                    comando_player = [player_info["path"]] + player_info["args"]
-                    resultado_player = subprocess.run(comando_player, capture_output=True, text=True, encoding='utf-8', errors='replace', check=False)
-                    if resultado_player.returncode == 0:
-                        player_funcionou = True
-                        break
-                    else:
-                        ultimo_erro_player = f"Error with {player_info['name']}: {resultado_player.stderr.strip() or resultado_player.stdout.strip()}"
-            
-            if player_funcionou:
-                self.finished_speaking.emit(True, "")
-            else:
-                self.finished_speaking.emit(False, ultimo_erro_player)
+# --- Animações (GIFs) ---
+class GifAnimation:
+    """Quadros de um GIF já decodificados e escalados, prontos para exibir."""
+    def __init__(self, path, frames, delays):
+        self.path = path
+        self.frames = frames # Lista de QPixmap
+        self.delays = delays # Duração de cada quadro (ms)
+        self.size = frames[0].size()
 
-        except FileNotFoundError:
-            self.finished_speaking.emit(False, f"Piper executable not found at '{self.piper_exe}'.")
-        except Exception as e:
-            self.finished_speaking.emit(False, f"Unexpected error while speaking: {e}")
-        finally:
-            if os.path.exists(self.temp_wav_file):
-                try:
-                    os.remove(self.temp_wav_file)
-                except OSError:
-                    pass # Ignore error when removing temporary file
-
-    def _verificar_piper(self, model_path_to_check): # Agora recebe o caminho do modelo para verificar
-        if not os.path.exists(self.piper_exe):
-            print(f"Error: Piper executable not found at '{self.piper_exe}'")
-            return False
-        if not os.path.exists(model_path_to_check):
-            print(f"Error: ONNX voice model not found at '{model_path_to_check}'")
-            return False
-        return True
-
-# --- Gerenciador de Palavras ---
-class WordManager:
-    def __init__(self):
-        self.words_data = []  # Lista de dicionários
-        self.current_word_obj = None
-        self.mastery_threshold = MASTERY_THRESHOLD_DEFAULT
 
-    def load_words_from_file(self, filepath):
-        self.words_data = []
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                raw_words = [line.strip() for line in f if line.strip()]
-            for text in raw_words:
-                self.words_data.append({
-                    "text": text, "correct": 0, "incorrect": 0,
-                    "mastered": False, "presented": False
-                })
-            return True, f"{len(self.words_data)} words loaded."
-        except FileNotFoundError:
-            return False, "File not found."
-        except Exception as e:
-            return False, f"Error loading words: {e}"
+class GifDecodeWorker(QObject):
+    """Lista os diretórios e decodifica os GIFs fora do thread da GUI.
 
-    def load_progress_data(self, progress_data_list):
-        """Carrega o progresso (acertos, erros, etc.) para as palavras existentes."""
-        if not self.words_data:
-            return False, "No base words loaded to apply progress to."
-        
-        progress_map = {item['text']: item for item in progress_data_list}
-        for word_obj in self.words_data:
-            if word_obj['text'] in progress_map:
-                progress_item = progress_map[word_obj['text']]
-                word_obj.update(progress_item) # Atualiza com os dados do progresso
-        return True, "Progress loaded."
-
-    def get_progress_data_to_save(self):
-        """Retorna os dados das palavras formatados para salvar."""
-        return self.words_data # A estrutura atual já é adequada
-
-    def reset_all_word_stats(self):
-        """Resets the statistics for all loaded words."""
-        for word_obj in self.words_data:
-            word_obj["correct"] = 0
-            word_obj["incorrect"] = 0
-            word_obj["mastered"] = False
-            word_obj["presented"] = False
-        print("All word statistics have been reset.")
-
-    def get_next_word(self):
-        active_words = [w for w in self.words_data if not w["mastered"]]
-        if not active_words:
-            self.current_word_obj = None
-            return None
-        self.current_word_obj = random.choice(active_words)
-        self.current_word_obj["presented"] = True
-        return self.current_word_obj
+    Só usa QImage/QImageReader, que podem ser usados em qualquer thread; os quadros
+    decodificados ficam em um LRU limitado por byte_budget.
+    """
+    prepared = pyqtSignal(str, str, object, object) # diretório, caminho, quadros (QImage), durações
 
-    def record_attempt(self, correct_attempt):
-        if not self.current_word_obj:
-            return
-        if correct_attempt:
-            self.current_word_obj["correct"] += 1
-            if self.current_word_obj["correct"] >= self.mastery_threshold:
-                self.current_word_obj["mastered"] = True
+    def __init__(self, max_display_width, max_display_height, byte_budget, prepared_dir):
+        super().__init__()
+        self.prepared_dir = prepared_dir
+        self._manifest = None # Manifesto das cópias preparadas (lido no primeiro decode)
+        self.max_display_width = max_display_width
+        self.max_display_height = max_display_height
+        self.byte_budget = byte_budget
+        self._gif_files = {} # diretório -> lista de caminhos .gif
+        self._decoded = collections.OrderedDict() # caminho -> (quadros, durações, bytes), mais recente no fim
+        self._cached_bytes = 0
+
+    @pyqtSlot(str)
+    def prepare(self, directory):
+        """Escolhe uma animação de directory e a entrega decodificada pelo sinal prepared."""
+        files = self.gif_files(directory)
+        path = random.choice(files) if files else ""
+        frames, delays = self.get(path) if path else ([], [])
+        self.prepared.emit(directory, path, frames, delays)
+
+    def gif_files(self, directory):
+        if directory not in self._gif_files:
+            files = []
+            if os.path.isdir(directory):
+                files = [os.path.join(directory, f) for f in sorted(os.listdir(directory)) if f.lower().endswith(".gif")]
+            if not files:
+                print(f"Warning: No .gif files found in '{directory}'.")
+            self._gif_files[directory] = files
+        return self._gif_files[directory]
+
+    def get(self, path):
+        entry = self._decoded.get(path)
+        if entry:
+            self._decoded.move_to_end(path)
+            return entry[0], entry[1]
+        frames, delays = self._decode(path)
+        byte_size = sum(frame.sizeInBytes() for frame in frames)
+        if frames and byte_size <= self.byte_budget: # Maior que o orçamento inteiro: usa uma vez e descarta
+            self._decoded[path] = (frames, delays, byte_size)
+            self._cached_bytes += byte_size
+            while self._cached_bytes > self.byte_budget:
+                _, evicted = self._decoded.popitem(last=False)
+                self._cached_bytes -= evicted[2]
+        return frames, delays
+
+    def _decode(self, path):
+        if self._manifest is None:
+            self._manifest = load_manifest(self.prepared_dir)
+        reader = QImageReader(resolve_display_asset(path, self._manifest, self.prepared_dir))
+        original_size = reader.size()
+        if original_size.isEmpty(): # Fallback se o tamanho não puder ser determinado
+            original_size = QSize(self.max_display_width, self.max_display_height)
+        # Escala mantendo a proporção para caber em max_display_width/height; o decoder já entrega os quadros escalados
+        reader.setScaledSize(original_size.scaled(self.max_display_width, self.max_display_height, Qt.AspectRatioMode.KeepAspectRatio))
+
+        frames, delays = [], []
+        while True:
+            image = reader.read()
+            if image.isNull():
+                break
+            frames.append(image)
+            delays.append(reader.nextImageDelay() or GIF_DEFAULT_FRAME_DELAY_MS)
+        if not frames:
+            print(f"Error: Could not decode GIF '{path}'. Error: {reader.errorString()}")
+        return frames, delays
+
+
+class GifAssetCache(QObject):
+    """Animações de img/ e img/errors/ prontas para exibir, vive no thread da GUI.
+
+    A listagem e a decodificação ficam no GifDecodeWorker, em um QThread próprio. Para cada
+    diretório há sempre uma animação já decodificada esperando (prefetch_next); pedir uma
+    animação (request_animation) não faz nenhuma leitura de imagem no thread da GUI.
+    Se existirem cópias preparadas com `python -m core.assets`, elas são decodificadas no
+    lugar dos originais.
+    """
+    _prepare_requested = pyqtSignal(str) # Entregue ao worker, no thread de decodificação
+
+    def __init__(self, max_display_width=GIF_MAX_DISPLAY_SIZE, max_display_height=GIF_MAX_DISPLAY_SIZE,
+                 byte_budget=GIF_CACHE_BYTE_BUDGET_DEFAULT, prepared_dir=GIF_CACHE_DIR_DEFAULT):
+        super().__init__()
+        self._ready = {} # diretório -> GifAnimation pronta (ou None se o diretório não tem GIFs)
+        self._waiting = collections.defaultdict(list) # diretório -> callbacks esperando uma animação
+        self._in_flight = set() # diretórios com decodificação pedida ao worker
+
+        self._thread = QThread()
+        self._worker = GifDecodeWorker(max_display_width, max_display_height, byte_budget, prepared_dir)
+        self._worker.moveToThread(self._thread)
+        self._prepare_requested.connect(self._worker.prepare)
+        self._worker.prepared.connect(self._on_prepared)
+        self._thread.start()
+
+    def request_animation(self, directory, on_ready):
+        """Chama on_ready(animação ou None) agora, se já houver uma pronta, ou assim que o worker a entregar."""
+        if directory in self._ready:
+            on_ready(self._ready.pop(directory))
         else:
-            self.current_word_obj["incorrect"] += 1
-        
-    def get_stats_summary(self):
-        if not self.words_data: return "No words loaded."
-        total_words = len(self.words_data)
-        presented_count = sum(1 for w in self.words_data if w["presented"])
-        mastered_count = sum(1 for w in self.words_data if w["mastered"])
-        total_correct_attempts = sum(w['correct'] for w in self.words_data)
-        total_incorrect_attempts = sum(w['incorrect'] for w in self.words_data)
-        return (f"Words: {total_words} | Presented: {presented_count} | Mastered: {mastered_count}\n"
-                f"Correct (attempts): {total_correct_attempts} | Incorrect (words missed after hints): {total_incorrect_attempts}")
-
-    def get_full_stats(self):
-        stats_lines = []
-        for p_info in self.words_data:
-            status = ""
-            if p_info["mastered"]:
-                status = f"Mastered (Correct: {p_info['correct']}, Incorrect: {p_info['incorrect']})"
-            elif p_info["presented"]:
-                status = f"Attempted (Correct: {p_info['correct']}, Incorrect: {p_info['incorrect']})"
-            else:
-                status = "Not studied"
-            stats_lines.append(f"- {p_info['text']}: {status}")
-        return "\n".join(stats_lines) if stats_lines else "No statistics available."
+            self._waiting[directory].append(on_ready)
+        self.prefetch_next(directory)
+
+    def prefetch_next(self, directory):
+        """Pede ao worker a próxima animação de directory, se ainda não houver uma pronta ou a caminho."""
+        if directory not in self._ready and directory not in self._in_flight:
+            self._in_flight.add(directory)
+            self._prepare_requested.emit(directory)
+
+    @pyqtSlot(str, str, object, object)
+    def _on_prepared(self, directory, path, frames, delays):
+        self._in_flight.discard(directory)
+        animation = GifAnimation(path, [QPixmap.fromImage(frame) for frame in frames], delays) if frames else None
+        callbacks = self._waiting.pop(directory, None)
+        if callbacks:
+            for callback in callbacks:
+                callback(animation)
+            self.prefetch_next(directory)
+        else:
+            self._ready[directory] = animation
 
-    def get_mastered_words_texts(self):
-        return [w['text'] for w in self.words_data if w['mastered']]
+    def shutdown(self, timeout_ms=2000):
+        self._thread.quit()
+        self._thread.wait(timeout_ms)
 
 
 class GifPopupWindow(QWidget):
-    def __init__(self, image_directory, duration_ms=4000, parent=None, max_display_width=450, max_display_height=450):
+    """Popup sem bordas que toca uma GifAnimation; aparece quando show_animation recebe os quadros.
+
+    A janela é criada uma vez e reaproveitada: fechar só a esconde, e um novo show_animation
+    troca a animação e reinicia o tempo de exibição.
+    """
+    def __init__(self, parent=None, fallback_text="No GIF available"):
         super().__init__(parent)
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.SplashScreen) # Sem bordas, fica no topo
-        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose) # Ensure widget is deleted when closed
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground) # Para cantos arredondados se a imagem tiver
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0,0,0,0) # Sem margens internas no layout
         self.image_label = QLabel(self)
+        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.image_label)
 
-        self.movie = None
-        gif_files = []
-        if os.path.isdir(image_directory):
-            gif_files = [f for f in os.listdir(image_directory) if f.lower().endswith(".gif")]
-        
-        if not gif_files:
-            print(f"Warning: No .gif files found in '{image_directory}'.")
-            self.image_label.setText(f"No GIFs in\n{image_directory}")
+        self.fallback_text = fallback_text
+        self.animation = None
+        self.frame_index = 0
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.timeout.connect(self._show_next_frame)
+        self.close_timer = QTimer(self)
+        self.close_timer.setSingleShot(True)
+        self.close_timer.timeout.connect(self.close)
+
+    def show_animation(self, animation, duration_ms=4000):
+        """Exibe animation (ou o texto de fallback) centralizada no pai e fecha após duration_ms."""
+        self.frame_timer.stop()
+        self.animation = animation
+        if not animation:
+            self.image_label.setText(self.fallback_text)
             self.image_label.setFixedSize(200,100) # Default size for error message
+            self.setFixedSize(200,100)
         else:
-            chosen_gif_name = random.choice(gif_files)
-            image_path = os.path.join(image_directory, chosen_gif_name)
-            print(f"Displaying GIF: {image_path}")
-
-            self.movie = QMovie(image_path)
-            if not self.movie.isValid() or self.movie.frameCount() == 0:
-                print(f"Error: QMovie is not valid or has no frames for '{image_path}'. Error: {self.movie.lastErrorString()}")
-                self.image_label.setText(f"Error loading GIF:\n{os.path.basename(image_path)}")
-                self.image_label.setFixedSize(200,100)
-            else:
-                # Tenta obter o tamanho original do primeiro frame para escalar
-                original_size = self.movie.currentPixmap().size()
-                if original_size.isEmpty(): # Fallback se o tamanho não puder ser determinado
-                    original_size = QSize(max_display_width, max_display_height)
-
-                # Escala mantendo a proporção para caber em max_display_width/height
-                scaled_size = original_size.scaled(max_display_width, max_display_height, Qt.AspectRatioMode.KeepAspectRatio)
-                
-                self.movie.setScaledSize(scaled_size)
-                self.image_label.setMovie(self.movie)
-                self.movie.start()
-                if self.movie.state() == QMovie.MovieState.NotRunning and self.movie.lastError() != QMovie.NoError:
-                     print(f"QMovie did not start. Error: {self.movie.lastErrorString()}")
-                
-                # Ajusta o tamanho do label e da janela
-                self.image_label.setFixedSize(scaled_size)
-                self.setFixedSize(scaled_size) # Define o tamanho da janela para o tamanho do GIF escalado
+            print(f"Displaying GIF: {animation.path}")
+            # Ajusta o tamanho do label e da janela para o tamanho do GIF escalado
+            self.image_label.setFixedSize(animation.size)
+            self.setFixedSize(animation.size)
+            self._show_frame(0)
+
+        if self.parentWidget():
+            self.move(self.parentWidget().geometry().center() - self.rect().center())
+        self.show()
+        self.raise_()
+        self.close_timer.start(duration_ms) # Reexibir antes do fim reinicia a contagem
 
-        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        # self.adjustSize() # Não é mais necessário se setFixedSize for usado
+    def _show_frame(self, index):
+        self.frame_index = index
+        self.image_label.setPixmap(self.animation.frames[index])
+        if len(self.animation.frames) > 1:
+            self.frame_timer.start(self.animation.delays[index])
 
-        QTimer.singleShot(duration_ms, self.close)
+    def _show_next_frame(self):
+        self._show_frame((self.frame_index + 1) % len(self.animation.frames))
 
     def closeEvent(self, event):
-        if self.movie and self.movie.state() != QMovie.MovieState.NotRunning:
-            self.movie.stop()
+        self.frame_timer.stop()
+        self.close_timer.stop()
         super().closeEvent(event)
 
+
+class WordFileLoadWorker(QObject):
+    """Lê (ou pega do cache de listas compiladas) e prepara listas de palavras fora do thread da GUI.
+
+    Ver core.wordfile.load_word_list e WordManager.prepare_words. Com base (sessão atual e uma
+    cópia do seu WordStore), a lista é acrescentada a essa sessão (ver core.session).
+    """
+    progress = pyqtSignal(int) # Porcentagem do arquivo já lida
+    loaded = pyqtSignal(str, bool, object, str) # caminho, se foi acrescentada à sessão, (sessão, lista preparada) ou None, mensagem de erro
+    reloaded = pyqtSignal(str, object, str) # caminho, (sessão de origem, sessão nova, índices que mudaram) ou None, mensagem de erro
+
+    @pyqtSlot(str, object)
+    def load(self, file_path, base):
+        try:
+            texts = load_word_list(file_path, lambda done, total: self.progress.emit(done * 100 // total if total else 100))
+            if base is None:
+                session = WordListSession().with_list(file_path, texts)
+                self.loaded.emit(file_path, False, (session, WordManager.prepare_words(session.texts)), "")
+            else:
+                base_session, base_store = base
+                session = base_session.with_list(file_path, texts)
+                self.loaded.emit(file_path, True, (session, WordManager.prepare_extended_words(base_store, session.texts)), "")
+        except FileNotFoundError:
+            self.loaded.emit(file_path, base is not None, None, "File not found.")
+        except Exception as e:
+            self.loaded.emit(file_path, base is not None, None, f"Error loading words: {e}")
+
+    @pyqtSlot(str, object)
+    def reload(self, file_path, session):
+        """Lê de novo uma lista de session que mudou no disco (ver WordListSession.with_reloaded_list)."""
+        try:
+            self.reloaded.emit(file_path, (session, *session.with_reloaded_list(file_path, load_word_list(file_path))), "")
+        except Exception as e:
+            self.reloaded.emit(file_path, None, str(e))
+
 # --- Abas da Interface ---
 class BaseTab(QWidget):
-    request_speak_signal = pyqtSignal(str, float, str) # Adicionado model_path
-
     def __init__(self, piper_worker, word_manager, main_window_ref):
         super().__init__()
         self.piper_worker = piper_worker
         self.word_manager = word_manager
         self.main_window_ref = main_window_ref # Para acessar velocidade, etc.
         self.current_word_text = None
+        self.current_word_key = None # Forma de comparação (casefold) de current_word_text, vinda da lista compilada
         
         self.max_normal_attempts = 2
         self.current_normal_attempts_left = self.max_normal_attempts
         self.hint_level = 0 # 0: no hint, 1: underscores, 2: first/last, 3: 60%
-        self.max_hint_level = 3 # Corresponds to 3 hint attempts / levels
+        self.max_hint_level = MAX_HINT_LEVEL # Corresponds to 3 hint attempts / levels
         self.force_correct_typing_mode = False
         self.word_to_force_type = None
-
-        # Conectar o sinal local ao slot do piper_worker (já estava correto)
-        # Esta conexão é feita uma vez por instância de BaseTab
-        self.request_speak_signal.connect(self.piper_worker.speak)
-        # O piper_worker já está em um thread gerenciado pela MainWindow
-        self.piper_worker.finished_speaking.connect(self.on_piper_finished)
+        self.word_audio_request = None # Último pedido de fala da palavra (speak_text)
 
     def speak_text(self, text):
+        """Pede a fala de text (a palavra atual); o resultado volta só para esta aba (ver on_piper_finished)."""
         speed_scale = self.main_window_ref.get_current_speed_scale()
         effective_voice_model_path = self.main_window_ref.get_effective_voice_model_path()
         if effective_voice_model_path:
-            self.request_speak_signal.emit(text, speed_scale, effective_voice_model_path) # Emitir o sinal com o modelo
+            self.word_audio_request = self.piper_worker.submit(text, speed_scale, effective_voice_model_path,
+                                                               on_finished=self.on_piper_finished)
+            return self.word_audio_request
+        return None
+
+    def cancel_word_audio(self):
+        """Cancela a fala da palavra anterior, se ainda estiver na fila ou tocando, para não cobrir a próxima."""
+        request = self.word_audio_request
+        if request is not None and not request.done():
+            self.piper_worker.cancel(request)
+        self.word_audio_request = None
         
     def speak_system_feedback(self, text):
         """Fala uma frase de feedback do sistema sempre em velocidade Normal."""
         normal_speed_scale = self.main_window_ref.speed_options.get("Normal", 1.0) # Garante que pegamos a escala normal
         effective_voice_model_path = self.main_window_ref.get_effective_voice_model_path()
         if effective_voice_model_path:
-            self.request_speak_signal.emit(text, normal_speed_scale, effective_voice_model_path)
-        
+            return self.piper_worker.submit(text, normal_speed_scale, effective_voice_model_path, on_finished=self.on_piper_finished)
+        return None
 
-    def on_piper_finished(self, success, message):
-        if not success:
-            self.show_feedback(f"Audio Error: {message}", error=True)
+    def on_piper_finished(self, request):
+        if not request.success and not request.cancelled:
+            self.show_feedback(f"Audio Error: {request.message}", error=True)
         # A aba específica pode querer fazer algo mais aqui
 
     def show_feedback(self, message, error=False):
@@ -302,52 +382,18 @@ class BaseTab(QWidget):
         pass
 
     def get_hint(self, word):
-        n = len(word)
-        if n == 0: return ""
-        if n == 1 and self.hint_level >= 1 : return word # For single letter words, hint reveals it
+        return get_hint(word, self.hint_level) # get_hint usa self.hint_level
 
-        if self.hint_level == 1: # Only underscores
-            return " ".join(["_"] * n)
-        
-        elif self.hint_level == 2: # First and last
-            if n <= 2: # For words like "at", hint 2 becomes "a _"
-                return " ".join(list(word[0] + "_" * (n-1))) if n > 0 else ""
-            components = [word[0]]
-            components.extend(["_"] * (n - 2))
-            components.append(word[-1])
-            return " ".join(components)
-
-        elif self.hint_level == 3: # Approx 60% reveal
-            if n <= 2: # For short words, reveal all
-                return " ".join(list(word))
-
-            num_to_reveal = int(n * 0.6)
-            if num_to_reveal == 0 and n > 0: num_to_reveal = 1
-            # Ensure at least first and last are shown if possible, and count them
-            # towards num_to_reveal if they are part of the 60% target.
-            
-            revealed_indices = set()
-            # Always try to reveal first and last
-            if n > 0: revealed_indices.add(0)
-            if n > 1: revealed_indices.add(n - 1)
-
-            # Get other indices to reveal, avoiding first and last if already added
-            other_indices = [i for i in range(n) if i not in revealed_indices]
-            random.shuffle(other_indices)
-
-            # Add more indices until num_to_reveal is met or no more indices
-            while len(revealed_indices) < num_to_reveal and other_indices:
-                revealed_indices.add(other_indices.pop())
-            
-            hint_list = []
-            for i, char in enumerate(word):
-                if i in revealed_indices:
-                    hint_list.append(char)
-                else:
-                    hint_list.append("_")
-            return " ".join(hint_list)
-        
-        return " ".join(["_"] * n) # Default or unknown level
+    def show_gif_popup(self, directory, duration_ms=4000):
+        """Mostra uma animação de directory centralizada na janela principal.
+
+        Usa o popup fixo de directory (MainWindow.gif_popups), então há no máximo uma animação
+        de acerto e uma de erro na tela. A animação já vem decodificada do GifAssetCache; se
+        ainda não estiver pronta, o popup aparece assim que o worker a entregar.
+        """
+        popup = self.main_window_ref.gif_popups[directory]
+        self.main_window_ref.gif_cache.request_animation(directory, lambda animation: popup.show_animation(animation, duration_ms))
+        return popup
     # def cleanup(self): # Não gerencia mais o thread aqui
 
 
@@ -415,6 +461,7 @@ class DictationTab(BaseTab):
         self.feedback_label.setStyleSheet("color: red;" if error else "color: green;")
 
     def load_new_word(self):
+        self.cancel_word_audio()
         self.current_word_text = None
         self.hint_label.setText("")
         self.hint_level = 0 # Reset hint level
@@ -424,6 +471,7 @@ class DictationTab(BaseTab):
         word_obj = self.word_manager.get_next_word()
         if word_obj:
             self.current_word_text = word_obj["text"]
+            self.current_word_key = word_obj["key"]
             self.current_normal_attempts_left = self.max_normal_attempts # Reset normal attempts
             # Define o feedback inicial para uma nova palavra
             self.show_feedback(f"Listen and type. Attempts left: {self.current_normal_attempts_left}")
@@ -450,7 +498,7 @@ class DictationTab(BaseTab):
         
         # Habilita o botão de play se houver palavras disponíveis, mesmo que current_word_text seja None
         # Isso permite iniciar a primeira palavra após carregar o arquivo.
-        can_play_new_word = bool(self.word_manager.words_data and [w for w in self.word_manager.words_data if not w['mastered']])
+        can_play_new_word = self.word_manager.has_active_words()
         self.play_button.setEnabled(can_play_new_word or has_word)
 
 
@@ -467,10 +515,10 @@ class DictationTab(BaseTab):
         if not self.current_word_text:
             return
 
-        typed_word = self.input_field.text().strip().lower()
+        typed_word = self.input_field.text().strip().casefold()
 
         if self.force_correct_typing_mode:
-            if typed_word == self.word_to_force_type.lower():
+            if typed_word == self.current_word_key: # word_to_force_type é a própria palavra atual
                 self.show_feedback("Correct! You typed the word.")
                 self.speak_system_feedback(f"Good. The word was {self.word_to_force_type}.") # Usa velocidade normal
                 self.force_correct_typing_mode = False
@@ -483,18 +531,14 @@ class DictationTab(BaseTab):
             return # Fim do processamento para este modo
 
         # Esta é a lógica de verificação de resposta, movida da duplicata de play_current_word_audio
-        correct_word_lower = self.current_word_text.lower()
-
-        if typed_word == correct_word_lower:
+        if typed_word == self.current_word_key:
             self.show_feedback("Correct!!!")
             # self.trophy_label.setText(get_trophy_ascii()) # Substituído pela janela de imagem
-            self.gif_popup = GifPopupWindow(image_directory="img/", parent=self.main_window_ref)
-            self.gif_popup.move(self.main_window_ref.geometry().center() - self.gif_popup.rect().center())
-            self.gif_popup.show()
+            self.gif_popup = self.show_gif_popup(GIF_DIR_SUCCESS)
             self.speak_system_feedback("Congratulations! You got the word right!") # Usa velocidade normal
-            self.word_manager.record_attempt(True)
+            newly_mastered = self.word_manager.record_attempt(True)
             self.main_window_ref.update_student_level() # Informa acerto para atualizar nível
-            if self.word_manager.current_word_obj and self.word_manager.current_word_obj["mastered"]:
+            if newly_mastered: # Só anuncia na primeira vez (no modo espaçado a palavra masterizada volta)
                  self.show_feedback(f"Word '{self.current_word_text}' MASTERED!")
                  self.speak_system_feedback(f"You have mastered the word {self.current_word_text}!") # Usa velocidade normal
             # Prepara para a próxima palavra, mas não a carrega/fala automaticamente aqui.
@@ -517,9 +561,7 @@ class DictationTab(BaseTab):
                     self.word_manager.record_attempt(False)
                     self.main_window_ref.update_student_level(correct_streak_ended=True) # Informa erro para resetar nível
                     
-                    self.error_gif_popup = GifPopupWindow(image_directory="img/errors/", parent=self.main_window_ref)
-                    self.error_gif_popup.move(self.main_window_ref.geometry().center() - self.error_gif_popup.rect().center())
-                    self.error_gif_popup.show()
+                    self.error_gif_popup = self.show_gif_popup(GIF_DIR_ERRORS)
                     
                     self.force_correct_typing_mode = True
                     self.word_to_force_type = self.current_word_text
@@ -624,11 +666,13 @@ class SpellingTab(BaseTab):
         self.feedback_label.setStyleSheet("color: red;" if error else "color: green;")
 
     def load_new_word(self): # Similar à DictationTab, mas chama play_current_word_spelling
+        self.cancel_word_audio()
         self.current_word_text = None
         # self.trophy_label.setText("") # Não é mais necessário
         word_obj = self.word_manager.get_next_word() # Usa o mesmo método por enquanto
         if word_obj:
             self.current_word_text = word_obj["text"]
+            self.current_word_key = word_obj["key"]
             self.current_normal_attempts_left = self.max_normal_attempts # Usa as variáveis da BaseTab
             # Define o feedback inicial para uma nova palavra
             self.show_feedback(f"Listen to the spelling. Attempts left: {self.current_normal_attempts_left}")
@@ -652,7 +696,7 @@ class SpellingTab(BaseTab):
         if has_word:
             self.input_field.setFocus()
         
-        can_play_new_word = bool(self.word_manager.words_data and [w for w in self.word_manager.words_data if not w['mastered']])
+        can_play_new_word = self.word_manager.has_active_words()
         self.play_spell_button.setEnabled(can_play_new_word or has_word)
 
             
@@ -670,19 +714,15 @@ class SpellingTab(BaseTab):
             return
 
         # Esta é a lógica de verificação de resposta, movida da duplicata de play_current_word_spelling
-        typed_word = self.input_field.text().strip().lower()
-        correct_word_lower = self.current_word_text.lower()
-
-        if typed_word == correct_word_lower:
+        typed_word = self.input_field.text().strip().casefold()
+        if typed_word == self.current_word_key:
             self.show_feedback("Correct!!!")
             # self.trophy_label.setText(get_trophy_ascii()) # Substituído pela janela de imagem
-            self.gif_popup = GifPopupWindow(image_directory="img/", parent=self.main_window_ref)
-            self.gif_popup.move(self.main_window_ref.geometry().center() - self.gif_popup.rect().center())
-            self.gif_popup.show()
+            self.gif_popup = self.show_gif_popup(GIF_DIR_SUCCESS)
             self.speak_system_feedback("Well done! That's the correct spelling!") # Usa velocidade normal
-            self.word_manager.record_attempt(True) # Assume mesma lógica de acerto
+            newly_mastered = self.word_manager.record_attempt(True) # Assume mesma lógica de acerto
             self.main_window_ref.update_student_level() # Informa acerto para atualizar nível
-            if self.word_manager.current_word_obj and self.word_manager.current_word_obj["mastered"]:
+            if newly_mastered: # Só anuncia na primeira vez (no modo espaçado a palavra masterizada volta)
                  self.show_feedback(f"Word '{self.current_word_text}' MASTERED!")
                  self.speak_system_feedback(f"You have mastered the spelling of {self.current_word_text}!") # Usa velocidade normal
             self.current_word_text = None # Sinaliza que a palavra atual foi concluída
@@ -698,9 +738,7 @@ class SpellingTab(BaseTab):
                 self.speak_system_feedback("That was not correct. Keep practicing your spelling!") # Usa velocidade normal
                 
                 # Mostra GIF de erro também na aba de soletrar se esgotar tentativas
-                self.error_gif_popup = GifPopupWindow(image_directory="img/errors/", parent=self.main_window_ref)
-                self.error_gif_popup.move(self.main_window_ref.geometry().center() - self.error_gif_popup.rect().center())
-                self.error_gif_popup.show()
+                self.error_gif_popup = self.show_gif_popup(GIF_DIR_ERRORS)
                 
                 self.word_manager.record_attempt(False) 
                 self.main_window_ref.update_student_level(correct_streak_ended=True) # Informa erro para resetar nível
@@ -795,6 +833,9 @@ class AboutTab(QWidget):
 
 # --- Janela Principal ---
 class MainWindow(QMainWindow):
+    _word_file_load_requested = pyqtSignal(str, object) # Entregue ao WordFileLoadWorker, no thread de leitura
+    _word_file_reload_requested = pyqtSignal(str, object)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("listenANDwrite2memorize - English Practice")
@@ -804,15 +845,32 @@ class MainWindow(QMainWindow):
         # TODO: Permitir configuração dos caminhos do Piper via GUI ou arquivo de config
         self.piper_worker = PiperTTSWorker(CAMINHO_EXECUTAVEL_PIPER_DEFAULT) # model_onnx não é mais passado aqui
         self.word_manager = WordManager()
+        self.gif_cache = GifAssetCache()
+        # Listas de palavras são lidas em um QThread próprio (ver import_word_file_dialog)
+        self.word_file_thread = QThread()
+        self.word_file_worker = WordFileLoadWorker()
+        self.word_file_worker.moveToThread(self.word_file_thread)
+        self._word_file_load_requested.connect(self.word_file_worker.load)
+        self.word_file_worker.progress.connect(self._on_word_file_progress)
+        self.word_file_worker.loaded.connect(self._on_word_file_loaded)
+        self._word_file_reload_requested.connect(self.word_file_worker.reload)
+        self.word_file_worker.reloaded.connect(self._on_word_file_reloaded)
+        self.word_file_thread.start()
+        self.word_file_progress_dialog = None # Aberto enquanto uma lista está sendo lida
+        # Listas abertas editadas no disco são relidas sozinhas (ver _check_word_files)
+        self.word_file_stats = {} # caminho -> (mtime, tamanho) da versão carregada
+        self._word_file_seen_stats = {} # caminho -> (mtime, tamanho) da última verificação
+        self._word_file_reloading = False
+        self.word_file_watch_timer = QTimer(self)
+        self.word_file_watch_timer.setInterval(WORD_FILE_POLL_INTERVAL_MS_DEFAULT)
+        self.word_file_watch_timer.timeout.connect(self._check_word_files)
+        self.word_file_watch_timer.start()
+        # Um popup reaproveitável por tipo de animação, criados uma única vez
+        self.gif_popups = {directory: GifPopupWindow(parent=self, fallback_text=f"No GIFs in\n{directory}")
+                           for directory in (GIF_DIR_SUCCESS, GIF_DIR_ERRORS)}
         
-        # Configurar o thread para o PiperTTSWorker
-        self.tts_thread = QThread(self) # Passar 'self' como pai para gerenciamento
-        self.piper_worker.moveToThread(self.tts_thread)
-
-        # Conexões para o ciclo de vida do thread
-        self.tts_thread.finished.connect(self.piper_worker.deleteLater) # Limpar o worker quando o thread terminar
-        # self.tts_thread.started.connect(self.piper_worker.algum_metodo_de_inicializacao_no_thread) # Se necessário
-        self.tts_thread.start()
+        # O piper_worker gerencia os threads de síntese e de reprodução
+        self.piper_worker.start()
 
         # --- Gerenciamento de Nível do Aluno ---
         # Este bloco DEVE vir ANTES da chamada a self._create_widgets()
@@ -820,22 +878,36 @@ class MainWindow(QMainWindow):
         self.student_levels = {0: "Noob", 2: "Pro", 4: "Hacker", 8: "God"} # Nomes dos níveis atualizados
         self.student_level_colors = {"Noob": "grey", "Pro": "green", "Hacker": "GoldenRod", "God": "orange"} # Cores atualizadas (Hacker agora é GoldenRod)
         self.current_student_level_name = "Noob" # Nível inicial atualizado
+        self._level_thresholds_desc = sorted(self.student_levels.items(), reverse=True) # Maior limite primeiro
+        # Folhas de estilo de cada nível, montadas uma única vez: nome -> (estilo do label, estilo das abas)
+        self.level_style_sheets = {name: self._build_level_style_sheets(color) for name, color in self.student_level_colors.items()}
+        self._styled_level_name = None # Nível cujo estilo está aplicado nos widgets
         
-        self.voice_models = {
-            "Random": "random_voice", 
-            "Woman (US)": CAMINHO_MODELO_VOZ_ONNX_DEFAULT,
-            "Man (GB)": "./piper_voices/en_GB-alan-medium.onnx"
-        }
-        self.current_selected_voice_name = "Woman (US)" 
+        # Vozes descobertas em piper_voices/ (ver VoiceRegistry)
+        self.voice_registry = VoiceRegistry(DIRETORIO_VOZES_PIPER_DEFAULT)
+        self.voice_models = {"Random": "random_voice"}
+        for voice_name, voice_info in self.voice_registry.voices().items():
+            self.voice_models[voice_name] = voice_info["model_path"]
+        self.current_selected_voice_name = (
+            self.voice_registry.find_by_model_path(CAMINHO_MODELO_VOZ_ONNX_DEFAULT)
+            or next((name for name in self.voice_models if name != "Random"), "Random")
+        )
 
         self.speed_options = { # Renomeado de speed_map para clareza
             "Random": "random_speed", 
             "Very Slow": 1.6, "Slow": 1.3, "Normal": 1.0, "Fast": 0.7
         }
         self.current_selected_speed_name = "Normal" # Nome da velocidade selecionada
+        self.word_order_options = {"Random": SELECTION_MODE_UNIFORM, "Focus on Mistakes": SELECTION_MODE_WEIGHTED,
+                                   "Spaced Review": SELECTION_MODE_SPACED}
         
-        self.current_word_file_path = None # Para rastrear o arquivo de palavras carregado
-        self.WORDLISTS_DIR_NAME = "wordlists" # Nome do diretório para listas de palavras e progresso
+        self.current_word_file_path = None # Para rastrear o arquivo de palavras carregado (a primeira lista da sessão)
+        self.session = WordListSession() # Listas abertas juntas (ver add_word_file_dialog)
+        # Progresso de cada lista da sessão: caminho -> ProgressJournal ou SQLiteProgressStore (ver _open_progress_store)
+        self.progress_stores = {}
+        self.list_actions = {} # caminho -> ação do menu Lists
+        self.word_manager.on_attempt_recorded = self._store_attempt
+        self.WORDLISTS_DIR_NAME = WORDLISTS_DIR_NAME # Nome do diretório para listas de palavras e progresso
         os.makedirs(self.WORDLISTS_DIR_NAME, exist_ok=True) # Cria o diretório se não existir
 
         # --- Fim do Gerenciamento de Nível ---
@@ -845,6 +917,9 @@ class MainWindow(QMainWindow):
         self._create_toolbar() # Para controle de velocidade
 
         self.show()
+        # Deixa a primeira animação de cada tipo pronta assim que a janela estiver ociosa
+        QTimer.singleShot(0, lambda: self.gif_cache.prefetch_next(GIF_DIR_SUCCESS))
+        QTimer.singleShot(0, lambda: self.gif_cache.prefetch_next(GIF_DIR_ERRORS))
 
     def _create_widgets(self):
         self.tab_widget = QTabWidget()
@@ -856,8 +931,7 @@ class MainWindow(QMainWindow):
         font = QFont("Arial", 24, QFont.Weight.Bold)
         self.level_display_label.setFont(font)
         self.level_display_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.level_display_label.setStyleSheet(f"color: {self.student_level_colors[self.current_student_level_name]}; padding: 10px;")
-        self._apply_level_style_to_tabs() # Aplica o estilo inicial às abas
+        self._apply_level_style() # Aplica o estilo inicial ao label e às abas
         main_layout.addWidget(self.level_display_label)
         
         main_layout.addWidget(self.tab_widget)
@@ -880,21 +954,39 @@ class MainWindow(QMainWindow):
         menu_bar = self.menuBar()
         file_menu = menu_bar.addMenu("&File")
 
-        import_action = QAction("&Import Word File...", self)
-        import_action.triggered.connect(self.import_word_file_dialog)
-        file_menu.addAction(import_action)
+        self.import_action = QAction("&Import Word File...", self)
+        self.import_action.triggered.connect(self.import_word_file_dialog)
+        file_menu.addAction(self.import_action)
+
+        self.add_word_file_action = QAction("&Add Word File to Session...", self)
+        self.add_word_file_action.triggered.connect(self.add_word_file_dialog)
+        self.add_word_file_action.setEnabled(False) # Habilitar após carregar um arquivo
+        file_menu.addAction(self.add_word_file_action)
 
         self.reset_progress_action = QAction("&Reset Progress for Current File", self)
         self.reset_progress_action.triggered.connect(self.reset_current_progress_dialog)
         self.reset_progress_action.setEnabled(False) # Habilitar após carregar um arquivo
         file_menu.addAction(self.reset_progress_action)
 
+        self.export_progress_action = QAction("&Export Progress as JSON...", self)
+        self.export_progress_action.triggered.connect(self.export_progress_dialog)
+        self.export_progress_action.setEnabled(False) # Habilitar após carregar um arquivo
+        file_menu.addAction(self.export_progress_action)
+
+        cross_list_stats_action = QAction("&Statistics Across Lists...", self)
+        cross_list_stats_action.triggered.connect(self.show_cross_list_stats)
+        cross_list_stats_action.setEnabled(PROGRESS_BACKEND_DEFAULT == "sqlite") # Só o banco guarda todas as listas juntas
+        file_menu.addAction(cross_list_stats_action)
         
         file_menu.addSeparator()
 
         exit_action = QAction("E&xit", self)
         exit_action.triggered.connect(self.close) # Chama o closeEvent
         file_menu.addAction(exit_action)
+
+        # Uma ação marcável por lista da sessão (ver _rebuild_lists_menu)
+        self.lists_menu = menu_bar.addMenu("&Lists")
+        self.lists_menu.setEnabled(False)
         
         # TODO: Menu de Configurações (para caminhos do Piper, etc.)
 
@@ -916,6 +1008,13 @@ class MainWindow(QMainWindow):
         self.voice_combo.currentTextChanged.connect(self.on_voice_changed)
         toolbar.addWidget(self.voice_combo)
 
+        toolbar.addSeparator()
+        toolbar.addWidget(QLabel(" Word Order: "))
+        self.word_order_combo = QComboBox()
+        self.word_order_combo.addItems(list(self.word_order_options.keys()))
+        self.word_order_combo.currentTextChanged.connect(self.on_word_order_changed)
+        toolbar.addWidget(self.word_order_combo)
+
     def get_current_speed_scale(self):
         if self.current_selected_speed_name == "Random":
             # Pega todas as escalas de velocidade reais, excluindo a opção "Random"
@@ -934,6 +1033,10 @@ class MainWindow(QMainWindow):
         # Não alteramos mais piper_worker.model_onnx diretamente aqui
         # A obtenção do modelo efetivo será feita em get_effective_voice_model_path
 
+    def on_word_order_changed(self, order_name):
+        self.word_manager.set_selection_mode(self.word_order_options[order_name])
+        print(f"Word order changed to: {order_name}")
+
     def get_effective_voice_model_path(self):
         if self.current_selected_voice_name == "Random":
             # Pega todos os caminhos de modelo reais, excluindo a opção "Random"
@@ -954,10 +1057,12 @@ class MainWindow(QMainWindow):
             self.consecutive_correct_answers = 0
         else:
             self.consecutive_correct_answers += 1
+        for store in self.progress_stores.values():
+            store.append_streak(self.consecutive_correct_answers)
 
         new_level_name = "Noob" # Padrão atualizado
-        # Itera sobre os níveis em ordem decrescente de acertos necessários
-        for threshold, name in sorted(self.student_levels.items(), reverse=True):
+        # Percorre os níveis em ordem decrescente de acertos necessários
+        for threshold, name in self._level_thresholds_desc:
             if self.consecutive_correct_answers >= threshold:
                 new_level_name = name
                 break
@@ -967,13 +1072,24 @@ class MainWindow(QMainWindow):
             print(f"NEW LEVEL: {new_level_name}!") # Log new level before updating current
             self.current_student_level_name = new_level_name # Atualiza após a verificação para a mensagem de "NOVO NÍVEL"
 
+        self._apply_level_style()
+
+    def _apply_level_style(self):
+        """Troca o texto e as folhas de estilo do nível; não faz nada se o nível não mudou.
+
+        setStyleSheet faz o Qt repolir toda a árvore de abas, então só é chamado numa troca de nível real.
+        """
+        if self._styled_level_name == self.current_student_level_name:
+            return
+        self._styled_level_name = self.current_student_level_name
+        label_style_sheet, tab_style_sheet = self.level_style_sheets[self.current_student_level_name]
         self.level_display_label.setText(f"Level: {self.current_student_level_name}")
-        self.level_display_label.setStyleSheet(f"color: {self.student_level_colors[self.current_student_level_name]}; padding: 10px; font-size: 24pt; font-weight: bold;")
-        self._apply_level_style_to_tabs()
+        self.level_display_label.setStyleSheet(label_style_sheet)
+        self.tab_widget.setStyleSheet(tab_style_sheet)
 
-    def _apply_level_style_to_tabs(self):
-        level_color = self.student_level_colors.get(self.current_student_level_name, "grey") # Cor padrão
-        
+    @staticmethod
+    def _build_level_style_sheets(level_color):
+        """Retorna (estilo do label de nível, estilo das abas) para a cor de um nível."""
         # Define a cor do texto da aba selecionada para contraste
         # Se a cor do nível for clara (como amarelo), texto escuro. Se for escura, texto claro.
         # Esta é uma heurística simples, pode precisar de ajuste.
@@ -981,6 +1097,7 @@ class MainWindow(QMainWindow):
         if level_color == "grey": # Cinza pode ser médio
             selected_tab_text_color = "black"
 
+        label_style_sheet = f"color: {level_color}; padding: 10px; font-size: 24pt; font-weight: bold;"
         tab_style_sheet = f"""
             QTabWidget::pane {{
                 border: 3px solid {level_color};
@@ -1004,42 +1121,193 @@ class MainWindow(QMainWindow):
                 min-width: 100px; /* Largura mínima para cada aba */
             }}
         """
-        self.tab_widget.setStyleSheet(tab_style_sheet)
+        return label_style_sheet, tab_style_sheet
 
     def import_word_file_dialog(self):
         file_path, _ = QFileDialog.getOpenFileName(
             self, "Open Word File", self.WORDLISTS_DIR_NAME, "Text Files (*.txt);;All Files (*)"
         )
         if file_path:
-            success, message = self.word_manager.load_words_from_file(file_path)
-            if success:
-                self.current_word_file_path = file_path # Armazena o caminho do arquivo carregado
-                QMessageBox.information(self, "Success", message)
-                self.reset_progress_action.setEnabled(True) # Habilita a opção de resetar
-
-                # Verificar e carregar progresso
-                self._handle_progress_loading()
-                
-                # Atualizar UI das abas
-                self._refresh_tabs_after_load()
-            else:
-                QMessageBox.critical(self, "Error", message)
-                self.current_word_file_path = None
-                self.reset_progress_action.setEnabled(False)
+            self._request_word_file(file_path, None, "Import Word File")
+
+    def add_word_file_dialog(self):
+        """Abre mais uma lista na sessão atual: palavras repetidas entre as listas viram uma só, com o mesmo progresso."""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Add Word File to Session", self.WORDLISTS_DIR_NAME, "Text Files (*.txt);;All Files (*)"
+        )
+        if not file_path:
+            return
+        if file_path in self.session.members:
+            QMessageBox.information(self, "Add Word File", f"{os.path.basename(file_path)} is already open.")
+            return
+        self._request_word_file(file_path, (self.session, self.word_manager.words_data.copy()), "Add Word File")
+
+    def _request_word_file(self, file_path, base, title):
+        # A leitura acontece no WordFileLoadWorker; a lista atual continua valendo até _on_word_file_loaded
+        self.import_action.setEnabled(False)
+        self.add_word_file_action.setEnabled(False)
+        self.word_file_progress_dialog = QProgressDialog(f"Loading {os.path.basename(file_path)}...", None, 0, 100, self)
+        self.word_file_progress_dialog.setWindowTitle(title)
+        self.word_file_progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        self.word_file_progress_dialog.setMinimumDuration(300) # Listas pequenas não chegam a mostrar o diálogo
+        self.word_file_progress_dialog.setValue(0)
+        self._requested_word_file_stat = self._word_file_stat(file_path) # Antes da leitura: edições durante ela são vistas depois
+        self._word_file_load_requested.emit(file_path, base)
+
+    def _on_word_file_progress(self, percent):
+        if self.word_file_progress_dialog:
+            self.word_file_progress_dialog.setValue(percent)
+
+    def _on_word_file_loaded(self, file_path, added, loaded, error_message):
+        if self.word_file_progress_dialog:
+            self.word_file_progress_dialog.close()
+            self.word_file_progress_dialog = None
+        self.import_action.setEnabled(True)
+        self.add_word_file_action.setEnabled(bool(self.session.names))
+        if added:
+            if loaded is None:
+                QMessageBox.critical(self, "Error", error_message) # A sessão atual continua como estava
+                return
+            self._add_loaded_word_file(file_path, *loaded)
+            return
+        self._close_progress_stores() # O progresso das listas anteriores já foi gravado resposta a resposta
+        if loaded is not None:
+            self.session, prepared_words = loaded
+            self.word_file_stats = {file_path: self._requested_word_file_stat}
+            message = self.word_manager.use_prepared_words(prepared_words)
+            self.current_word_file_path = file_path # Armazena o caminho do arquivo carregado
+            QMessageBox.information(self, "Success", message)
+            self.reset_progress_action.setEnabled(True) # Habilita a opção de resetar
+            self.export_progress_action.setEnabled(True)
+            self.add_word_file_action.setEnabled(True)
+            self._rebuild_lists_menu()
+
+            # Verificar e carregar progresso
+            self._handle_progress_loading(file_path)
+            
+            # Atualizar UI das abas
+            self._refresh_tabs_after_load()
+        else:
+            self.word_manager.set_words(())
+            QMessageBox.critical(self, "Error", error_message)
+            self.current_word_file_path = None
+            self.session = WordListSession()
+            self.word_file_stats = {}
+            self._rebuild_lists_menu()
+            self.reset_progress_action.setEnabled(False)
+            self.export_progress_action.setEnabled(False)
+            self.add_word_file_action.setEnabled(False)
+
+    def _add_loaded_word_file(self, file_path, session, prepared_words):
+        previous_size = len(self.word_manager.words_data)
+        self.session = session
+        self.word_file_stats[file_path] = self._requested_word_file_stat
+        self.word_manager.use_extended_words(prepared_words)
+        new_words = len(session.texts) - previous_size
+        QMessageBox.information(self, "Success", f"{os.path.basename(file_path)}: {new_words} new word(s) added to the session, "
+                                                 f"{len(session.list_texts[file_path]) - new_words} already in it.")
+        self._rebuild_lists_menu()
+        self._handle_progress_loading(file_path)
+        self._refresh_tabs_after_load()
+
+    @staticmethod
+    def _word_file_stat(file_path):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _check_word_files(self):
+        """Relê uma lista aberta cujo mtime ou tamanho mudou e ficou igual por uma verificação (gravação terminada)."""
+        if self._word_file_reloading or self.word_file_progress_dialog is not None:
+            return # Uma leitura de cada vez: a próxima verificação tenta de novo
+        for path in self.session.names:
+            stat = self._word_file_stat(path)
+            previous, self._word_file_seen_stats[path] = self._word_file_seen_stats.get(path), stat
+            if stat is None or stat == self.word_file_stats.get(path) or stat != previous:
+                continue
+            self.word_file_stats[path] = stat
+            self._word_file_reloading = True
+            self.import_action.setEnabled(False) # A sessão não pode mudar enquanto a lista é relida
+            self.add_word_file_action.setEnabled(False)
+            self._word_file_reload_requested.emit(path, self.session)
+            return
+
+    def _on_word_file_reloaded(self, file_path, reloaded, error_message):
+        self._word_file_reloading = False
+        self.import_action.setEnabled(True)
+        self.add_word_file_action.setEnabled(bool(self.session.names))
+        if reloaded is None:
+            print(f"Warning: Could not reload '{file_path}': {error_message}")
+            return
+        base_session, session, changed_indexes = reloaded
+        if base_session is not self.session:
+            return # A sessão foi trocada enquanto a lista era relida
+        self.session = session
+        selected = [path for path, action in self.list_actions.items() if action.isChecked()]
+        # Só as palavras que entraram ou saíram da lista mudam nos índices do sorteio; o progresso é mantido
+        self.word_manager.update_words(session.texts, session.subset(selected), changed_indexes)
+        self._reopen_progress_store(file_path)
+        removed = sum(1 for index in changed_indexes if not session.contains(file_path, index))
+        message = (f"{os.path.basename(file_path)} changed on disk: {len(changed_indexes) - removed} word(s) added, "
+                   f"{removed} removed (progress kept).")
+        print(message)
+        self.dictation_tab.update_stats_summary()
+        self.spelling_tab.update_stats_summary()
+        self.statusBar().showMessage(message, 5000)
+
+    def _reopen_progress_store(self, word_file_path):
+        """Reabre o progresso de uma lista relida, para os snapshots seguirem o conteúdo novo dela."""
+        store = self.progress_stores.get(word_file_path)
+        if store is None:
+            return
+        store.close()
+        print(f"Progress for {os.path.basename(word_file_path)} kept in: {store.saved_location()}")
+        self._open_progress_store(word_file_path) # O diário anterior é incluído na próxima compactação
+
+    def _rebuild_lists_menu(self):
+        """Uma ação marcada por lista da sessão; desmarcar tira as palavras só daquela lista do sorteio."""
+        self.lists_menu.clear()
+        self.list_actions = {}
+        for path in self.session.names:
+            action = QAction(os.path.basename(path), self)
+            action.setCheckable(True)
+            action.setChecked(True)
+            action.toggled.connect(self._on_list_selection_changed)
+            self.lists_menu.addAction(action)
+            self.list_actions[path] = action
+        self.lists_menu.setEnabled(len(self.session) > 1)
+
+    def _on_list_selection_changed(self, checked):
+        selected = [path for path, action in self.list_actions.items() if action.isChecked()]
+        if not selected: # Pelo menos uma lista fica selecionada
+            action = self.sender()
+            action.blockSignals(True)
+            action.setChecked(True)
+            action.blockSignals(False)
+            return
+        self.word_manager.set_subset(self.session.subset(selected)) # OU dos bitsets das listas, sem reler nada
+        self._refresh_tabs_after_load("Lists selected.")
 
     def _get_progress_file_path(self, word_file_path):
         if not word_file_path:
             return None
         # Cria o nome do arquivo de progresso oculto dentro do diretório wordlists
-        base_filename = os.path.basename(word_file_path)
-        progress_filename = f".{base_filename}.progress.json"
-        return os.path.join(self.WORDLISTS_DIR_NAME, progress_filename)
+        return progress_file_path(word_file_path, self.WORDLISTS_DIR_NAME)
+
+    def _handle_progress_loading(self, word_file_path):
+        """Abre o progresso de word_file_path e pergunta se deve ser carregado.
 
-    def _handle_progress_loading(self):
-        progress_file = self._get_progress_file_path(self.current_word_file_path)
+        Numa lista acrescentada à sessão, o progresso é mesclado ao da sessão (ver WordManager.merge_progress_data)
+        e a sequência de acertos continua a mesma.
+        """
+        store = self._open_progress_store(word_file_path)
+        merging = word_file_path != self.session.names[0]
         load_new = True # Por padrão, começa do zero
+        has_saved_progress = bool(store and store.exists())
 
-        if progress_file and os.path.exists(progress_file):
+        if has_saved_progress:
             reply = QMessageBox.question(self, "Load Progress",
                                          "Previous progress found for this word file.\n"
                                          "Do you want to continue where you left off?",
@@ -1047,13 +1315,20 @@ class MainWindow(QMainWindow):
                                          QMessageBox.StandardButton.Yes)
             if reply == QMessageBox.StandardButton.Yes:
                 try:
-                    with open(progress_file, 'r', encoding='utf-8') as f:
-                        saved_state = json.load(f)
+                    saved_state = store.load()
                     
-                    self.word_manager.load_progress_data(saved_state.get("words_data", []))
-                    self.consecutive_correct_answers = saved_state.get("consecutive_correct_answers", 0)
-                    # O nível será atualizado por update_student_level
-                    self.update_student_level() # Update based on loaded correct answers
+                    word_store = saved_state.get("word_store")
+                    if merging:
+                        self.word_manager.merge_progress_data(word_store.to_progress_data() if word_store is not None
+                                                              else saved_state.get("words_data", []))
+                    elif word_store is not None: # Snapshot binário da mesma lista: colunas prontas
+                        self.word_manager.load_progress_store(word_store)
+                    else:
+                        self.word_manager.load_progress_data(saved_state.get("words_data", []))
+                    if not merging:
+                        self.consecutive_correct_answers = saved_state.get("consecutive_correct_answers", 0)
+                        # O nível será atualizado por update_student_level
+                        self.update_student_level() # Update based on loaded correct answers
                     QMessageBox.information(self, "Progress Loaded", "Your previous progress has been loaded.")
                     load_new = False
                 except Exception as e:
@@ -1061,42 +1336,57 @@ class MainWindow(QMainWindow):
                                         f"Could not load progress: {e}\nStarting from scratch.")
         
         if load_new: # Se não carregou progresso ou usuário escolheu não carregar
-            self.update_student_level(correct_streak_ended=True) # Reseta o nível
+            if has_saved_progress:
+                store.reset() # O progresso antigo seria sobrescrito pelo novo
+            if not merging:
+                self.update_student_level(correct_streak_ended=True) # Reseta o nível
 
-    def _refresh_tabs_after_load(self):
-        """Atualiza a UI das abas após carregar um arquivo (com ou sem progresso)."""
+    def _open_progress_store(self, word_file_path):
+        """Passa a gravar as respostas no armazenamento de progresso de word_file_path (ver PROGRESS_BACKEND_DEFAULT) e o retorna."""
+        if not word_file_path:
+            return None
+        if PROGRESS_BACKEND_DEFAULT == "sqlite":
+            store = SQLiteProgressStore(PROGRESS_DB_FILE_DEFAULT, os.path.basename(word_file_path), PROFILE_NAME_DEFAULT)
+        else:
+            store = ProgressJournal(self._get_progress_file_path(word_file_path), self.session.list_texts[word_file_path])
+        self.progress_stores[word_file_path] = store
+        return store
+
+    def _close_progress_stores(self):
+        for store in self.progress_stores.values():
+            store.close()
+        self.progress_stores = {}
+
+    def _store_attempt(self, word_index, correct_attempt):
+        """Grava a resposta no progresso de cada lista da sessão que tem a palavra."""
+        record = self.word_manager.words_data.to_dict(word_index)
+        for path, store in self.progress_stores.items():
+            if not self.session.contains(path, word_index):
+                continue
+            text = self.session.text_in(path, word_index) # Como está escrita nesta lista
+            # O índice da sessão é só um palpite da posição na lista: o diário confere o texto antes de usá-lo
+            store.append_word(record if text == record["text"] else dict(record, text=text), correct_attempt, word_index)
+
+    def _refresh_tabs_after_load(self, status="File loaded."):
+        """Atualiza a UI das abas após carregar um arquivo (com ou sem progresso) ou trocar as listas selecionadas."""
         self.dictation_tab.current_word_text = None
         self.dictation_tab.update_ui_for_new_word()
         self.dictation_tab.update_stats_summary()
-        self.dictation_tab.show_feedback("File loaded. Click '▶️ Speak Word' to begin.")
+        self.dictation_tab.show_feedback(f"{status} Click '▶️ Speak Word' to begin.")
 
         self.spelling_tab.current_word_text = None
         self.spelling_tab.update_ui_for_new_word()
         self.spelling_tab.update_stats_summary()
-        self.spelling_tab.show_feedback("File loaded. Click '▶️ Spell Word' to begin.")
+        self.spelling_tab.show_feedback(f"{status} Click '▶️ Spell Word' to begin.")
 
     def save_current_progress(self):
-        if not self.current_word_file_path or not self.word_manager.words_data:
+        """Cada resposta já foi enviada ao armazenamento; aqui só é preciso gravar o que ainda estiver na fila."""
+        if not self.progress_stores:
             return # Nada para salvar
-
-        progress_file = self._get_progress_file_path(self.current_word_file_path)
-        if not progress_file: return
-
-        # Garante que o diretório wordlists existe antes de salvar
-        os.makedirs(os.path.dirname(progress_file), exist_ok=True)
-
-        data_to_save = {
-            "words_data": self.word_manager.get_progress_data_to_save(),
-            "consecutive_correct_answers": self.consecutive_correct_answers,
-            # "current_student_level_name": self.current_student_level_name # O nível é derivado
-        }
-        try:
-            with open(progress_file, 'w', encoding='utf-8') as f:
-                json.dump(data_to_save, f, indent=4)
-            print(f"Progress saved to: {progress_file}")
-        except Exception as e:
-            print(f"Error saving progress: {e}")
-            QMessageBox.warning(self, "Error Saving", f"Could not save progress: {e}")
+        stores = list(self.progress_stores.values())
+        self._close_progress_stores()
+        for store in stores: # Depois de fechar: o que estava na fila já foi gravado
+            print(f"Progress saved to: {store.saved_location()}")
 
 
     def closeEvent(self, event):
@@ -1109,36 +1399,60 @@ class MainWindow(QMainWindow):
 
         if reply == QMessageBox.StandardButton.Yes:
             self.save_current_progress() # Salva o progresso antes de sair
-            # Parar o thread do TTS
-            if self.tts_thread.isRunning():
-                self.tts_thread.quit()
-                self.tts_thread.wait(5000) # Espera até 5 segundos pelo thread terminar
+            # Parar os threads do TTS
+            self.piper_worker.shutdown(5000) # Espera até 5 segundos por cada thread
+            self.gif_cache.shutdown()
+            self.word_file_thread.quit()
+            self.word_file_thread.wait(2000)
             event.accept()
         else:
             event.ignore()
     
+    def export_progress_dialog(self):
+        if not self.current_word_file_path:
+            return
+        default_name = os.path.join(self.WORDLISTS_DIR_NAME, f"{os.path.basename(self.current_word_file_path)}.progress.json")
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Progress", default_name, "JSON Files (*.json);;All Files (*)")
+        if not file_path:
+            return
+        try:
+            save_progress(file_path, self.word_manager.get_progress_data_to_save(), self.consecutive_correct_answers,
+                          fingerprint=word_list_fingerprint(self.word_manager.words_data.texts))
+        except OSError as e:
+            QMessageBox.warning(self, "Export Progress", f"Could not export progress: {e}")
+            return
+        print(f"Progress exported to: {file_path}")
+
+    def show_cross_list_stats(self):
+        for store in self.progress_stores.values():
+            store.flush() # Inclui as respostas ainda na fila
+        try:
+            rows = cross_list_stats(PROGRESS_DB_FILE_DEFAULT, PROFILE_NAME_DEFAULT)
+        except Exception as e:
+            QMessageBox.warning(self, "Statistics Across Lists", f"Could not read the progress database: {e}")
+            return
+        lines = [f"- {name}: Presented {presented} | Mastered {mastered} | Correct {correct} | Incorrect {incorrect}"
+                 for name, presented, mastered, correct, incorrect in rows]
+        QMessageBox.information(self, "Statistics Across Lists",
+                                "\n".join(lines) if lines else "No progress saved yet.")
+
     def reset_current_progress_dialog(self):
         if not self.current_word_file_path or not self.word_manager.words_data:
             QMessageBox.information(self, "Reset Progress", "No word file loaded to reset.")
             return
 
         reply = QMessageBox.question(self, "Reset Progress",
-                                     "Are you sure you want to reset all progress for the current word file?\n"
+                                     "Are you sure you want to reset all progress for the open word file(s)?\n"
                                      "This will erase your correct answers, errors, and mastered words.",
                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
                                      QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
             self.word_manager.reset_all_word_stats()
+            for store in self.progress_stores.values():
+                store.reset() # Apagado em segundo plano, antes das próximas respostas
+                print(f"Progress removed: {store.location}")
             self.update_student_level(correct_streak_ended=True) # Reseta o nível do aluno
             
-            progress_file = self._get_progress_file_path(self.current_word_file_path)
-            if progress_file and os.path.exists(progress_file):
-                try:
-                    os.remove(progress_file)
-                    print(f"Progress file '{progress_file}' removed.")
-                except OSError as e:
-                    print(f"Could not remove progress file '{progress_file}': {e}")
-            
             self._refresh_tabs_after_load() # Atualiza a UI das abas
             QMessageBox.information(self, "Progress Reset", "The progress has been reset.")
 
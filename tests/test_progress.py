@@ -0,0 +1,219 @@
+"""Progresso em snapshot + diários (core.progress): gravação, releitura e recuperação depois de quedas."""
+import json
+import os
+import time
+
+import pytest
+
+from core import progress as progress_module
+from core.progress import (ProgressJournal, _merge_attempt, journal_file_path, load_progress, progress_file_path,
+                           snapshot_file_path)
+from core.snapshot import read_snapshot
+from core.wordfile import WordTexts
+
+WORDS = ["Apple", "pear", "plum"]
+
+
+@pytest.fixture
+def progress_file(tmp_path):
+    return progress_file_path("words.txt", str(tmp_path))
+
+
+def word_texts():
+    return WordTexts.from_words(WORDS, [word.casefold() for word in WORDS])
+
+
+def open_journal(progress_file, **kwargs):
+    kwargs.setdefault("idle_seconds", 3600) # Sem compactação automática durante o teste
+    return ProgressJournal(progress_file, word_texts(), **kwargs)
+
+
+def answer(journal, index, correct, counts):
+    """Registra uma resposta como o WordManager faria (o registro traz o estado da palavra depois dela)."""
+    correct_count, incorrect_count = counts.get(index, (0, 0))
+    counts[index] = (correct_count + correct, incorrect_count + (not correct))
+    record = {"text": WORDS[index], "correct": counts[index][0], "incorrect": counts[index][1],
+              "mastered": False, "presented": True}
+    journal.append_word(record, correct, index)
+
+
+def saved_counts(state):
+    store = state["word_store"]
+    if store is not None:
+        return {store.texts[i]: (store.correct[i], store.incorrect[i]) for i in range(len(store)) if store.is_touched(i)}
+    return {word["text"]: (word["correct"], word["incorrect"]) for word in state["words_data"]}
+
+
+def load(progress_file):
+    return load_progress(progress_file, word_texts())
+
+
+def test_torn_last_journal_line_is_skipped(progress_file, capsys):
+    journal = open_journal(progress_file)
+    counts = {}
+    answer(journal, 0, True, counts)
+    answer(journal, 1, False, counts)
+    journal.append_streak(4)
+    journal.close()
+    with open(journal.journal_file, 'a', encoding='utf-8') as f: # Queda no meio da gravação do próximo registro
+        f.write('{"word":{"text":"plum","corr')
+    state = load(progress_file)
+    assert saved_counts(state) == {"Apple": (1, 0), "pear": (0, 1)}
+    assert state["consecutive_correct_answers"] == 4
+    assert state["journals"] == {journal.instance: 3}
+    assert "Truncated record" in capsys.readouterr().out
+
+
+def test_torn_line_in_legacy_journal_keeps_earlier_records(progress_file):
+    records = [{"seq": 1, "word": {"text": "Apple", "correct": 1, "incorrect": 0, "mastered": False, "presented": True}},
+               {"seq": 2, "word": {"text": "Apple", "correct": 2, "incorrect": 0, "mastered": True, "presented": True}},
+               {"seq": 3, "streak": 2}]
+    with open(journal_file_path(progress_file), 'w', encoding='utf-8') as f:
+        f.writelines(json.dumps(record) + "\n" for record in records)
+        f.write('{"seq": 4, "word": {"text": "pe')
+    state = load(progress_file)
+    assert saved_counts(state) == {"Apple": (2, 0)} # Estado absoluto: vale o último registro completo
+    assert state["journal_seq"] == 3 and state["consecutive_correct_answers"] == 2
+
+
+
+def wait_for_journal(journal):
+    """Espera o thread do diário criar (e travar) o arquivo com o primeiro registro."""
+    deadline = time.monotonic() + 5
+    while not (os.path.exists(journal.journal_file) and os.path.getsize(journal.journal_file)):
+        assert time.monotonic() < deadline, "journal was not written"
+        time.sleep(0.01)
+
+
+def test_compaction_keeps_answers_from_an_instance_that_closes_during_it(progress_file, monkeypatch):
+    first, second = open_journal(progress_file), open_journal(progress_file)
+    first_counts, second_counts = {}, {}
+    answer(second, 0, True, second_counts)
+    wait_for_journal(second)
+    real_load_progress = progress_module.load_progress
+
+    def load_then_second_answers_and_closes(*args, **kwargs):
+        state = real_load_progress(*args, **kwargs)
+        # Depois da leitura da compactação: esta resposta não está no snapshot que vai ser gravado
+        answer(second, 0, True, second_counts)
+        second.close()
+        return state
+
+    monkeypatch.setattr(progress_module, "load_progress", load_then_second_answers_and_closes)
+    answer(first, 0, True, first_counts)
+    first.compact()
+    first.close()
+    monkeypatch.undo()
+    assert os.path.exists(second.journal_file) # Em uso quando a compactação começou: não pode ser apagado
+    assert saved_counts(load(progress_file)) == {"Apple": (3, 0)}
+
+
+def test_merge_attempt_adds_one_answer():
+    saved = {"text": "Apple", "correct": 4, "incorrect": 2, "mastered": False, "presented": True, "box": 1, "due": 10.0}
+    # O registro traz o estado da palavra na instância que respondeu (que não via as respostas da outra)
+    record = {"word": {"text": "Apple", "correct": 1, "incorrect": 0, "mastered": True, "presented": True,
+                       "box": 3, "due": 50.0}, "correct": True}
+    assert _merge_attempt(saved, record) == {"text": "Apple", "correct": 5, "incorrect": 2, "mastered": True,
+                                             "presented": True, "box": 3, "due": 50.0}
+    record = {"word": {"text": "pear", "correct": 0, "incorrect": 1, "mastered": False, "presented": True}, "correct": False}
+    assert _merge_attempt(None, record) == {"text": "pear", "correct": 0, "incorrect": 1, "mastered": False, "presented": True}
+
+
+def test_two_instances_answering_the_same_word_both_count(progress_file):
+    first, second = open_journal(progress_file), open_journal(progress_file)
+    first_counts, second_counts = {}, {} # Cada instância só conhece as próprias respostas
+    for correct in (True, True, False):
+        answer(first, 0, correct, first_counts)
+    for correct in (False, True):
+        answer(second, 0, correct, second_counts)
+    answer(second, 1, True, second_counts)
+    first.close()
+    second.close()
+    assert saved_counts(load(progress_file)) == {"Apple": (3, 2), "pear": (1, 0)}
+    third = open_journal(progress_file) # Compactar não muda as somas
+    answer(third, 2, False, {})
+    third.compact()
+    third.close()
+    assert saved_counts(load(progress_file)) == {"Apple": (3, 2), "pear": (1, 0), "plum": (0, 1)}
+    assert not os.path.exists(first.journal_file) and not os.path.exists(second.journal_file)
+
+
+def test_replay_skips_records_already_in_the_snapshot(progress_file):
+    journal = open_journal(progress_file)
+    counts = {}
+    answer(journal, 0, True, counts)
+    answer(journal, 1, False, counts)
+    wait_for_journal(journal)
+    journal.close()
+    with open(journal.journal_file, encoding='utf-8') as f:
+        written = f.read()
+    # Outra instância compacta: o snapshot passa a incluir os registros 1 e 2 deste diário
+    other = open_journal(progress_file)
+    answer(other, 2, True, {})
+    other.compact()
+    other.close()
+    assert read_snapshot(snapshot_file_path(progress_file)).journals[journal.instance] == 2
+    # Queda entre gravar o snapshot e apagar o diário: os registros voltam, mais um novo (seq 3)
+    extra = {"word": {"text": "Apple", "correct": 2, "incorrect": 0, "mastered": True, "presented": True},
+             "index": 0, "correct": True, "seq": 3, "time": time.time()}
+    with open(journal.journal_file, 'w', encoding='utf-8') as f:
+        f.write(written + json.dumps(extra) + "\n")
+    state = load(progress_file)
+    assert saved_counts(state) == {"Apple": (2, 0), "pear": (0, 1), "plum": (1, 0)} # Só o registro 3 é somado
+    assert state["journals"][journal.instance] == 3
+
+
+def test_compaction_folds_in_abandoned_journals(progress_file):
+    crashed = open_journal(progress_file)
+    answer(crashed, 1, True, {})
+    answer(crashed, 1, True, {})
+    crashed.append_streak(2)
+    crashed.close() # O diário fica com respostas e sem trava, como depois de uma queda
+    assert os.path.exists(crashed.journal_file)
+    running = open_journal(progress_file)
+    answer(running, 0, False, {})
+    running.compact()
+    running.close()
+    assert not os.path.exists(crashed.journal_file)
+    snapshot = read_snapshot(snapshot_file_path(progress_file))
+    assert snapshot.journals == {crashed.instance: 3, running.instance: 1}
+    assert snapshot.to_store(word_texts()).to_progress_data()[:2] == [
+        {"text": "Apple", "correct": 0, "incorrect": 1, "mastered": False, "presented": True},
+        {"text": "pear", "correct": 2, "incorrect": 0, "mastered": False, "presented": True}]
+    assert saved_counts(load(progress_file)) == {"Apple": (0, 1), "pear": (2, 0)}
+
+
+def test_reset_drops_earlier_answers_of_running_instances(progress_file):
+    other = open_journal(progress_file)
+    other_counts = {}
+    answer(other, 0, True, other_counts)
+    wait_for_journal(other)
+    journal = open_journal(progress_file)
+    answer(journal, 1, True, {})
+    journal.reset()
+    journal.close()
+    assert saved_counts(load(progress_file)) == {}
+    answer(other, 2, False, other_counts) # Respostas depois do reset contam
+    other.close()
+    assert saved_counts(load(progress_file)) == {"plum": (0, 1)}
+
+
+def test_compaction_keeps_words_removed_from_the_list(progress_file):
+    journal = open_journal(progress_file)
+    counts = {}
+    for _ in range(3):
+        answer(journal, 1, True, counts)
+    journal.compact()
+    journal.close()
+    # Arquivo relido sem "pear": a compactação desta lista não pode perder o progresso dela
+    shorter = WordTexts.from_words(["Apple", "plum"], ["apple", "plum"])
+    journal = ProgressJournal(progress_file, shorter, idle_seconds=3600)
+    journal.append_word({"text": "Apple", "correct": 1, "incorrect": 0, "mastered": False, "presented": True}, True, 0)
+    journal.compact()
+    journal.close()
+    state = load_progress(progress_file, shorter)
+    assert state["word_store"] is not None # Snapshot da lista atual: leitura rápida, com a palavra retirada à parte
+    assert state["words_data"] == [
+        {"text": "pear", "correct": 3, "incorrect": 0, "mastered": False, "presented": True}]
+    # "pear" volta ao arquivo
+    assert saved_counts(load(progress_file)) == {"Apple": (1, 0), "pear": (3, 0)}
@@ -0,0 +1,66 @@
+"""SQLiteProgressStore: respostas somadas entre processos e lotes que falham sem perder respostas."""
+import sqlite3
+
+import pytest
+
+from core import progress_db
+from core.progress_db import SQLiteProgressStore
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    return str(tmp_path / "progress.sqlite3")
+
+
+def record(text, correct, incorrect):
+    return {"text": text, "correct": correct, "incorrect": incorrect, "mastered": False, "presented": True}
+
+
+def counts(store):
+    return {word["text"]: (word["correct"], word["incorrect"]) for word in store.load()["words_data"]}
+
+
+def test_answers_from_two_stores_are_added(db_file):
+    first, second = SQLiteProgressStore(db_file, "words.txt"), SQLiteProgressStore(db_file, "words.txt")
+    first.append_word(record("Apple", 1, 0), True)
+    second.append_word(record("Apple", 0, 1), False) # Esta instância não via a resposta da outra
+    second.append_word(record("Apple", 1, 1), True)
+    first.close()
+    second.close()
+    assert counts(SQLiteProgressStore(db_file, "words.txt")) == {"Apple": (2, 1)}
+
+
+def test_batch_that_fails_on_a_locked_database_is_written_later(db_file, monkeypatch, capsys):
+    monkeypatch.setattr(progress_db, "DB_BUSY_TIMEOUT_SECONDS", 0.05)
+    monkeypatch.setattr(progress_db, "DB_RETRY_DELAY_SECONDS", 0.01)
+    store = SQLiteProgressStore(db_file, "words.txt")
+    blocker = sqlite3.connect(db_file)
+    blocker.execute("BEGIN IMMEDIATE") # Outro processo segurando a trava de escrita
+    store.append_word(record("Apple", 1, 0), True)
+    store.append_word(record("pear", 0, 1), False)
+    store.append_streak(1)
+    store.flush()
+    assert "database is locked" in capsys.readouterr().out
+    blocker.rollback()
+    blocker.close()
+    store.append_word(record("Apple", 2, 0), True) # O próximo lote leva junto o que falhou
+    store.flush()
+    state = store.load()
+    assert counts(store) == {"Apple": (2, 0), "pear": (0, 1)}
+    assert state["consecutive_correct_answers"] == 1
+    store.close()
+
+
+def test_close_retries_the_pending_batch(db_file, monkeypatch, capsys):
+    monkeypatch.setattr(progress_db, "DB_BUSY_TIMEOUT_SECONDS", 0.05)
+    monkeypatch.setattr(progress_db, "DB_RETRY_DELAY_SECONDS", 0.01)
+    store = SQLiteProgressStore(db_file, "words.txt")
+    blocker = sqlite3.connect(db_file)
+    blocker.execute("BEGIN IMMEDIATE")
+    store.append_word(record("Apple", 1, 0), True)
+    store.flush()
+    blocker.rollback()
+    blocker.close()
+    store.close()
+    assert "could not be saved" not in capsys.readouterr().out
+    assert counts(SQLiteProgressStore(db_file, "words.txt")) == {"Apple": (1, 0)}
@@ -0,0 +1,92 @@
+"""Sessões com várias listas (core.session) e a junção do progresso delas no WordManager."""
+from core.session import WordListSession, bitset_count, bitset_indexes
+from core.wordfile import WordTexts
+from core.words import WordManager
+
+
+def texts(*words):
+    return WordTexts.from_words(list(words), [word.casefold() for word in words])
+
+
+def two_lists():
+    return WordListSession().with_list("a", texts("Apple", "pear", "plum")).with_list("b", texts("apple", "Fig", "plum", "kiwi"))
+
+
+def test_with_list_shares_the_word_index():
+    session = two_lists()
+    assert list(session.texts) == ["Apple", "pear", "plum", "Fig", "kiwi"] # A primeira lista primeiro; as novas no fim
+    assert bitset_indexes(session.members["a"], 5) == [0, 1, 2]
+    assert bitset_indexes(session.members["b"], 5) == [0, 2, 3, 4]
+    assert session.text_in("b", 0) == "apple" and session.text_in("a", 0) == "Apple"
+    assert session.contains("b", 3) and not session.contains("a", 3)
+
+
+def test_subset_is_the_union_of_the_chosen_lists():
+    session = two_lists()
+    assert bitset_indexes(session.subset(["a"]), 5) == [0, 1, 2]
+    assert bitset_indexes(session.subset(["b"]), 5) == [0, 2, 3, 4]
+    assert session.subset(["a", "b"]) is None # Todas as palavras
+    assert bitset_count(session.subset([])) == 0
+
+
+def test_subset_restricts_the_draw():
+    session = two_lists()
+    manager = WordManager()
+    manager.set_words(session.texts)
+    manager.set_subset(session.subset(["b"]))
+    drawn = {manager.get_next_word()["text"] for _ in range(200)}
+    assert drawn == {"Apple", "plum", "Fig", "kiwi"}
+
+
+def first_list_manager():
+    manager = WordManager()
+    manager.set_words(texts("Apple", "pear", "plum"))
+    return manager
+
+
+def answer(manager, index, correct):
+    manager.current_word_index = index
+    manager.current_word_obj = manager.words_data[index]
+    manager.record_attempt(correct)
+
+
+def test_merge_keeps_the_record_with_more_attempts():
+    manager = first_list_manager()
+    answer(manager, 0, True)
+    answer(manager, 2, False)
+    answer(manager, 2, False)
+    session = two_lists()
+    manager.use_extended_words(WordManager.prepare_extended_words(manager.words_data.copy(), session.texts))
+    manager.merge_progress_data([
+        {"text": "apple", "correct": 3, "incorrect": 1, "mastered": True, "presented": True}, # Mais tentativas: vale este
+        {"text": "plum", "correct": 1, "incorrect": 0, "mastered": False, "presented": True}, # Menos: fica o da sessão
+        {"text": "kiwi", "correct": 0, "incorrect": 1, "mastered": False, "presented": True},
+    ])
+    counts = {record["text"]: (record["correct"], record["incorrect"]) for record in manager.words_data}
+    assert counts == {"Apple": (3, 1), "pear": (0, 0), "plum": (0, 2), "Fig": (0, 0), "kiwi": (0, 1)}
+    assert manager.get_mastered_words_texts() == ["Apple"]
+
+
+def test_answers_given_while_preparing_are_carried_over():
+    manager = first_list_manager()
+    answer(manager, 1, True)
+    session = two_lists()
+    prepared = WordManager.prepare_extended_words(manager.words_data.copy(), session.texts) # No thread de carga
+    answer(manager, 0, True) # Enquanto isso, o aluno continua respondendo
+    answer(manager, 0, True)
+    manager.use_extended_words(prepared)
+    assert len(manager.words_data) == 5 and manager.subset is None
+    counts = {record["text"]: (record["correct"], record["incorrect"]) for record in manager.words_data}
+    assert counts == {"Apple": (2, 0), "pear": (1, 0), "plum": (0, 0), "Fig": (0, 0), "kiwi": (0, 0)}
+    assert manager.get_mastered_words_texts() == ["Apple"] # Índices recalculados com as respostas novas
+    assert 0 not in manager._active and {3, 4} <= set(manager._active._members)
+
+
+def test_prepared_words_are_used_as_is_without_new_answers():
+    manager = first_list_manager()
+    answer(manager, 1, False)
+    session = two_lists()
+    prepared = WordManager.prepare_extended_words(manager.words_data.copy(), session.texts)
+    manager.use_extended_words(prepared)
+    assert manager.words_data is prepared[0]
+    assert manager.words_data[1]["incorrect"] == 1
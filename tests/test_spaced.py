@@ -0,0 +1,101 @@
+"""Modo espaçado (caixas de Leitner) com relógio fixo: agenda, fila de revisões e entradas velhas do heap."""
+import pytest
+
+from core import words as words_module
+from core.words import LEITNER_INTERVALS_SECONDS, SELECTION_MODE_SPACED, WordManager
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(words_module.time, "time", clock)
+    return clock
+
+
+def spaced_manager(texts):
+    manager = WordManager()
+    manager.set_words(texts)
+    manager.set_selection_mode(SELECTION_MODE_SPACED)
+    return manager
+
+
+def answer(manager, index, correct):
+    """Responde a palavra index como se ela tivesse sido sorteada."""
+    manager.current_word_index = index
+    manager.current_word_obj = manager.words_data[index]
+    manager.record_attempt(correct)
+
+
+def test_boxes_advance_on_correct_and_reset_on_miss(clock):
+    manager = spaced_manager(["alpha"])
+    store = manager.words_data
+    for box in range(1, len(LEITNER_INTERVALS_SECONDS) + 2):
+        answer(manager, 0, True)
+        expected = min(box, len(LEITNER_INTERVALS_SECONDS) - 1) # A última caixa é o limite
+        assert store.box[0] == expected
+        assert store.due[0] == clock.now + LEITNER_INTERVALS_SECONDS[expected]
+    answer(manager, 0, False)
+    assert store.box[0] == 0
+    assert store.due[0] == clock.now + LEITNER_INTERVALS_SECONDS[0]
+
+
+def test_next_word_prefers_overdue_reviews_then_new_words_then_earliest_review(clock):
+    manager = spaced_manager(["alpha", "beta", "gamma"])
+    answer(manager, 0, True) # Caixa 1
+    answer(manager, 1, False) # Caixa 0: revisão antes de alpha
+    # Nada vencido: sai a única palavra nunca respondida
+    assert manager.get_next_word()["text"] == "gamma"
+    answer(manager, 2, True)
+    clock.now += LEITNER_INTERVALS_SECONDS[0]
+    assert manager.get_next_word()["text"] == "beta" # Vencida
+    # Sem palavras novas nem revisões vencidas: a próxima revisão, mesmo antes da hora
+    answer(manager, 1, True)
+    due = sorted((manager.words_data.due[i], manager.words_data.texts[i]) for i in range(3))
+    assert manager.get_next_word()["text"] == due[0][1]
+
+
+def test_stale_heap_entries_are_skipped(clock):
+    manager = spaced_manager(["alpha", "beta"])
+    answer(manager, 0, False) # alpha: due em 60 s
+    answer(manager, 1, False)
+    clock.now += 1
+    answer(manager, 0, True) # alpha remarcada para depois de beta; a entrada antiga fica no heap
+    assert len(manager._review_heap) == 3
+    clock.now += LEITNER_INTERVALS_SECONDS[0]
+    assert manager.get_next_word()["text"] == "beta"
+    assert manager._peek_review() == (manager.words_data.due[1], 1)
+    assert len(manager._review_heap) == 2 # A entrada velha de alpha foi descartada ao chegar no topo
+
+
+def test_heap_is_rebuilt_when_stale_entries_pile_up(clock):
+    manager = spaced_manager(["alpha", "beta", "gamma"])
+    rebuilds, previous = 0, 0
+    for attempt in range(500):
+        clock.now += 1
+        answer(manager, attempt % 2, attempt % 3 == 0)
+        scheduled = manager._selected_count - len(manager._unscheduled)
+        assert len(manager._review_heap) <= 2 * scheduled + 64 # Reconstruído ao passar do limite
+        rebuilds += len(manager._review_heap) < previous
+        previous = len(manager._review_heap)
+        for index in (0, 1): # A entrada atual de cada palavra agendada continua no heap
+            if manager.words_data.is_scheduled(index):
+                assert (manager.words_data.due[index], index) in manager._review_heap
+    assert rebuilds >= 5
+    assert 2 in manager._unscheduled
+
+
+def test_spaced_mode_serves_mastered_words(clock):
+    manager = spaced_manager(["alpha"])
+    answer(manager, 0, True)
+    answer(manager, 0, True)
+    assert manager.words_data.is_mastered(0)
+    assert manager.has_active_words()
+    assert manager.get_next_word()["text"] == "alpha"
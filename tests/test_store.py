@@ -0,0 +1,108 @@
+"""IndexSet (remoção por troca com o último) e WordStore/WordRecord (visão de uma linha das colunas)."""
+import math
+import random
+
+import pytest
+
+from core.store import WordStore
+from core.words import IndexSet
+
+
+def assert_consistent(index_set, expected):
+    assert len(index_set) == len(expected)
+    assert sorted(index_set._members) == sorted(expected)
+    for pos, index in enumerate(index_set._members): # Cada membro sabe a própria posição
+        assert index_set._pos[index] == pos
+    for index in range(len(index_set._pos)):
+        assert (index in index_set) == (index in expected)
+
+
+def test_index_set_interleaved_add_discard():
+    rng = random.Random(7)
+    index_set, expected = IndexSet(40, [1, 5, 9]), {1, 5, 9}
+    assert_consistent(index_set, expected)
+    for _ in range(2000):
+        index = rng.randrange(40)
+        if rng.random() < 0.5:
+            index_set.add(index)
+            expected.add(index)
+        else:
+            index_set.discard(index)
+            expected.discard(index)
+        assert_consistent(index_set, expected)
+
+
+def test_index_set_add_and_discard_are_idempotent():
+    index_set = IndexSet(4)
+    index_set.add(2)
+    index_set.add(2)
+    index_set.discard(3)
+    assert_consistent(index_set, {2})
+    index_set.discard(2)
+    index_set.discard(2)
+    assert_consistent(index_set, set())
+
+
+def test_index_set_choice_only_returns_members():
+    rng = random.Random(3)
+    index_set, expected = IndexSet(100, range(100)), set(range(100))
+    for index in rng.sample(range(100), 90):
+        index_set.discard(index)
+        expected.discard(index)
+    random.seed(0)
+    drawn = {index_set.choice() for _ in range(500)}
+    assert drawn == expected # 10 membros, 500 sorteios: todos aparecem
+
+
+def test_index_set_grow():
+    index_set = IndexSet(2, [0])
+    index_set.grow(5)
+    assert 4 not in index_set
+    index_set.add(4)
+    assert_consistent(index_set, {0, 4})
+
+
+def test_word_record_reads_like_the_old_dict():
+    store = WordStore(["Apple", "pear"])
+    record = store[0]
+    assert record["text"] == "Apple" and record["key"] == "apple"
+    assert (record["correct"], record["incorrect"], record["mastered"], record["presented"]) == (0, 0, False, False)
+    assert "due" not in record and "box" not in record
+    with pytest.raises(KeyError):
+        record["due"]
+    assert record.get("due", "never") == "never"
+    assert store[-1]["text"] == "pear"
+    with pytest.raises(IndexError):
+        store[2]
+
+
+def test_word_record_is_a_live_view():
+    store = WordStore(["Apple", "pear"])
+    record = store[1]
+    store.update(1, {"correct": 3, "incorrect": 1, "mastered": True, "box": 2, "due": 123.5})
+    assert (record["correct"], record["incorrect"], record["mastered"], record["box"], record["due"]) == (3, 1, True, 2, 123.5)
+    assert "due" in record
+    store.unschedule(1)
+    assert "due" not in record and store.box[1] == 0
+
+
+def test_store_update_round_trips_progress_records():
+    store = WordStore(["Apple", "pear", "plum"])
+    saved = {"text": "pear", "correct": 2, "incorrect": 4, "mastered": True, "presented": True, "box": 3, "due": 99.0}
+    store.update(1, saved)
+    store.update(2, {"presented": True})
+    assert store.to_progress_data() == [saved, {"text": "plum", "correct": 0, "incorrect": 0, "mastered": False, "presented": True}]
+    store.update(1, {"mastered": False}) # Chaves ausentes ficam como estão
+    assert store[1]["correct"] == 2 and not store[1]["mastered"]
+
+
+def test_store_copy_extend_and_reset():
+    store = WordStore(["Apple"])
+    store.update(0, {"correct": 1, "due": 5.0})
+    clone = store.copy()
+    clone.update(0, {"correct": 7})
+    assert store.correct[0] == 1 # Colunas independentes
+    store.extend(["Apple", "pear"])
+    assert len(store) == 2 and store[1]["text"] == "pear" and not store.is_touched(1) and math.isnan(store.due[1])
+    store.reset_stats()
+    assert store.to_progress_data() == []
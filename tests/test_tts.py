@@ -0,0 +1,58 @@
+"""TTSService.close: pedidos em síntese, tocando ou na fila terminam como cancelados e o player é parado."""
+import asyncio
+import os
+
+import pytest
+
+from core import tts as tts_module
+from core.tts import TTSService
+
+SLEEP = "/bin/sleep"
+
+
+async def wait_until(condition, timeout=5):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+def test_close_finishes_a_request_in_synthesis():
+    async def scenario():
+        service = TTSService()
+
+        async def never_finishes(text, length_scale, model_path):
+            await asyncio.Event().wait()
+
+        service._synthesize = never_finishes
+        await service.start()
+        synthesizing = service.submit("apple", model_path="voice.onnx")
+        queued = service.submit("pear", model_path="voice.onnx")
+        await wait_until(lambda: service._synthesizing is synthesizing)
+        await service.close()
+        for request in (synthesizing, queued):
+            await asyncio.wait_for(request.wait(), 1)
+            assert (request.success, request.message) == (False, "Cancelled.")
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.skipif(not os.path.exists(SLEEP), reason="needs /bin/sleep as a stand-in audio player")
+def test_close_stops_the_player_and_finishes_the_playing_request(monkeypatch):
+    monkeypatch.setattr(tts_module, "PLAYERS", [{"name": "sleep", "path": SLEEP, "args": ["30"]}])
+
+    async def scenario():
+        service = TTSService()
+        service._cache[("voice.onnx", 1.0, "apple")] = b"RIFF" # Clipe já sintetizado: vai direto para o player
+        await service.start()
+        finished = []
+        playing = service.submit("apple", model_path="voice.onnx", on_finished=finished.append)
+        await wait_until(lambda: service._current_player is not None)
+        player = service._current_player
+        await asyncio.wait_for(service.close(), 5)
+        assert player.returncode is not None # Parado por close(), não deixado tocando
+        await asyncio.wait_for(playing.wait(), 1)
+        assert (playing.success, playing.message) == (False, "Cancelled.")
+        assert finished == [playing] # O callback (o da GUI, por exemplo) também é chamado
+
+    asyncio.run(scenario())
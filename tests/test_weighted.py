@@ -0,0 +1,97 @@
+"""Sorteio ponderado: FenwickTree, word_weight e get_next_word no modo ponderado."""
+import bisect
+import itertools
+import random
+
+import pytest
+
+from core import words as words_module
+from core.words import FenwickTree, WordManager, word_weight, WEIGHT_MAX, WEIGHT_PER_MISS
+
+
+def brute_find_prefix(weights, target):
+    """Menor índice cuja soma acumulada (inclusive) é maior que target."""
+    return bisect.bisect_right(list(itertools.accumulate(weights)), target)
+
+
+def assert_matches(tree, weights):
+    assert tree.total == sum(weights)
+    for target in range(tree.total):
+        assert tree.find_prefix(target) == brute_find_prefix(weights, target), target
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 8, 9, 31, 64, 100])
+def test_find_prefix_matches_cumulative_sum(size):
+    rng = random.Random(size)
+    weights = [rng.choice([0, 0, 1, 2, 5, 20]) for _ in range(size)]
+    weights[rng.randrange(size)] = 1 # Pelo menos um peso positivo
+    assert_matches(FenwickTree(weights), weights)
+
+
+def test_add_keeps_prefix_sums():
+    rng = random.Random(1)
+    weights = [rng.randint(0, 5) for _ in range(50)]
+    tree = FenwickTree(weights)
+    for _ in range(200):
+        index = rng.randrange(len(weights))
+        delta = rng.randint(-weights[index], 5)
+        weights[index] += delta
+        tree.add(index, delta)
+    assert_matches(tree, weights)
+
+
+@pytest.mark.parametrize("size,count", [(0, 5), (1, 1), (5, 3), (8, 1), (8, 9), (13, 20)])
+def test_extend_then_add_matches_new_tree(size, count):
+    rng = random.Random(size * 100 + count)
+    weights = [rng.randint(0, 4) for _ in range(size)]
+    tree = FenwickTree(weights)
+    tree.extend(count)
+    weights.extend([0] * count)
+    assert tree._tree == FenwickTree(weights)._tree
+    for index in range(size, size + count): # Os índices novos passam a receber peso
+        delta = rng.randint(1, 4)
+        weights[index] += delta
+        tree.add(index, delta)
+    assert_matches(tree, weights)
+
+
+def test_word_weight():
+    assert word_weight(0, 0, False) == 1
+    assert word_weight(5, 3, True) == 0
+    assert word_weight(0, 1, False) == 1 + WEIGHT_PER_MISS
+    assert word_weight(1, 3, False) == 1 + WEIGHT_PER_MISS * 3 // 2 # Acertos diminuem o peso dos erros
+    assert word_weight(0, 1000, False) == WEIGHT_MAX
+
+
+def test_weighted_mode_draws_each_target_from_the_right_word(monkeypatch):
+    manager = WordManager()
+    manager.set_words(["alpha", "beta", "gamma", "delta"])
+    manager.words_data.update(1, {"incorrect": 3})
+    manager.words_data.update(2, {"correct": 2, "mastered": True})
+    manager.words_data.update(3, {"correct": 1, "incorrect": 1})
+    manager._rebuild_indexes()
+    manager.set_selection_mode(words_module.SELECTION_MODE_WEIGHTED)
+    weights = [word_weight(r["correct"], r["incorrect"], r["mastered"]) for r in manager.words_data]
+    assert manager._weight_tree.total == sum(weights)
+    for target in range(sum(weights)):
+        monkeypatch.setattr(words_module.random, "randrange", lambda stop, target=target: target)
+        assert manager.get_next_word()["text"] == manager.words_data.texts[brute_find_prefix(weights, target)]
+
+
+def test_weighted_mode_follows_record_attempt_and_new_words(monkeypatch):
+    manager = WordManager()
+    manager.set_words(["alpha", "beta"])
+    manager.set_selection_mode(words_module.SELECTION_MODE_WEIGHTED)
+    manager.get_next_word()
+    missed = manager.current_word_index
+    manager.record_attempt(False)
+    manager.update_words(["alpha", "beta", "gamma"], None, [2]) # Palavra nova, com peso 1
+    weights = [word_weight(r["correct"], r["incorrect"], r["mastered"]) for r in manager.words_data]
+    assert weights[missed] == 1 + WEIGHT_PER_MISS
+    seen = set()
+    for target in range(sum(weights)):
+        monkeypatch.setattr(words_module.random, "randrange", lambda stop, target=target: target)
+        manager.get_next_word()
+        assert manager.current_word_index == brute_find_prefix(weights, target)
+        seen.add(manager.current_word_index)
+    assert seen == {0, 1, 2}